@@ -0,0 +1,223 @@
+"""
+API Load Generator
+
+Drives a ZeroEntropy-compatible API with a mix of top-snippets queries and
+add-document uploads from many concurrent workers over data.http_client, and
+reports sustained requests per second, tail latency and response statuses.
+
+By default a data.mock_api server is started in a child process with the
+requested latency and error injection, preloaded with a synthetic corpus of
+``--size`` documents, so the numbers measure the client and server paths
+without network access. Pass ``--base-url`` to target another server instead.
+
+Usage:
+    python -m benchmarks.api_load [--duration 10] [--concurrency 64] [--write-ratio 0.1]
+    python -m benchmarks.api_load --base-url http://127.0.0.1:8000/v1 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+from data.http_client import ConnectionPool, HTTPError
+from data.ingest import DEFAULT_COLLECTION
+from data.mmap_corpus import MmapCorpus
+from data.mock_api import MockZeroEntropyServer
+
+from .corpus_benchmarks import QUERIES, corpus_path, percentile
+
+
+async def generate_load(
+    base_url: str,
+    duration: float,
+    concurrency: int,
+    write_ratio: float = 0.1,
+    collection_name: str = DEFAULT_COLLECTION,
+    api_key: Optional[str] = None,
+    warmup: float = 1.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Runs a closed-loop load test: each worker sends its next request as soon
+    as the previous one completes.
+
+    Args:
+        base_url (str): API base URL, e.g. "http://127.0.0.1:8000/v1"
+        duration (float): Seconds to measure, after the warmup
+        concurrency (int): Number of workers and pooled connections
+        write_ratio (float): Fraction of requests that upload a document
+        collection_name (str): Collection to query and upload into
+        api_key (str): Optional Bearer token
+        warmup (float): Seconds of load before measurement starts
+        seed (int): Seed for the request mix
+
+    Returns:
+        Dict[str, Any]: Request count, requests per second, latency
+        percentiles in milliseconds, and counts per operation and status
+    """
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    latencies: Dict[str, List[float]] = {"query": [], "upload": []}
+    statuses: Counter = Counter()
+    rng = random.Random(seed)
+    uploads = 0
+
+    async with ConnectionPool(base_url, size=concurrency) as pool:
+        # Injected failures can hit the setup request too, so retry it.
+        for _ in range(10):
+            response = await pool.post_json("/collections/add-collection", {"collection_name": collection_name}, headers)
+            if response.status != 429 and response.status < 500:
+                break
+        if response.status not in (200, 201, 409):
+            raise HTTPError(f"Could not create collection: {response.status} {response.body[:200]!r}")
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+
+        async def worker() -> None:
+            nonlocal uploads
+            while True:
+                started = time.perf_counter()
+                if started >= deadline:
+                    return
+                if rng.random() < write_ratio:
+                    operation = "upload"
+                    uploads += 1
+                    payload = {
+                        "collection_name": collection_name,
+                        "path": f"load-test/document-{seed}-{uploads}.md",
+                        "content": {"type": "text", "text": f"Load test document {uploads}. {rng.choice(QUERIES)}."},
+                        "metadata": {"category": "Load Test", "name": f"Document {uploads}"},
+                        "overwrite": True,
+                    }
+                    path = "/documents/add-document"
+                else:
+                    operation = "query"
+                    payload = {
+                        "collection_name": collection_name,
+                        "query": rng.choice(QUERIES),
+                        "k": 10,
+                        "precise_responses": False,
+                    }
+                    path = "/queries/top-snippets"
+                try:
+                    status = (await pool.post_json(path, payload, headers)).status
+                except HTTPError:
+                    status = "transport_error"
+                if started >= measure_from:
+                    latencies[operation].append(time.perf_counter() - started)
+                    statuses[str(status)] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    samples = latencies["query"] + latencies["upload"]
+    ok = sum(count for status, count in statuses.items() if status.isdigit() and int(status) < 400)
+    return {
+        "requests": len(samples),
+        "requests_per_s": len(samples) / duration,
+        "successes_per_s": ok / duration,
+        "p50_ms": _percentile_ms(samples, 0.50),
+        "p95_ms": _percentile_ms(samples, 0.95),
+        "p99_ms": _percentile_ms(samples, 0.99),
+        "p999_ms": _percentile_ms(samples, 0.999),
+        "max_ms": max(samples, default=0.0) * 1000,
+        "operations": {
+            operation: {
+                "requests": len(values),
+                "p50_ms": _percentile_ms(values, 0.50),
+                "p99_ms": _percentile_ms(values, 0.99),
+            }
+            for operation, values in latencies.items()
+        },
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def _percentile_ms(samples: List[float], fraction: float) -> float:
+    return percentile(samples, fraction) * 1000 if samples else 0.0
+
+
+def _serve_mock(connection: Connection, path: Optional[str], options: Dict[str, Any]) -> None:
+    # Child process: preload the corpus, report the URL, serve until killed.
+    async def run() -> None:
+        server = MockZeroEntropyServer(**options)
+        if path:
+            corpus = MmapCorpus(path)
+            server.load((f"corpus/document-{row}.md", corpus.decode(row)) for row in range(len(corpus)))
+        else:
+            from data import sample_documents
+
+            server.load(sample_documents.iter_document_paths())
+        await server.start()
+        connection.send(server.url)
+        connection.close()
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test a ZeroEntropy-compatible API.")
+    parser.add_argument("--base-url", help="target server (defaults to a local mock)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--size", type=int, default=0, help="synthetic documents to preload into the mock")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock: seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mock: maximum random extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock: fraction of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="mock: fraction of 429 responses")
+    parser.add_argument("--cache-dir", default=os.path.join(tempfile.gettempdir(), "zeroentropy-bench"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.base_url
+    if base_url is None:
+        options = {
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "throttle_rate": args.throttle_rate,
+            "seed": args.seed,
+        }
+        path = corpus_path(args.cache_dir, args.size, args.seed) if args.size else None
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_serve_mock, args=(child, path, options), daemon=True)
+        process.start()
+        child.close()
+        base_url = parent.recv()
+        print(f"mock server at {base_url}", file=sys.stderr)
+
+    try:
+        results = asyncio.run(generate_load(
+            base_url, args.duration, args.concurrency, args.write_ratio, args.collection,
+            os.environ.get("ZEROENTROPY_API_KEY"), args.warmup, args.seed,
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+    document = {"base_url": base_url, "concurrency": args.concurrency, "write_ratio": args.write_ratio, **results}
+    if args.base_url is None:
+        document["mock"] = {"size": args.size, **options}
+    encoded = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Corpus Benchmark Suite
+
+Runs every corpus accessor, search and query path in data.sample_documents
+against synthetic collections of increasing size and reports p50/p99 latency,
+throughput and peak RSS. Results are written as JSON so runs from different
+commits can be compared to catch regressions.
+
+Synthetic corpora are generated once per (size, seed) into the cache directory
+and reused by later runs.
+
+Usage:
+    python -m benchmarks.corpus_benchmarks [--sizes 1000 100000 1000000] [--output results.json]
+    python -m benchmarks.corpus_benchmarks --compare baseline.json --output results.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+
+from data import sample_documents as corpus
+from data.columnar_store import ColumnarDocumentStore
+from data.mmap_corpus import MmapCorpus
+from data.synthetic_corpus import generate_corpus
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+QUERIES = [
+    "risk management compliance",
+    "cloud migration cost savings",
+    "revenue growth EBITDA margin",
+    "supply chain inventory optimization",
+    "employee engagement retention",
+    "clinical trial patient outcomes",
+    "renewable energy carbon reduction",
+    "customer acquisition digital marketing",
+]
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of this process.
+
+    Returns:
+        float: Peak RSS in megabytes
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of a list of samples.
+
+    Args:
+        samples (List[float]): Measurements
+        fraction (float): Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: The percentile value
+    """
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def time_calls(
+    function: Callable[[int], Any],
+    iterations: int,
+    max_seconds: float,
+) -> Dict[str, Any]:
+    """
+    Times repeated calls of ``function(iteration)``.
+
+    Args:
+        function (Callable[[int], Any]): Benchmark body; receives the iteration number
+        iterations (int): Maximum number of calls
+        max_seconds (float): Stop early once this much time has been spent
+
+    Returns:
+        Dict[str, Any]: Iteration count, p50/p99 latency, throughput and peak RSS
+    """
+    function(0)
+    samples: List[float] = []
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        call_started = time.perf_counter()
+        function(iteration)
+        samples.append(time.perf_counter() - call_started)
+        if time.perf_counter() - started > max_seconds:
+            break
+    elapsed = sum(samples)
+    return {
+        "iterations": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "throughput_per_s": len(samples) / elapsed if elapsed else float("inf"),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def time_once(function: Callable[[], Any]) -> Dict[str, Any]:
+    """
+    Times a single call, used for one-off index builds.
+
+    Args:
+        function (Callable[[], Any]): Build step
+
+    Returns:
+        Dict[str, Any]: Result row in the same shape as ``time_calls``
+    """
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    return {
+        "iterations": 1,
+        "p50_ms": elapsed * 1000,
+        "p99_ms": elapsed * 1000,
+        "throughput_per_s": 1 / elapsed if elapsed else float("inf"),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def corpus_path(cache_dir: str, size: int, seed: int) -> str:
+    """
+    Returns the cached synthetic corpus for a size, generating it if needed.
+
+    Args:
+        cache_dir (str): Directory holding generated corpora
+        size (int): Number of documents
+        seed (int): Generator seed
+
+    Returns:
+        str: Path to the corpus file
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"synthetic-{size}-{seed}.zec")
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        generate_corpus(partial, size, seed)
+        os.replace(partial, path)
+    return path
+
+
+def load(path: str, layout: str) -> None:
+    """
+    Loads a corpus file into the active collection with the requested layout.
+
+    Args:
+        path (str): Corpus file
+        layout (str): "dicts", "columnar" or "mmap"
+    """
+    source = MmapCorpus(path)
+    if layout == "mmap":
+        corpus.load_collection(source)
+        return
+    documents = (source.decode(row) for row in range(len(source)))
+    if layout == "columnar":
+        corpus.load_collection(ColumnarDocumentStore.from_documents(documents))
+    else:
+        corpus.load_collection(list(documents))
+    source.close()
+
+
+def benchmarks() -> Dict[str, Callable[[int], Any]]:
+    """
+    Returns the benchmark bodies, keyed by name.
+
+    Returns:
+        Dict[str, Callable[[int], Any]]: Functions of the iteration number
+    """
+    categories = corpus.get_all_categories()
+    tags = corpus.get_all_tags()
+
+    def category(i: int) -> str:
+        return categories[i % len(categories)]
+
+    def tag_pair(i: int) -> List[str]:
+        return [tags[i % len(tags)], tags[(7 * i + 3) % len(tags)]]
+
+    def query(i: int) -> str:
+        return QUERIES[i % len(QUERIES)]
+
+    def expression(i: int) -> str:
+        first, second = (json.dumps(tag) for tag in tag_pair(i))
+        return f"{json.dumps(category(i))} AND tag:{first} AND NOT tag:{second}"
+
+    def misspelled(names: List[str], i: int) -> str:
+        # Drops the last letter, one edit away from a known value.
+        return names[i % len(names)].lower()[:-1]
+
+    return {
+        "get_documents_by_category": lambda i: corpus.get_documents_by_category(category(i)),
+        "get_documents_by_tags": lambda i: corpus.get_documents_by_tags(tag_pair(i)),
+        "get_all_categories": lambda i: corpus.get_all_categories(),
+        "get_all_tags": lambda i: corpus.get_all_tags(),
+        "query_documents": lambda i: corpus.query_documents(
+            category(i), all_tags=tag_pair(i)[:1], none_tags=tag_pair(i)[1:]
+        ),
+        "iter_documents_first_page": lambda i: list(islice(corpus.iter_documents_by_tags(tag_pair(i)), 20)),
+        "paginate_documents": lambda i: corpus.paginate_documents(limit=50, after=i * 50, category=category(i)),
+        "search_documents": lambda i: corpus.search_documents(query(i), 10),
+        "search_documents_category": lambda i: corpus.search_documents(query(i), 10, category(i)),
+        "vector_search_documents": lambda i: corpus.vector_search_documents(query(i), 10),
+        "vector_search_batch_64": lambda i: corpus.vector_search_batch([query(i + j) for j in range(64)], 10),
+        "hybrid_search_documents": lambda i: corpus.hybrid_search_documents(query(i), 10),
+        "facet_counts": lambda i: corpus.facet_counts(),
+        "facet_counts_filtered": lambda i: corpus.facet_counts(category(i), all_tags=tag_pair(i)[:1]),
+        "filter_documents": lambda i: corpus.filter_documents(expression(i)),
+        "find_tags": lambda i: corpus.find_tags(misspelled(tags, i)),
+        "find_categories": lambda i: corpus.find_categories(misspelled(categories, i)),
+        "query_facts": lambda i: corpus.query_facts("money", min_value=1e6, category=category(i)),
+    }
+
+
+def run(
+    sizes: List[int],
+    layout: str,
+    iterations: int,
+    max_seconds: float,
+    cache_dir: str,
+    seed: int,
+    only: Optional[List[str]] = None,
+    query_cache: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Runs the suite at every size.
+
+    Args:
+        sizes (List[int]): Corpus sizes
+        layout (str): Collection layout passed to ``load``
+        iterations (int): Maximum calls per benchmark
+        max_seconds (float): Time budget per benchmark
+        cache_dir (str): Directory for generated corpora
+        seed (int): Generator seed
+        only (List[str]): Optional benchmark names to restrict the run to
+        query_cache (bool): Keep the query cache enabled; by default it is
+            disabled so repeated queries measure the uncached search paths
+
+    Returns:
+        List[Dict[str, Any]]: One result row per (size, benchmark)
+    """
+    results = []
+    corpus.configure_query_cache(max_entries=1024 if query_cache else 0)
+    for size in sizes:
+        path = corpus_path(cache_dir, size, seed)
+        builds = {
+            "build:load": lambda: load(path, layout),
+            "build:metadata_index": lambda: corpus.get_all_categories(),
+            "build:keyword_index": lambda: corpus.search_documents("warmup", 1),
+            "build:vector_index": lambda: corpus.vector_search_documents("warmup", 1),
+            "build:bitset_index": lambda: corpus.facet_counts(),
+            "build:fact_table": lambda: corpus.query_facts("money", min_value=float("inf")),
+            "build:vocabularies": lambda: (corpus.find_tags("warmup"), corpus.find_categories("warmup")),
+        }
+        for name, build in builds.items():
+            gc.collect()
+            results.append({"size": size, "benchmark": name, **time_once(build)})
+        for name, body in benchmarks().items():
+            if only and name not in only:
+                continue
+            gc.collect()
+            row = {"size": size, "benchmark": name, **time_calls(body, iterations, max_seconds)}
+            results.append(row)
+            print(
+                f"{size:>9,} {name:<28} p50 {row['p50_ms']:>9.3f} ms  p99 {row['p99_ms']:>9.3f} ms  "
+                f"{row['throughput_per_s']:>10.1f}/s  rss {row['peak_rss_mb']:>8.1f} MB",
+                file=sys.stderr,
+            )
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """
+    Returns the current git commit, if the tree is a git checkout.
+
+    Returns:
+        Optional[str]: Commit hash, or None outside a repository
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float = 0.01,
+) -> List[str]:
+    """
+    Lists benchmarks whose p50 latency regressed beyond a threshold.
+
+    Args:
+        baseline (Dict[str, Any]): Earlier results document
+        current (Dict[str, Any]): New results document
+        threshold (float): Allowed slowdown as a fraction, e.g. 0.2 for 20%
+        min_delta_ms (float): Ignore slowdowns smaller than this in absolute
+            terms, which are timer noise for sub-microsecond calls
+
+    Returns:
+        List[str]: Human-readable regression descriptions
+    """
+    previous = {(row["size"], row["benchmark"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = previous.get((row["size"], row["benchmark"]))
+        if before is None or before["p50_ms"] <= 0:
+            continue
+        change = row["p50_ms"] / before["p50_ms"] - 1
+        if change > threshold and row["p50_ms"] - before["p50_ms"] > min_delta_ms:
+            regressions.append(
+                f"{row['benchmark']} @ {row['size']:,}: p50 {before['p50_ms']:.3f} -> "
+                f"{row['p50_ms']:.3f} ms (+{change:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark corpus accessors and search paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--layout", choices=("dicts", "columnar", "mmap"), default="dicts")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--max-seconds", type=float, default=5.0)
+    parser.add_argument("--cache-dir", default=os.path.join(tempfile.gettempdir(), "zeroentropy-bench"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="benchmark names to run")
+    parser.add_argument("--query-cache", action="store_true", help="measure with the query cache enabled")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="baseline JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown (default 20%%)")
+    args = parser.parse_args()
+
+    document = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "layout": args.layout,
+        "query_cache": args.query_cache,
+        "results": run(
+            args.sizes, args.layout, args.iterations, args.max_seconds, args.cache_dir, args.seed, args.only,
+            args.query_cache,
+        ),
+        # Instrumentation counters for the whole run, across all sizes.
+        "metrics": corpus.metrics_snapshot(),
+    }
+    encoded = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if baseline.get("layout") != document["layout"]:
+            print(f"warning: comparing {document['layout']} results against a {baseline.get('layout')} baseline", file=sys.stderr)
+        regressions = compare(baseline, document, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
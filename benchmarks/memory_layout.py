@@ -0,0 +1,139 @@
+"""
+Memory Layout Benchmark
+
+Compares the memory footprint of the list-of-dicts document layout used by
+SAMPLE_DOCUMENTS with the ColumnarDocumentStore layout at increasing corpus
+sizes. Documents are synthesised by cycling through SAMPLE_DOCUMENTS and
+decoding each one from JSON, so every document owns its strings exactly as it
+would when loaded from disk.
+
+Each layout is measured on its own and together with the DocumentIndex that
+sample_documents builds over a loaded collection, since a served collection
+always has one. Over a list the index keeps a reference to every document;
+over a columnar store it keeps row numbers only, so the difference between
+the two columns is the cost of the postings lists.
+
+Usage:
+    python -m benchmarks.memory_layout [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+from data.columnar_store import ColumnarDocumentStore
+from data.document_index import DocumentIndex
+from data.sample_documents import SAMPLE_DOCUMENTS
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def synthetic_documents(count: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yields ``count`` distinct documents derived from SAMPLE_DOCUMENTS.
+
+    Args:
+        count (int): Number of documents to generate
+
+    Returns:
+        Iterator[Dict[str, Any]]: Freshly decoded document dicts
+    """
+    encoded = [json.dumps(document) for document in SAMPLE_DOCUMENTS]
+    for index in range(count):
+        document = json.loads(encoded[index % len(encoded)])
+        document["title"] = f"{document['title']} #{index}"
+        yield document
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """
+    Returns the bytes still allocated by the object that ``build`` returns.
+
+    Args:
+        build (Callable[[], Any]): Zero-argument factory for the layout under test
+
+    Returns:
+        int: Traced allocation size in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    layout = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del layout
+    return size
+
+
+def indexed(build: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Wraps a layout factory so that it also builds the DocumentIndex over the
+    layout, as ``load_collection`` followed by the first lookup does.
+
+    Args:
+        build (Callable[[], Any]): Zero-argument factory for the layout under test
+
+    Returns:
+        Callable[[], Any]: Factory returning the layout and its index
+    """
+    def build_indexed() -> Any:
+        layout = build()
+        return layout, DocumentIndex(layout)
+    return build_indexed
+
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    """
+    Measures both layouts at every size, with and without the index.
+
+    Args:
+        sizes (List[int]): Corpus sizes to measure
+
+    Returns:
+        List[Dict[str, Any]]: One result row per size
+    """
+    results = []
+    for count in sizes:
+        build_dicts = lambda: list(synthetic_documents(count))
+        build_columnar = lambda: ColumnarDocumentStore.from_documents(synthetic_documents(count))
+        dicts = measure(build_dicts)
+        columnar = measure(build_columnar)
+        dicts_indexed = measure(indexed(build_dicts))
+        columnar_indexed = measure(indexed(build_columnar))
+        results.append({
+            "documents": count,
+            "list_of_dicts_bytes": dicts,
+            "columnar_bytes": columnar,
+            "ratio": dicts / columnar if columnar else float("inf"),
+            "list_of_dicts_indexed_bytes": dicts_indexed,
+            "columnar_indexed_bytes": columnar_indexed,
+            "indexed_ratio": dicts_indexed / columnar_indexed if columnar_indexed else float("inf"),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'':>10} {'store only':^37} {'store and index':^37}")
+    print(f"{'documents':>10}" + f" {'list-of-dicts':>15} {'columnar':>12} {'ratio':>7}" * 2)
+    for row in results:
+        print(
+            f"{row['documents']:>10,} {row['list_of_dicts_bytes'] / 2**20:>12.1f} MB "
+            f"{row['columnar_bytes'] / 2**20:>9.1f} MB {row['ratio']:>6.1f}x "
+            f"{row['list_of_dicts_indexed_bytes'] / 2**20:>12.1f} MB "
+            f"{row['columnar_indexed_bytes'] / 2**20:>9.1f} MB {row['indexed_ratio']:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Sharded Search Benchmark
+
+Compares single-process BM25 search against data.sharded_search with an
+increasing number of shards on a synthetic corpus, reporting build time,
+single-query latency and batch throughput, plus the throughput speedup over
+the single-process baseline. Speedup is bounded by the number of cores.
+
+Usage:
+    python -m benchmarks.sharded_search [--size 1000000] [--shards 1 2 4 8] [--output results.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from data.document_index import DocumentIndex
+from data.keyword_search import BM25Index
+from data.mmap_corpus import MmapCorpus
+from data.sharded_search import ShardedSearch
+
+from .corpus_benchmarks import QUERIES, corpus_path, percentile
+
+SearchBatch = Callable[[Sequence[str], int], List[List[Tuple[int, float]]]]
+
+
+def measure(search_batch: SearchBatch, batch_size: int, iterations: int, max_seconds: float) -> Dict[str, Any]:
+    """
+    Measures single-query latency and batch throughput of a search function.
+
+    Args:
+        search_batch (SearchBatch): Function of (queries, k)
+        batch_size (int): Queries per batch for the throughput measurement
+        iterations (int): Maximum number of single queries and batches
+        max_seconds (float): Time budget for each of the two measurements
+
+    Returns:
+        Dict[str, Any]: p50/p99 single-query latency and queries per second
+    """
+    search_batch(QUERIES[:1], 10)
+    samples = []
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        call_started = time.perf_counter()
+        search_batch([QUERIES[iteration % len(QUERIES)]], 10)
+        samples.append(time.perf_counter() - call_started)
+        if time.perf_counter() - started > max_seconds:
+            break
+
+    batch = [QUERIES[i % len(QUERIES)] for i in range(batch_size)]
+    batches = 0
+    started = time.perf_counter()
+    while batches < iterations and (batches == 0 or time.perf_counter() - started < max_seconds):
+        search_batch(batch, 10)
+        batches += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "queries_per_s": batches * batch_size / elapsed,
+    }
+
+
+def run(
+    path: str,
+    shard_counts: List[int],
+    batch_size: int,
+    iterations: int,
+    max_seconds: float,
+) -> List[Dict[str, Any]]:
+    """
+    Benchmarks the single-process baseline and every shard count.
+
+    Args:
+        path (str): Corpus file
+        shard_counts (List[int]): Shard counts to measure
+        batch_size (int): Queries per batch
+        iterations (int): Maximum calls per measurement
+        max_seconds (float): Time budget per measurement
+
+    Returns:
+        List[Dict[str, Any]]: One row per configuration, baseline first
+    """
+    corpus = MmapCorpus(path)
+    started = time.perf_counter()
+    index = DocumentIndex()
+    keyword_index = BM25Index()
+    for row in range(len(corpus)):
+        document = corpus.decode(row)
+        keyword_index.add(index.add(document), document)
+    build_s = time.perf_counter() - started
+
+    def single(queries: Sequence[str], k: int) -> List[List[Tuple[int, float]]]:
+        return [keyword_index.search(query, k) for query in queries]
+
+    baseline = {"shards": 0, "mode": "single-process", "build_s": build_s, **measure(single, batch_size, iterations, max_seconds)}
+    rows = [baseline]
+    print(f"single-process  build {build_s:7.1f} s  {baseline['queries_per_s']:9.1f} q/s", file=sys.stderr)
+    del index, keyword_index, single
+    gc.collect()
+
+    for shards in shard_counts:
+        started = time.perf_counter()
+        with ShardedSearch(path, shards) as search:
+            build_s = time.perf_counter() - started
+            row = {"shards": shards, "mode": "sharded", "build_s": build_s, **measure(search.search_batch, batch_size, iterations, max_seconds)}
+        row["speedup"] = row["queries_per_s"] / baseline["queries_per_s"]
+        rows.append(row)
+        print(
+            f"{shards:>3} shards       build {build_s:7.1f} s  {row['queries_per_s']:9.1f} q/s  "
+            f"p50 {row['p50_ms']:8.2f} ms  speedup {row['speedup']:.2f}x",
+            file=sys.stderr,
+        )
+    return rows
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    default_shards = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    parser = argparse.ArgumentParser(description="Benchmark sharded scatter-gather search.")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=default_shards)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    parser.add_argument("--cache-dir", default=os.path.join(tempfile.gettempdir(), "zeroentropy-bench"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    path = corpus_path(args.cache_dir, args.size, args.seed)
+    document = {
+        "size": args.size,
+        "cpus": cpus,
+        "results": run(path, args.shards, args.batch_size, args.iterations, args.max_seconds),
+    }
+    encoded = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main()
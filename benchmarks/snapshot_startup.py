@@ -0,0 +1,166 @@
+"""
+Snapshot Startup Benchmark
+
+Measures how long a fresh worker process takes to become ready to serve
+keyword, vector and facet queries over a synthetic corpus, once by building
+the indexes from the corpus and once by loading an index snapshot, and how
+much of each worker's memory is private rather than shared with the others.
+
+Workers are started with the "spawn" method so that none of them inherits
+indexes from the parent. Private and shared memory are read from
+/proc/self/smaps_rollup and are only reported on Linux.
+
+Usage:
+    python -m benchmarks.snapshot_startup [--sizes 1000 20000] [--workers 4] [--output results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+from data import sample_documents as corpus
+
+from .corpus_benchmarks import QUERIES, corpus_path
+
+
+def memory_mb() -> Dict[str, Optional[float]]:
+    """
+    Returns the private and shared resident memory of this process.
+
+    Returns:
+        Dict[str, Optional[float]]: ``private_mb`` and ``shared_mb`` in
+        megabytes, or None where /proc/self/smaps_rollup is unavailable
+    """
+    usage = {"private_mb": None, "shared_mb": None}
+    try:
+        with open("/proc/self/smaps_rollup") as handle:
+            fields = dict(line.split(":", 1) for line in handle if ":" in line and not line.startswith(" "))
+    except OSError:
+        return usage
+    kilobytes = {name: int(value.split()[0]) for name, value in fields.items() if value.strip().endswith("kB")}
+    usage["private_mb"] = (kilobytes.get("Private_Clean", 0) + kilobytes.get("Private_Dirty", 0)) / 1024
+    usage["shared_mb"] = (kilobytes.get("Shared_Clean", 0) + kilobytes.get("Shared_Dirty", 0)) / 1024
+    return usage
+
+
+def _worker(connection: Connection, path: str, snapshot: Optional[str], ready: Any) -> None:
+    # Child process: load, answer one query of each kind, report, then wait
+    # until every worker has reported so that shared pages are still mapped.
+    started = time.perf_counter()
+    corpus.load_corpus_file(path)
+    restored = corpus.load_snapshot(snapshot) if snapshot else False
+    loaded = time.perf_counter()
+    corpus.search_documents(QUERIES[0], 10)
+    corpus.vector_search_documents(QUERIES[0], 10)
+    corpus.facet_counts()
+    ready_at = time.perf_counter()
+    connection.send({
+        "restored": restored,
+        "load_s": loaded - started,
+        "ready_s": ready_at - started,
+        **memory_mb(),
+    })
+    ready.wait()
+    connection.close()
+
+
+def start_workers(path: str, snapshot: Optional[str], workers: int) -> List[Dict[str, Any]]:
+    """
+    Starts worker processes that load a corpus and collects their reports.
+
+    Args:
+        path (str): Corpus file
+        snapshot (str): Snapshot file, or None to build the indexes
+        workers (int): Number of concurrent workers
+
+    Returns:
+        List[Dict[str, Any]]: One report per worker
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    pipes, processes = [], []
+    for _ in range(workers):
+        parent, child = context.Pipe()
+        process = context.Process(target=_worker, args=(child, path, snapshot, ready))
+        process.start()
+        child.close()
+        pipes.append(parent)
+        processes.append(process)
+    reports = [pipe.recv() for pipe in pipes]
+    ready.set()
+    for process in processes:
+        process.join()
+    return reports
+
+
+def _summary(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def mean(key: str) -> Optional[float]:
+        values = [report[key] for report in reports if report[key] is not None]
+        return sum(values) / len(values) if values else None
+
+    return {
+        "restored": all(report["restored"] for report in reports),
+        "load_s": mean("load_s"),
+        "ready_s": mean("ready_s"),
+        "private_mb": mean("private_mb"),
+        "shared_mb": mean("shared_mb"),
+    }
+
+
+def run(sizes: List[int], workers: int, cache_dir: str, seed: int) -> Dict[str, Any]:
+    """
+    Compares building and snapshot loading for each corpus size.
+
+    Args:
+        sizes (List[int]): Corpus sizes in documents
+        workers (int): Concurrent workers per measurement
+        cache_dir (str): Directory for corpus and snapshot files
+        seed (int): Synthetic corpus seed
+
+    Returns:
+        Dict[str, Any]: Per size, the snapshot size and write time and the
+        mean worker report with and without the snapshot
+    """
+    results = {}
+    for size in sizes:
+        path = corpus_path(cache_dir, size, seed)
+        snapshot = os.path.join(cache_dir, f"synthetic-{size}-{seed}.zesnap")
+        corpus.load_corpus_file(path)
+        started = time.perf_counter()
+        snapshot_bytes = corpus.save_snapshot(snapshot)
+        save_s = time.perf_counter() - started
+        corpus.load_collection(corpus.SAMPLE_DOCUMENTS)
+        results[str(size)] = {
+            "snapshot_mb": snapshot_bytes / 2**20,
+            "build_and_save_s": save_s,
+            "rebuild": _summary(start_workers(path, None, workers)),
+            "snapshot": _summary(start_workers(path, snapshot, workers)),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare index rebuild and snapshot startup.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cache-dir", default=os.path.join(tempfile.gettempdir(), "zeroentropy-bench"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    results = {"workers": args.workers, "sizes": run(args.sizes, args.workers, args.cache_dir, args.seed)}
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main()
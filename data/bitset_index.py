@@ -0,0 +1,497 @@
+"""
+Bitset Index Module
+
+This module keeps one packed bitset per category and per tag, with bit ``i``
+set when document ``i`` carries the value. Bitsets are rows of uint64 words in
+one NumPy matrix per field, so metadata filters become word-wise AND, OR and
+AND NOT operations and counts become population counts.
+
+Facet counts need to be cheap for the filters a UI applies most: none, or a
+single category or tag. Those are answered from co-occurrence counts that are
+maintained alongside the bitsets (per tag, only once that tag has been asked
+for); compound filters are answered by intersecting every value's bitset with
+the filter and counting the bits.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+FIELDS = ("category", "tags")
+_ONE = np.uint64(1)
+# Words per block when scanning dense filters, sized to stay in cache.
+_BLOCK_WORDS = 4096
+
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    # NumPy < 2.0 has no popcount ufunc: count the bits of each byte with a
+    # lookup table and add up the eight bytes of every word.
+    _BYTE_BITS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        return _BYTE_BITS[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def _bit_positions(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    ids = np.asarray(ids, dtype=np.int64)
+    return ids >> 6, np.left_shift(_ONE, (ids & 63).astype(np.uint64))
+
+
+def _grow(matrix: np.ndarray, rows: int, columns: int) -> np.ndarray:
+    grown = np.zeros((rows, columns), dtype=matrix.dtype)
+    grown[:matrix.shape[0], :matrix.shape[1]] = matrix
+    return grown
+
+
+class _Field:
+    # Bitsets for one metadata field: a matrix with one row per value.
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.matrix = np.zeros((0, 0), dtype=np.uint64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def code(self, name: str, words: int) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+            if code >= self.matrix.shape[0]:
+                self.resize(max(8, 2 * self.matrix.shape[0]), words)
+        return code
+
+    def resize(self, rows: int, words: int) -> None:
+        matrix = np.zeros((rows, words), dtype=np.uint64)
+        matrix[:self.matrix.shape[0], :self.matrix.shape[1]] = self.matrix
+        self.matrix = matrix
+        counts = np.zeros(rows, dtype=np.int64)
+        counts[:len(self.counts)] = self.counts
+        self.counts = counts
+
+
+class BitsetIndex:
+    """
+    Packed per-value bitsets over the ``category`` and ``tags`` fields.
+
+    Document ids are the ids assigned by ``DocumentIndex``; bits of removed
+    documents are cleared, so every bitset only ever covers live documents.
+
+    Memory grows with the vocabulary: every category and tag has a bitset of
+    one bit per document, and a category-by-tag count matrix is kept. Tag-by-tag
+    counts are not precomputed, since with V tags they would take 8 * V**2
+    bytes (128 MiB for 4096 tags). Instead, the counts for one tag are computed
+    by a bitset scan the first time that tag is used as a facet filter, and
+    are then kept up to date for the ``max_pair_rows`` most recently used tags.
+    """
+
+    def __init__(self, max_pair_rows: int = 256):
+        """
+        Creates an empty index.
+
+        Args:
+            max_pair_rows (int): Number of tags whose co-occurrence counts with
+                every other tag are cached, each costing 8 bytes per tag in
+                the vocabulary
+        """
+        self._fields = {field: _Field() for field in FIELDS}
+        self._alive = np.zeros(0, dtype=np.uint64)
+        self._size = 0
+        self.max_pair_rows = max_pair_rows
+        # Documents per (category, tag) pair, and per tag for the cached tags
+        # in least recently used order.
+        self._category_tags = np.zeros((0, 0), dtype=np.int64)
+        self._tag_pairs: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(_popcount(self._alive).sum())
+
+    @property
+    def words(self) -> int:
+        """Number of uint64 words covering every document id seen so far."""
+        return (self._size + 63) >> 6
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._alive)
+        if size <= capacity * 64:
+            return
+        words = max((size + 63) >> 6, 2 * capacity)
+        alive = np.zeros(words, dtype=np.uint64)
+        alive[:capacity] = self._alive
+        self._alive = alive
+        for field in self._fields.values():
+            field.resize(field.matrix.shape[0], words)
+
+    def _reserve_pairs(self) -> None:
+        categories = self._fields["category"].matrix.shape[0]
+        tags = self._fields["tags"].matrix.shape[0]
+        if self._category_tags.shape != (categories, tags):
+            self._category_tags = _grow(self._category_tags, categories, tags)
+
+    def _count_pairs(self, category: int, tags: Sequence[int], delta: int) -> None:
+        self._reserve_pairs()
+        tags = np.asarray(tags, dtype=np.intp)
+        self._category_tags[category, tags] += delta
+        for code in tags.tolist():
+            row = self._tag_pairs.get(code)
+            if row is not None:
+                if len(row) <= tags.max():
+                    row = self._tag_pairs[code] = _grow(row[np.newaxis], 1, len(self._fields["tags"].names))[0]
+                row[tags] += delta
+
+    def _pair_row(self, code: int) -> np.ndarray:
+        # Documents per tag among those carrying tag ``code``.
+        row = self._tag_pairs.pop(code, None)
+        if row is None:
+            tags = self._fields["tags"]
+            row = self._intersection_counts(tags, tags.matrix[code, :self.words])
+        self._tag_pairs[code] = row
+        if len(self._tag_pairs) > self.max_pair_rows:
+            del self._tag_pairs[next(iter(self._tag_pairs))]
+        return row
+
+    @staticmethod
+    def _values(document: Mapping[str, Any], field: str) -> Iterable[str]:
+        return dict.fromkeys(document["tags"]) if field == "tags" else (document["category"],)
+
+    def add(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        """
+        Sets the bits of a document.
+
+        Args:
+            doc_id (int): Id assigned by DocumentIndex
+            document (Mapping[str, Any]): Document with ``category`` and ``tags``
+        """
+        self._reserve(doc_id + 1)
+        self._size = max(self._size, doc_id + 1)
+        word, bit = doc_id >> 6, _ONE << np.uint64(doc_id & 63)
+        self._alive[word] |= bit
+        codes = {}
+        for name, field in self._fields.items():
+            codes[name] = [field.code(value, len(self._alive)) for value in self._values(document, name)]
+            for code in codes[name]:
+                field.matrix[code, word] |= bit
+                field.counts[code] += 1
+        self._count_pairs(codes["category"][0], codes["tags"], 1)
+
+    def remove(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        """
+        Clears the bits of a document.
+
+        Args:
+            doc_id (int): Id the document was added under
+            document (Mapping[str, Any]): The document as it was added
+        """
+        word, bit = doc_id >> 6, ~(_ONE << np.uint64(doc_id & 63))
+        self._alive[word] &= bit
+        codes = {}
+        for name, field in self._fields.items():
+            codes[name] = [field.codes[value] for value in self._values(document, name)]
+            for code in codes[name]:
+                field.matrix[code, word] &= bit
+                field.counts[code] -= 1
+        self._count_pairs(codes["category"][0], codes["tags"], -1)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Tuple[int, Mapping[str, Any]]]) -> "BitsetIndex":
+        """
+        Builds the bitsets for (id, document) pairs in one vectorized pass.
+
+        Args:
+            documents (Iterable[Tuple[int, Mapping[str, Any]]]): Documents with their ids
+
+        Returns:
+            BitsetIndex: The populated index
+        """
+        index = cls()
+        doc_ids: List[int] = []
+        postings: Dict[str, Tuple[List[int], List[int]]] = {field: ([], []) for field in FIELDS}
+        for doc_id, document in documents:
+            doc_ids.append(doc_id)
+            for name, field in index._fields.items():
+                ids, codes = postings[name]
+                for value in index._values(document, name):
+                    ids.append(doc_id)
+                    codes.append(field.code(value, 0))
+        if not doc_ids:
+            return index
+        index._size = max(doc_ids) + 1
+        index._reserve(index._size)
+        words, bits = _bit_positions(doc_ids)
+        np.bitwise_or.at(index._alive, words, bits)
+        for name, field in index._fields.items():
+            ids, codes = postings[name]
+            words, bits = _bit_positions(ids)
+            codes = np.asarray(codes, dtype=np.int64)
+            np.bitwise_or.at(field.matrix, (codes, words), bits)
+            field.counts[:len(field.names)] = np.bincount(codes, minlength=len(field.names))
+
+        # Documents per (category, tag) pair.
+        index._reserve_pairs()
+        categories = np.zeros(index._size, dtype=np.int64)
+        categories[postings["category"][0]] = postings["category"][1]
+        tag_ids = np.asarray(postings["tags"][0], dtype=np.int64)
+        tag_codes = np.asarray(postings["tags"][1], dtype=np.int64)
+        width = index._category_tags.shape[1]
+        index._category_tags += np.bincount(
+            categories[tag_ids] * width + tag_codes, minlength=index._category_tags.size
+        ).reshape(index._category_tags.shape)
+        return index
+
+    def names(self, field: str) -> List[str]:
+        """
+        Returns the values of a field that currently have documents.
+
+        Args:
+            field (str): "category" or "tags"
+
+        Returns:
+            List[str]: Values in order of first appearance
+        """
+        values = self._fields[field]
+        return [name for name, count in zip(values.names, values.counts) if count]
+
+    def bits(self, field: str, value: str) -> np.ndarray:
+        """
+        Returns the bitset of one value.
+
+        Args:
+            field (str): "category" or "tags"
+            value (str): Category or tag
+
+        Returns:
+            np.ndarray: uint64 words (all zero for an unknown value); do not modify
+        """
+        values = self._fields[field]
+        code = values.codes.get(value)
+        if code is None:
+            return np.zeros(self.words, dtype=np.uint64)
+        return values.matrix[code, :self.words]
+
+    def alive(self) -> np.ndarray:
+        """
+        Returns the bitset of all live documents.
+
+        Returns:
+            np.ndarray: uint64 words; do not modify
+        """
+        return self._alive[:self.words]
+
+    def filter_bits(
+        self,
+        category: Optional[str] = None,
+        all_tags: Iterable[str] = (),
+        any_tags: Iterable[str] = (),
+        none_tags: Iterable[str] = (),
+    ) -> np.ndarray:
+        """
+        Evaluates a category and tag filter as bitset operations.
+
+        Args:
+            category (str): Optional category the documents must belong to
+            all_tags (Iterable[str]): Tags that must all be present (AND)
+            any_tags (Iterable[str]): Tags of which at least one must be present (OR)
+            none_tags (Iterable[str]): Tags that must not be present (NOT)
+
+        Returns:
+            np.ndarray: A new bitset of matching documents
+        """
+        result = self.alive().copy()
+        if category:
+            result &= self.bits("category", category)
+        for tag in all_tags:
+            result &= self.bits("tags", tag)
+        any_tags = list(any_tags)
+        if any_tags:
+            matched = np.zeros_like(result)
+            for tag in any_tags:
+                matched |= self.bits("tags", tag)
+            result &= matched
+        for tag in none_tags:
+            result &= ~self.bits("tags", tag)
+        return result
+
+    @staticmethod
+    def count(bits: np.ndarray) -> int:
+        """
+        Counts the documents in a bitset.
+
+        Args:
+            bits (np.ndarray): Bitset
+
+        Returns:
+            int: Number of set bits
+        """
+        return int(_popcount(bits).sum())
+
+    @staticmethod
+    def ids(bits: np.ndarray) -> np.ndarray:
+        """
+        Lists the documents in a bitset.
+
+        Only non-zero words are expanded, so sparse bitsets are cheap.
+
+        Args:
+            bits (np.ndarray): Bitset
+
+        Returns:
+            np.ndarray: Sorted document ids
+        """
+        words = np.flatnonzero(bits)
+        unpacked = np.unpackbits(bits[words].view(np.uint8), bitorder="little").reshape(-1, 64)
+        rows, offsets = np.nonzero(unpacked)
+        return words[rows] * 64 + offsets
+
+    def facet_counts(
+        self,
+        field: str,
+        bits: Optional[np.ndarray] = None,
+        top_n: Optional[int] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        Counts matching documents per value of a field.
+
+        Without a filter the counts are maintained incrementally. With one,
+        every value's bitset is intersected with the filter in one matrix
+        operation restricted to the filter's non-zero words, so sparse
+        filters only touch a few columns.
+
+        Args:
+            field (str): "category" or "tags"
+            bits (np.ndarray): Optional filter bitset, e.g. from ``filter_bits``
+            top_n (int): Optional number of facets to return
+
+        Returns:
+            List[Tuple[str, int]]: (value, count) pairs with a non-zero count,
+            by descending count then value
+        """
+        values = self._fields[field]
+        if bits is None:
+            return self._top(values, values.counts[:len(values.names)], top_n)
+        return self._top(values, self._intersection_counts(values, bits), top_n)
+
+    def _intersection_counts(self, values: _Field, bits: np.ndarray) -> np.ndarray:
+        rows = len(values.names)
+        matrix = values.matrix[:rows, :self.words]
+        words = np.flatnonzero(bits)
+        if 2 * len(words) < self.words:
+            return _popcount(matrix[:, words] & bits[words]).sum(axis=1, dtype=np.int64)
+        counts = np.zeros(rows, dtype=np.int64)
+        for start in range(0, self.words, _BLOCK_WORDS):
+            block = slice(start, start + _BLOCK_WORDS)
+            counts += _popcount(matrix[:, block] & bits[block]).sum(axis=1, dtype=np.int64)
+        return counts
+
+    @staticmethod
+    def _top(values: _Field, counts: np.ndarray, top_n: Optional[int]) -> List[Tuple[str, int]]:
+        facets = [(values.names[code], int(counts[code])) for code in np.flatnonzero(counts)]
+        facets.sort(key=lambda facet: (-facet[1], facet[0]))
+        return facets[:top_n] if top_n is not None else facets
+
+    def facets(
+        self,
+        category: Optional[str] = None,
+        all_tags: Sequence[str] = (),
+        any_tags: Sequence[str] = (),
+        none_tags: Sequence[str] = (),
+        top_n: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Computes category and tag facets for a filtered result set.
+
+        No filter, or a filter on a single category or tag, is answered from
+        co-occurrence counts in time independent of the collection size (for
+        a tag, after a first bitset scan that caches its counts); any other
+        filter is evaluated as bitset operations.
+
+        Args:
+            category (str): Optional category filter
+            all_tags (Sequence[str]): Tags that must all be present (AND)
+            any_tags (Sequence[str]): Tags of which at least one must be present (OR)
+            none_tags (Sequence[str]): Tags that must not be present (NOT)
+            top_n (int): Optional number of facets to return per field
+
+        Returns:
+            Dict[str, Any]: ``total`` matching documents, and ``category`` and
+            ``tags`` as (value, count) pairs by descending count
+        """
+        categories, tags = self._fields["category"], self._fields["tags"]
+        # A single "any" tag is the same constraint as a single "all" tag.
+        required = set(all_tags) | (set(any_tags) if len(set(any_tags)) == 1 else set())
+        simple = not none_tags and len(set(any_tags)) <= 1 and len(required) + bool(category) <= 1
+        if simple and not category and not required:
+            return {
+                "total": len(self),
+                "category": self.facet_counts("category", top_n=top_n),
+                "tags": self.facet_counts("tags", top_n=top_n),
+            }
+        if simple and category:
+            code = categories.codes.get(category)
+            if code is None or not categories.counts[code]:
+                return {"total": 0, "category": [], "tags": []}
+            total = int(categories.counts[code])
+            return {
+                "total": total,
+                "category": [(category, total)],
+                "tags": self._top(tags, self._category_tags[code, :len(tags.names)], top_n),
+            }
+        if simple:
+            code = tags.codes.get(next(iter(required)))
+            if code is None or not tags.counts[code]:
+                return {"total": 0, "category": [], "tags": []}
+            return {
+                "total": int(tags.counts[code]),
+                "category": self._top(categories, self._category_tags[:len(categories.names), code], top_n),
+                "tags": self._top(tags, self._pair_row(code)[:len(tags.names)], top_n),
+            }
+        bits = self.filter_bits(category, all_tags, any_tags, none_tags)
+        return {
+            "total": self.count(bits),
+            "category": self.facet_counts("category", bits, top_n),
+            "tags": self.facet_counts("tags", bits, top_n),
+        }
+
+    def snapshot_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Returns the state to store in an index snapshot.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], Dict[str, Any]]: Arrays and metadata
+            (the size and value names) accepted by ``from_snapshot``
+        """
+        arrays = {"alive": self._alive, "category_tags": self._category_tags}
+        for name, field in self._fields.items():
+            arrays[f"{name}.matrix"] = field.matrix
+            arrays[f"{name}.counts"] = field.counts
+        meta = {
+            "size": self._size,
+            "max_pair_rows": self.max_pair_rows,
+            "names": {name: field.names for name, field in self._fields.items()},
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_snapshot(cls, arrays: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> "BitsetIndex":
+        """
+        Restores an index from snapshot arrays without copying them.
+
+        Args:
+            arrays (Mapping[str, np.ndarray]): Arrays from ``snapshot_arrays``
+            meta (Mapping[str, Any]): Metadata from ``snapshot_arrays``
+
+        Returns:
+            BitsetIndex: The index, backed by the given arrays
+        """
+        index = cls(meta["max_pair_rows"])
+        index._size = meta["size"]
+        index._alive = arrays["alive"]
+        index._category_tags = arrays["category_tags"]
+        for name, field in index._fields.items():
+            field.names = list(meta["names"][name])
+            field.codes = {value: code for code, value in enumerate(field.names)}
+            field.matrix = arrays[f"{name}.matrix"]
+            field.counts = arrays[f"{name}.counts"]
+        return index
@@ -0,0 +1,239 @@
+"""
+Boolean Query Module
+
+This module parses boolean metadata expressions such as
+
+    (Finance OR Legal) AND tag:Risk AND NOT tag:Compliance
+
+and evaluates them as operations on the packed bitsets of a BitsetIndex, so
+the cost of a filter depends on the number of terms and the collection size
+in words rather than on per-document Python work.
+
+Grammar, from loosest to tightest binding:
+
+    expression := term (OR term)*
+    term       := factor ([AND] factor)*      adjacent factors are ANDed
+    factor     := NOT factor | "(" expression ")" | value
+    value      := [category: | tag:] word-or-quoted-string
+
+A value without a prefix is a category. Operators are case-insensitive and
+values are matched exactly; quote values containing spaces or parentheses,
+e.g. tag:"Risk Management".
+"""
+
+import re
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from .bitset_index import BitsetIndex
+from .predicates import Predicate, all_of, any_of, category_is, has_any_tag, negate
+
+# Parsed expressions are nested tuples: ("category", value), ("tag", value),
+# ("not", node), ("and", nodes) and ("or", nodes). They are hashable, so they
+# can be used as cache keys.
+Node = Tuple[Any, ...]
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+))')
+_PREFIXES = {"category": "category", "cat": "category", "tag": "tag", "tags": "tag"}
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+class QuerySyntaxError(ValueError):
+    """
+    Raised for malformed expressions; ``position`` is the character offset of
+    the offending token.
+    """
+
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+
+def tokenize_query(text: str) -> List[Tuple[str, str, int]]:
+    """
+    Splits an expression into tokens.
+
+    Args:
+        text (str): Expression
+
+    Returns:
+        List[Tuple[str, str, int]]: (kind, value, position) triples, where
+        kind is "(", ")", an operator, or "value"; field prefixes stay part
+        of the value token, e.g. ("value", "tag:Risk", 12)
+    """
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            if text[position:].strip():
+                raise QuerySyntaxError("unterminated quote", text.index('"', position))
+            break
+        start = match.start(match.lastindex)
+        opening, closing, quoted, word = match.groups()
+        if opening or closing:
+            tokens.append((opening or closing, opening or closing, start))
+        elif quoted is not None:
+            tokens.append(("value", re.sub(r"\\(.)", r"\1", quoted), start - 1))
+        elif word.upper() in _OPERATORS:
+            tokens.append((word.upper(), word, start))
+        elif word.endswith(":") and text.startswith('"', match.end()):
+            # Prefix followed by a quoted value, e.g. tag:"Risk Management".
+            quoted_value = _TOKEN.match(text, match.end())
+            if quoted_value is None or quoted_value.group(3) is None:
+                raise QuerySyntaxError("unterminated quote", match.end())
+            tokens.append(("value", word + re.sub(r"\\(.)", r"\1", quoted_value.group(3)), start))
+            match = quoted_value
+        else:
+            tokens.append(("value", word, start))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    # Recursive-descent parser over the token list.
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize_query(text)
+        self.position = 0
+
+    def peek(self) -> str:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else ""
+
+    def take(self) -> Tuple[str, str, int]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def error(self, message: str) -> QuerySyntaxError:
+        offset = self.tokens[self.position][2] if self.position < len(self.tokens) else len(self.text)
+        return QuerySyntaxError(message, offset)
+
+    def expression(self) -> Node:
+        terms = [self.term()]
+        while self.peek() == "OR":
+            self.take()
+            terms.append(self.term())
+        return terms[0] if len(terms) == 1 else ("or", tuple(terms))
+
+    def term(self) -> Node:
+        factors = [self.factor()]
+        while self.peek() in ("AND", "NOT", "(", "value"):
+            if self.peek() == "AND":
+                self.take()
+            factors.append(self.factor())
+        return factors[0] if len(factors) == 1 else ("and", tuple(factors))
+
+    def factor(self) -> Node:
+        kind = self.peek()
+        if kind == "NOT":
+            self.take()
+            return ("not", self.factor())
+        if kind == "(":
+            self.take()
+            node = self.expression()
+            if self.peek() != ")":
+                raise self.error("expected ')'")
+            self.take()
+            return node
+        if kind == "value":
+            _, value, offset = self.take()
+            prefix, separator, rest = value.partition(":")
+            field = _PREFIXES.get(prefix.lower()) if separator else None
+            if field is None:
+                return ("category", value)
+            if not rest:
+                raise QuerySyntaxError(f"missing value after '{prefix}:'", offset)
+            return (field, rest)
+        raise self.error("expected a value, NOT or '('" if kind else "unexpected end of expression")
+
+
+def parse_query(text: str) -> Node:
+    """
+    Parses a boolean metadata expression.
+
+    Args:
+        text (str): Expression, e.g. '(Finance OR Legal) AND tag:Risk'
+
+    Returns:
+        Node: Parsed expression
+
+    Raises:
+        QuerySyntaxError: If the expression is malformed
+    """
+    parser = _Parser(text)
+    node = parser.expression()
+    if parser.position < len(parser.tokens):
+        raise parser.error("unexpected token")
+    return node
+
+
+def evaluate(node: Node, index: BitsetIndex) -> np.ndarray:
+    """
+    Evaluates a parsed expression against a bitset index.
+
+    Negations inside a conjunction are applied as AND NOT to the other
+    terms instead of being evaluated against all live documents first.
+
+    Args:
+        node (Node): Parsed expression
+        index (BitsetIndex): Index to evaluate against
+
+    Returns:
+        np.ndarray: A new bitset of matching live documents
+    """
+    kind = node[0]
+    if kind == "category":
+        return index.bits("category", node[1]).copy()
+    if kind == "tag":
+        return index.bits("tags", node[1]).copy()
+    if kind == "not":
+        return index.alive() & ~_positive(node[1], index)
+    if kind == "or":
+        result = evaluate(node[1][0], index)
+        for child in node[1][1:]:
+            result |= _positive(child, index)
+        return result
+    positives = [child for child in node[1] if child[0] != "not"]
+    negatives = [child[1] for child in node[1] if child[0] == "not"]
+    result = evaluate(positives[0], index) if positives else index.alive().copy()
+    for child in positives[1:]:
+        result &= _positive(child, index)
+    for child in negatives:
+        result &= ~_positive(child, index)
+    return result
+
+
+def _positive(node: Node, index: BitsetIndex) -> np.ndarray:
+    # Leaves are returned as views into the index to avoid a copy; callers
+    # only read them.
+    if node[0] == "category":
+        return index.bits("category", node[1])
+    if node[0] == "tag":
+        return index.bits("tags", node[1])
+    return evaluate(node, index)
+
+
+def to_predicate(node: Node) -> Predicate:
+    """
+    Converts a parsed expression into a document predicate, for filtering
+    documents while streaming them.
+
+    Args:
+        node (Node): Parsed expression
+
+    Returns:
+        Predicate: Predicate equivalent to the expression
+    """
+    kind = node[0]
+    if kind == "category":
+        return category_is(node[1])
+    if kind == "tag":
+        return has_any_tag(node[1])
+    if kind == "not":
+        return negate(to_predicate(node[1]))
+    combine = all_of if kind == "and" else any_of
+    return combine(*(to_predicate(child) for child in node[1]))
+
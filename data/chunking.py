@@ -0,0 +1,242 @@
+"""
+Passage Chunking Module
+
+This module normalizes document content and splits it into sentence-aware,
+overlapping passages before upload. Each passage carries a stable id derived
+from its de-duplicated document path and position, plus character offsets into the
+normalized content, so snippets returned by search can be mapped back to the
+source text.
+
+Large collections are chunked across a process pool with a bounded number of
+batches in flight, and passages are emitted as a stream in document order;
+small ones are chunked in the calling process.
+
+Usage:
+    python -m data.chunking [--corpus FILE] [--output passages.jsonl] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .sample_documents import iter_document_paths
+
+_WHITESPACE = re.compile(r"\s+")
+# A sentence ends at ., ! or ? followed by whitespace and an uppercase letter,
+# digit, currency sign or opening bracket. Decimals such as "$2.4M" never match
+# because there is no whitespace after the point.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9$(\"'])")
+# Collections smaller than this are chunked in the calling process unless a
+# worker count is given, since starting a pool costs more than the chunking.
+PARALLEL_THRESHOLD = 2048
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapses runs of whitespace (including hard line breaks) into single spaces.
+
+    Args:
+        text (str): Raw content
+
+    Returns:
+        str: Normalized, stripped content
+    """
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Splits normalized text into sentences.
+
+    Args:
+        text (str): Normalized text
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) character offsets of each sentence
+    """
+    spans = []
+    start = 0
+    for match in _SENTENCE_BREAK.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def _split_long(text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    # Breaks an over-long sentence at the last space before the limit.
+    pieces = []
+    while end - start > max_chars:
+        cut = text.rfind(" ", start, start + max_chars)
+        if cut <= start:
+            cut = start + max_chars
+        pieces.append((start, cut))
+        start = cut + 1 if text[cut:cut + 1] == " " else cut
+    pieces.append((start, end))
+    return pieces
+
+
+def chunk_text(text: str, max_chars: int = 500, overlap: int = 1) -> List[Tuple[int, int]]:
+    """
+    Groups sentences of normalized text into overlapping passages.
+
+    Consecutive sentences are packed until adding another would exceed
+    ``max_chars``; each following passage starts ``overlap`` sentences before
+    the previous one ended. Sentences longer than ``max_chars`` are split at
+    word boundaries.
+
+    Args:
+        text (str): Normalized text
+        max_chars (int): Maximum passage length
+        overlap (int): Number of sentences shared by consecutive passages
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) character offsets of each passage
+    """
+    sentences = []
+    for start, end in sentence_spans(text):
+        sentences.extend(_split_long(text, start, end, max_chars))
+    passages = []
+    first = 0
+    while first < len(sentences):
+        last = first
+        while last + 1 < len(sentences) and sentences[last + 1][1] - sentences[first][0] <= max_chars:
+            last += 1
+        passages.append((sentences[first][0], sentences[last][1]))
+        if last + 1 >= len(sentences):
+            break
+        first = max(first + 1, last + 1 - overlap)
+    return passages
+
+
+def chunk_document(
+    path: str,
+    document: Mapping[str, Any],
+    max_chars: int = 500,
+    overlap: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Normalizes a document and splits it into passages.
+
+    Args:
+        path (str): Path of the document, unique within its collection (see
+            sample_documents.iter_document_paths)
+        document (Mapping[str, Any]): Document with title, content and category
+        max_chars (int): Maximum passage length
+        overlap (int): Number of sentences shared by consecutive passages
+
+    Returns:
+        List[Dict[str, Any]]: Passages with ``id``, ``path``, ``index``,
+        ``start``, ``end``, ``text``, ``title`` and ``category``
+    """
+    content = normalize_whitespace(document["content"])
+    return [
+        {
+            "id": f"{path}#{index}",
+            "path": path,
+            "index": index,
+            "start": start,
+            "end": end,
+            "text": content[start:end],
+            "title": document["title"],
+            "category": document["category"],
+        }
+        for index, (start, end) in enumerate(chunk_text(content, max_chars, overlap))
+    ]
+
+
+def _chunk_batch(task: Tuple[List[Tuple[str, Dict[str, Any]]], int, int]) -> List[Dict[str, Any]]:
+    documents, max_chars, overlap = task
+    passages = []
+    for path, document in documents:
+        passages.extend(chunk_document(path, document, max_chars, overlap))
+    return passages
+
+
+def _plain(document: Mapping[str, Any]) -> Dict[str, Any]:
+    # Storage views are converted to dicts so they can be sent to workers.
+    to_dict = getattr(document, "to_dict", None)
+    return to_dict() if to_dict else dict(document)
+
+
+def iter_passages(
+    documents: Iterable[Tuple[str, Mapping[str, Any]]],
+    max_chars: int = 500,
+    overlap: int = 1,
+    workers: Optional[int] = None,
+    batch_size: int = 256,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams passages for a collection, chunking batches across processes.
+
+    At most two batches per worker are in flight, so memory stays bounded for
+    arbitrarily large inputs and passages come out in document order.
+
+    Args:
+        documents (Iterable[Tuple[str, Mapping[str, Any]]]): (path, document)
+            pairs from sample_documents.iter_document_paths
+        max_chars (int): Maximum passage length
+        overlap (int): Number of sentences shared by consecutive passages
+        workers (int): Worker processes; 1 chunks in the calling process and
+            None uses the CPU count for collections of at least
+            ``PARALLEL_THRESHOLD`` documents and the calling process otherwise
+        batch_size (int): Documents per task sent to a worker
+
+    Returns:
+        Iterator[Dict[str, Any]]: Passages as produced by ``chunk_document``
+    """
+    documents = iter(documents)
+    if workers is None:
+        head = list(islice(documents, PARALLEL_THRESHOLD))
+        workers = (os.cpu_count() or 1) if len(head) == PARALLEL_THRESHOLD else 1
+        documents = chain(head, documents)
+    if workers <= 1:
+        for path, document in documents:
+            yield from chunk_document(path, document, max_chars, overlap)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                batch = [(path, _plain(document)) for path, document in islice(documents, batch_size)]
+                if not batch:
+                    break
+                pending.append(executor.submit(_chunk_batch, (batch, max_chars, overlap)))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chunk documents into passages as JSON lines.")
+    parser.add_argument("--corpus", help="corpus file (defaults to the active collection)")
+    parser.add_argument("--output", help="output path (defaults to stdout)")
+    parser.add_argument("--max-chars", type=int, default=500)
+    parser.add_argument("--overlap", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    from . import sample_documents
+
+    if args.corpus:
+        sample_documents.load_corpus_file(args.corpus)
+    passages = iter_passages(iter_document_paths(), args.max_chars, args.overlap, args.workers)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for passage in passages:
+            output.write(json.dumps(passage, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Columnar Store Module
+
+This module provides a compact columnar layout for document collections. Instead
+of one dict per document, categories and tags are interned to integer codes,
+tag memberships are packed into CSR-style offset/value arrays, and titles and
+content live in shared UTF-8 buffers addressed by offsets. Rows are exposed as
+lightweight read-only views so existing code that reads documents as mappings
+keeps working.
+"""
+
+from array import array
+from collections.abc import Mapping as MappingABC, Sequence as SequenceABC
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+
+class DocumentView(MappingABC):
+    """
+    Read-only mapping view over one row of a ``ColumnarDocumentStore``.
+
+    Fields are decoded from the store on access, so a view costs two slots
+    regardless of document size. Views compare equal to plain document dicts
+    with the same fields.
+    """
+
+    __slots__ = ("_store", "row")
+
+    FIELDS = ("title", "content", "category", "tags")
+
+    def __init__(self, store: "ColumnarDocumentStore", row: int):
+        self._store = store
+        self.row = row
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "title":
+            return self._store.title(self.row)
+        if key == "content":
+            return self._store.content(self.row)
+        if key == "category":
+            return self._store.category(self.row)
+        if key == "tags":
+            return self._store.tags(self.row)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"DocumentView(row={self.row}, title={self._store.title(self.row)!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Materialises the row as a plain document dict.
+
+        Returns:
+            Dict[str, Any]: Document with title, content, category and tags
+        """
+        return {field: self[field] for field in self.FIELDS}
+
+
+class ColumnarDocumentStore(SequenceABC):
+    """
+    Append-only columnar document collection.
+
+    Column layout for ``n`` documents:
+
+    - ``category_codes``: n interned category codes
+    - ``tag_offsets`` / ``tag_values``: CSR arrays; the tag codes of row ``i``
+      are ``tag_values[tag_offsets[i]:tag_offsets[i + 1]]``
+    - ``title_offsets`` / ``titles`` and ``content_offsets`` / ``contents``:
+      UTF-8 buffers with n + 1 offsets each
+    """
+
+    def __init__(self):
+        self.category_names: List[str] = []
+        self.tag_names: List[str] = []
+        self._category_lookup: Dict[str, int] = {}
+        self._tag_lookup: Dict[str, int] = {}
+        self.category_codes = array("I")
+        self.tag_offsets = array("Q", [0])
+        self.tag_values = array("I")
+        self.title_offsets = array("Q", [0])
+        self.titles = bytearray()
+        self.content_offsets = array("Q", [0])
+        self.contents = bytearray()
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Mapping[str, Any]]) -> "ColumnarDocumentStore":
+        """
+        Builds a store from an iterable of document dicts.
+
+        Args:
+            documents (Iterable[Mapping[str, Any]]): Documents with title, content, category and tags
+
+        Returns:
+            ColumnarDocumentStore: The populated store
+        """
+        store = cls()
+        for document in documents:
+            store.append(document)
+        return store
+
+    @staticmethod
+    def _intern(value: str, names: List[str], lookup: Dict[str, int]) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(names)
+            names.append(value)
+        return code
+
+    def append(self, document: Mapping[str, Any]) -> DocumentView:
+        """
+        Appends a document to the store.
+
+        Args:
+            document (Mapping[str, Any]): Document with title, content, category and tags
+
+        Returns:
+            DocumentView: View over the new row
+        """
+        self.category_codes.append(self._intern(document["category"], self.category_names, self._category_lookup))
+        self.tag_values.extend(self._intern(tag, self.tag_names, self._tag_lookup) for tag in document["tags"])
+        self.tag_offsets.append(len(self.tag_values))
+        self.titles += document["title"].encode("utf-8")
+        self.title_offsets.append(len(self.titles))
+        self.contents += document["content"].encode("utf-8")
+        self.content_offsets.append(len(self.contents))
+        return DocumentView(self, len(self.category_codes) - 1)
+
+    def __len__(self) -> int:
+        return len(self.category_codes)
+
+    def __getitem__(self, row: int) -> DocumentView:
+        if isinstance(row, slice):
+            return [DocumentView(self, index) for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("document row out of range")
+        return DocumentView(self, row)
+
+    def __iter__(self) -> Iterator[DocumentView]:
+        return (DocumentView(self, row) for row in range(len(self)))
+
+    def title(self, row: int) -> str:
+        """Decodes the title of a row."""
+        return self.titles[self.title_offsets[row]:self.title_offsets[row + 1]].decode("utf-8")
+
+    def content(self, row: int) -> str:
+        """Decodes the content of a row."""
+        return self.contents[self.content_offsets[row]:self.content_offsets[row + 1]].decode("utf-8")
+
+    def category_code(self, row: int) -> int:
+        """Returns the interned category code of a row."""
+        return self.category_codes[row]
+
+    def category(self, row: int) -> str:
+        """Returns the category name of a row."""
+        return self.category_names[self.category_codes[row]]
+
+    def tag_codes(self, row: int) -> array:
+        """Returns the interned tag codes of a row."""
+        return self.tag_values[self.tag_offsets[row]:self.tag_offsets[row + 1]]
+
+    def tags(self, row: int) -> List[str]:
+        """Returns the tag names of a row."""
+        names = self.tag_names
+        return [names[code] for code in self.tag_codes(row)]
+
+    def nbytes(self) -> int:
+        """
+        Returns the size of the column buffers in bytes.
+
+        Returns:
+            int: Bytes used by codes, offsets and text buffers (excluding the vocabularies)
+        """
+        columns = (self.category_codes, self.tag_offsets, self.tag_values, self.title_offsets, self.content_offsets)
+        return sum(column.itemsize * len(column) for column in columns) + len(self.titles) + len(self.contents)
@@ -0,0 +1,498 @@
+"""
+Document Index Module
+
+This module provides an inverted index from document categories and tags to
+document ids, so that metadata filters over the sample collection no longer
+need to scan every document. The index is kept up to date incrementally as
+documents are added or removed, and always returns results in insertion order.
+
+An index over a collection other than a list, such as a columnar store or a
+corpus file, keeps row numbers and resolves each document from the collection
+when it is read, so it holds no per-document objects. An index restored from a
+snapshot does the same and builds each postings list from the snapshot arrays
+the first time it is used.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections.abc import MutableMapping, Sequence as SequenceABC
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class DocumentIndex:
+    """
+    Inverted index over the ``category`` and ``tags`` fields of documents.
+
+    Every document receives a monotonically increasing integer id when it is
+    added, so postings lists stay sorted by construction and results can be
+    returned in a stable (insertion) order without re-sorting.
+    """
+
+    def __init__(self, documents: Iterable[Mapping[str, Any]] = ()):
+        self._documents: MutableMapping = {}
+        self._ids_by_object: Dict[int, int] = {}
+        self._categories: Dict[str, List[int]] = {}
+        self._tags: Dict[str, List[int]] = {}
+        self._next_id = 0
+        self.version = 0
+        if isinstance(documents, SequenceABC) and not isinstance(documents, list):
+            # Rows of a store or corpus are views created on access; keeping
+            # one per document would cost much of what the layout saves.
+            self._documents = _RowDocuments(documents)
+            for doc_id, document in enumerate(documents):
+                self._post(doc_id, document)
+            self._next_id = self.version = len(documents)
+            return
+        for document in documents:
+            self.add(document)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._documents.values())
+
+    def items(self) -> Iterator[Tuple[int, Mapping[str, Any]]]:
+        """
+        Iterates over (id, document) pairs in insertion order.
+
+        Returns:
+            Iterator[Tuple[int, Mapping[str, Any]]]: Indexed documents with their ids
+        """
+        return iter(self._documents.items())
+
+    def add(self, document: Mapping[str, Any]) -> int:
+        """
+        Adds a document to the index.
+
+        Args:
+            document (Mapping[str, Any]): Document with ``category`` and ``tags`` fields
+
+        Returns:
+            int: The id assigned to the document
+        """
+        doc_id = self._next_id
+        self._next_id += 1
+        self._documents[doc_id] = document
+        self._ids_by_object[id(document)] = doc_id
+        self._post(doc_id, document)
+        self.version += 1
+        return doc_id
+
+    def _post(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        self._categories.setdefault(document["category"], []).append(doc_id)
+        for tag in dict.fromkeys(document["tags"]):
+            self._tags.setdefault(tag, []).append(doc_id)
+
+    def remove(self, document: Mapping[str, Any]) -> int:
+        """
+        Removes a previously added document from the index.
+
+        Args:
+            document (Mapping[str, Any]): The same document object that was
+                added, or for a row-backed collection a view of the same row
+
+        Returns:
+            int: The id the document was stored under
+
+        Raises:
+            KeyError: If the document is not in the index
+        """
+        doc_id = self._ids_by_object.pop(id(document), None)
+        if doc_id is None:
+            if not isinstance(self._documents, _RowDocuments):
+                raise KeyError("document is not in the index")
+            doc_id = self._documents.id_of(document)
+        del self._documents[doc_id]
+        self._discard(self._categories, document["category"], doc_id)
+        for tag in dict.fromkeys(document["tags"]):
+            self._discard(self._tags, tag, doc_id)
+        self.version += 1
+        return doc_id
+
+    @staticmethod
+    def _discard(postings: Dict[str, List[int]], key: str, doc_id: int) -> None:
+        ids = postings[key]
+        del ids[bisect_left(ids, doc_id)]
+        if not ids:
+            del postings[key]
+
+    def categories(self) -> List[str]:
+        """
+        Returns all categories that have at least one document.
+
+        Returns:
+            List[str]: Categories in order of first appearance
+        """
+        return list(self._categories)
+
+    def tags(self) -> List[str]:
+        """
+        Returns all tags that have at least one document.
+
+        Returns:
+            List[str]: Tags in order of first appearance
+        """
+        return list(self._tags)
+
+    def category_ids(self, category: str) -> Sequence[int]:
+        """
+        Returns the sorted ids of documents in a category.
+
+        Args:
+            category (str): Category name
+
+        Returns:
+            Sequence[int]: Sorted document ids (empty if the category is unknown)
+        """
+        return self._categories.get(category, ())
+
+    def tag_ids(self, tag: str) -> Sequence[int]:
+        """
+        Returns the sorted ids of documents carrying a tag.
+
+        Args:
+            tag (str): Tag name
+
+        Returns:
+            Sequence[int]: Sorted document ids (empty if the tag is unknown)
+        """
+        return self._tags.get(tag, ())
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        all_tags: Iterable[str] = (),
+        any_tags: Iterable[str] = (),
+        none_tags: Iterable[str] = (),
+    ) -> List[int]:
+        """
+        Evaluates a metadata filter against the index.
+
+        Args:
+            category (str): Optional category the documents must belong to
+            all_tags (Iterable[str]): Tags that must all be present (AND)
+            any_tags (Iterable[str]): Tags of which at least one must be present (OR)
+            none_tags (Iterable[str]): Tags that must not be present (NOT)
+
+        Returns:
+            List[int]: Matching document ids in insertion order
+        """
+        candidates: Optional[set] = None
+        required = [self.tag_ids(tag) for tag in all_tags]
+        if category:
+            required.append(self.category_ids(category))
+        for ids in sorted(required, key=len):
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+            if not candidates:
+                return []
+
+        any_tags = list(any_tags)
+        if any_tags:
+            matched = set()
+            for tag in any_tags:
+                matched.update(self.tag_ids(tag))
+            candidates = matched if candidates is None else candidates & matched
+
+        if candidates is None:
+            candidates = set(self._documents)
+        for tag in none_tags:
+            candidates.difference_update(self.tag_ids(tag))
+        return sorted(candidates)
+
+    def iter_ids(self, after: Optional[int] = None) -> Iterator[int]:
+        """
+        Lazily iterates over live document ids in insertion order.
+
+        Args:
+            after (int): Optional cursor; only ids greater than it are yielded
+
+        Returns:
+            Iterator[int]: Document ids
+        """
+        start = 0 if after is None else after + 1
+        documents = self._documents
+        return (doc_id for doc_id in range(start, self._next_id) if doc_id in documents)
+
+    @staticmethod
+    def _iter_postings(ids: Sequence[int], after: Optional[int]) -> Iterator[int]:
+        start = 0 if after is None else bisect_right(ids, after)
+        return (ids[position] for position in range(start, len(ids)))
+
+    @staticmethod
+    def _contains(ids: Sequence[int], doc_id: int) -> bool:
+        position = bisect_left(ids, doc_id)
+        return position < len(ids) and ids[position] == doc_id
+
+    def iter_search(
+        self,
+        category: Optional[str] = None,
+        all_tags: Iterable[str] = (),
+        any_tags: Iterable[str] = (),
+        none_tags: Iterable[str] = (),
+        after: Optional[int] = None,
+    ) -> Iterator[int]:
+        """
+        Lazily evaluates a metadata filter, yielding matches in insertion order.
+
+        Unlike ``search`` no intermediate sets are built: the most selective
+        postings list drives iteration and the remaining constraints are checked
+        by binary search, so the cost is proportional to the ids consumed.
+
+        Args:
+            category (str): Optional category the documents must belong to
+            all_tags (Iterable[str]): Tags that must all be present (AND)
+            any_tags (Iterable[str]): Tags of which at least one must be present (OR)
+            none_tags (Iterable[str]): Tags that must not be present (NOT)
+            after (int): Optional cursor; only ids greater than it are yielded
+
+        Returns:
+            Iterator[int]: Matching document ids
+        """
+        required = [self.tag_ids(tag) for tag in all_tags]
+        if category:
+            required.append(self.category_ids(category))
+        required.sort(key=len)
+        alternatives = [self.tag_ids(tag) for tag in any_tags]
+        excluded = [self.tag_ids(tag) for tag in none_tags]
+
+        if required:
+            source = self._iter_postings(required.pop(0), after)
+        elif alternatives:
+            merged = heapq.merge(*(self._iter_postings(ids, after) for ids in alternatives))
+            source = _distinct(merged)
+            alternatives = []
+        else:
+            source = self.iter_ids(after)
+
+        contains = self._contains
+        for doc_id in source:
+            if any(not contains(ids, doc_id) for ids in required):
+                continue
+            if alternatives and not any(contains(ids, doc_id) for ids in alternatives):
+                continue
+            if any(contains(ids, doc_id) for ids in excluded):
+                continue
+            yield doc_id
+
+    def get(self, doc_id: int) -> Mapping[str, Any]:
+        """
+        Returns the document stored under an id.
+
+        Args:
+            doc_id (int): Document id
+
+        Returns:
+            Mapping[str, Any]: The indexed document
+
+        Raises:
+            KeyError: If no live document has this id
+        """
+        return self._documents[doc_id]
+
+    def documents(self, doc_ids: Iterable[int]) -> List[Mapping[str, Any]]:
+        """
+        Resolves document ids to the indexed documents.
+
+        Args:
+            doc_ids (Iterable[int]): Document ids returned by the index
+
+        Returns:
+            List[Mapping[str, Any]]: The corresponding documents
+        """
+        return [self._documents[doc_id] for doc_id in doc_ids]
+
+    def snapshot_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Returns the state to store in an index snapshot.
+
+        Document ids are stored in collection order, so the snapshot can only
+        be restored against a collection whose documents are exactly the
+        indexed ones, in the same order.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], Dict[str, Any]]: Arrays and metadata
+            accepted by ``from_snapshot``
+        """
+        arrays = {"ids": np.fromiter(self._documents, np.int64, len(self._documents))}
+        meta: Dict[str, Any] = {"next_id": self._next_id}
+        for field, postings in (("categories", self._categories), ("tags", self._tags)):
+            names = list(postings)
+            lists = [postings[name] for name in names]
+            offsets = np.zeros(len(names) + 1, dtype=np.int64)
+            np.cumsum([len(ids) for ids in lists], out=offsets[1:])
+            arrays[f"{field}.offsets"] = offsets
+            arrays[f"{field}.ids"] = np.fromiter((doc_id for ids in lists for doc_id in ids), np.int64, offsets[-1])
+            meta[field] = names
+        return arrays, meta
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        arrays: Mapping[str, np.ndarray],
+        meta: Mapping[str, Any],
+        collection: Sequence[Mapping[str, Any]],
+    ) -> "DocumentIndex":
+        """
+        Restores an index over a collection from snapshot arrays.
+
+        Args:
+            arrays (Mapping[str, np.ndarray]): Arrays from ``snapshot_arrays``
+            meta (Mapping[str, Any]): Metadata from ``snapshot_arrays``
+            collection (Sequence[Mapping[str, Any]]): The collection the
+                snapshot was taken of
+
+        Returns:
+            DocumentIndex: The index
+        """
+        index = cls()
+        ids = arrays["ids"]
+        if isinstance(collection, list):
+            # Removing from a list shifts later positions, so lists, which
+            # are in memory anyway, are resolved up front.
+            index._documents = dict(zip(ids.tolist(), collection))
+            index._ids_by_object = {id(document): doc_id for doc_id, document in index._documents.items()}
+        else:
+            index._documents = _RowDocuments(collection, ids)
+        index._categories = _SnapshotPostings(meta["categories"], arrays["categories.offsets"], arrays["categories.ids"])
+        index._tags = _SnapshotPostings(meta["tags"], arrays["tags.offsets"], arrays["tags.ids"])
+        index._next_id = meta["next_id"]
+        return index
+
+
+class _RowDocuments(MutableMapping):
+    # Documents of an index over a collection that is not a list. The
+    # document at position i of the collection has id ids[i], or i when no
+    # ids are given, and is read from the collection on every access. Views
+    # are not kept, so removal recognises them by their row instead of by
+    # object identity. Documents added later are kept in a dict.
+
+    def __init__(self, collection: Sequence[Mapping[str, Any]], ids: Optional[np.ndarray] = None):
+        self._collection = collection
+        self._ids = ids
+        self._size = len(collection) if ids is None else len(ids)
+        self._removed: set = set()
+        self._added: Dict[int, Mapping[str, Any]] = {}
+
+    def _position(self, doc_id: int) -> int:
+        if self._ids is None:
+            position = doc_id if 0 <= doc_id < self._size else -1
+        else:
+            position = int(np.searchsorted(self._ids, doc_id))
+            if position == len(self._ids) or self._ids[position] != doc_id:
+                position = -1
+        return -1 if position in self._removed else position
+
+    def _id(self, position: int) -> int:
+        return position if self._ids is None else int(self._ids[position])
+
+    def id_of(self, document: Mapping[str, Any]) -> int:
+        """
+        Finds the id of an indexed row.
+
+        Args:
+            document (Mapping[str, Any]): A view of the row, or the object the
+                collection returns for it
+
+        Returns:
+            int: The row's id
+
+        Raises:
+            KeyError: If the document is not a live row of the collection
+        """
+        row = getattr(document, "row", None)
+        if row is not None:
+            if isinstance(row, int) and 0 <= row < self._size and row not in self._removed:
+                if self._collection[row] == document:
+                    return self._id(row)
+            raise KeyError("document is not in the index")
+        for position in range(self._size):
+            if position not in self._removed and self._collection[position] is document:
+                return self._id(position)
+        raise KeyError("document is not in the index")
+
+    def __getitem__(self, doc_id: int) -> Mapping[str, Any]:
+        document = self._added.get(doc_id)
+        if document is not None:
+            return document
+        position = self._position(doc_id)
+        if position < 0:
+            raise KeyError(doc_id)
+        return self._collection[position]
+
+    def __setitem__(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        self._added[doc_id] = document
+
+    def __delitem__(self, doc_id: int) -> None:
+        if doc_id in self._added:
+            del self._added[doc_id]
+            return
+        position = self._position(doc_id)
+        if position < 0:
+            raise KeyError(doc_id)
+        self._removed.add(position)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._added or (isinstance(doc_id, int) and self._position(doc_id) >= 0)
+
+    def _live(self) -> Iterator[Tuple[int, int]]:
+        removed = self._removed
+        ids = range(self._size) if self._ids is None else self._ids.tolist()
+        for position, doc_id in enumerate(ids):
+            if position not in removed:
+                yield position, doc_id
+
+    def __iter__(self) -> Iterator[int]:
+        for _, doc_id in self._live():
+            yield doc_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        return self._size - len(self._removed) + len(self._added)
+
+    def items(self) -> Iterator[Tuple[int, Mapping[str, Any]]]:
+        collection = self._collection
+        for position, doc_id in self._live():
+            yield doc_id, collection[position]
+        yield from self._added.items()
+
+    def values(self) -> Iterator[Mapping[str, Any]]:
+        return (document for _, document in self.items())
+
+
+class _SnapshotPostings(dict):
+    # Postings lists of one field of a snapshot-restored index. Keys start out
+    # mapped to their position in the snapshot arrays; the sorted id list is
+    # built on first lookup and replaces the position.
+
+    def __init__(self, names: Sequence[str], offsets: np.ndarray, ids: np.ndarray):
+        super().__init__(zip(names, range(len(names))))
+        self._offsets = offsets
+        self._ids = ids
+
+    def __getitem__(self, key: str) -> List[int]:
+        value = dict.__getitem__(self, key)
+        if type(value) is int:
+            value = self._ids[self._offsets[value]:self._offsets[value + 1]].tolist()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+
+def _distinct(ids: Iterator[int]) -> Iterator[int]:
+    # Drops repeats from a sorted stream of ids.
+    previous = None
+    for doc_id in ids:
+        if doc_id != previous:
+            yield doc_id
+            previous = doc_id
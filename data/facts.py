@@ -0,0 +1,248 @@
+"""
+Numeric Facts Module
+
+This module extracts machine-readable facts from document content (money
+amounts, percentages, durations and counts) into a typed columnar fact table.
+Every fact keeps a link to its document, category and character span, plus the
+label it was reported under (e.g. "Investment required" for "Investment
+required: $1.8M over 12 months"). Queries such as "all budgets over $1M in
+Finance" are evaluated as vectorized NumPy masks instead of free-text synthesis.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+FACT_KINDS = ("money", "percent", "duration", "count")
+
+_MONEY = re.compile(
+    r"(?<![\w.])\$(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)(?:\s?(K|M|B|thousand|million|billion))?\b",
+)
+_PERCENT = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)\s?%")
+_DURATION = re.compile(r"(?<![\w.$])(\d+(?:\.\d+)?)[- ](day|week|month|quarter|year)s?\b", re.IGNORECASE)
+_COUNT = re.compile(
+    r"(?<![\w.$,])(\d{1,3}(?:,\d{3})+|\d+)\+?\s"
+    r"(?!(?:day|week|month|quarter|year|hour|minute)s?\b)([A-Za-z][A-Za-z-]*s)\b"
+)
+_MONEY_SCALE = {"": 1.0, "K": 1e3, "thousand": 1e3, "M": 1e6, "million": 1e6, "B": 1e9, "billion": 1e9}
+# Durations are normalised to days.
+_DURATION_DAYS = {"day": 1.0, "week": 7.0, "month": 30.4375, "quarter": 91.3125, "year": 365.25}
+_CLAUSE_BREAK = re.compile(r"[.;]\s|\n\s*\n")
+
+
+def _label(content: str, clause_starts: List[int], position: int) -> str:
+    # The label is the "Label:" text closest before the fact in its sentence,
+    # or failing that the few words leading up to the fact.
+    sentence_start = clause_starts[bisect_right(clause_starts, position) - 1]
+    colon = content.rfind(":", sentence_start, position)
+    if colon < 0:
+        return " ".join(content[sentence_start:position].split()[-4:])
+    label_start = max(content.rfind(",", sentence_start, colon), content.rfind("(", sentence_start, colon)) + 1
+    return " ".join(content[max(label_start, sentence_start):colon].split())
+
+
+def extract_facts(content: str) -> List[Dict[str, Any]]:
+    """
+    Extracts numeric facts from text.
+
+    Args:
+        content (str): Document content
+
+    Returns:
+        List[Dict[str, Any]]: Facts with ``kind``, ``value`` (dollars, percent,
+        days or items), ``unit``, ``start``, ``end``, ``text`` and ``label``,
+        ordered by position
+    """
+    facts = []
+    taken = []
+    clause_starts = [0] + [match.end() for match in _CLAUSE_BREAK.finditer(content)]
+
+    def add(kind: str, value: float, unit: str, match: "re.Match[str]") -> None:
+        start, end = match.span()
+        if any(start < other_end and other_start < end for other_start, other_end in taken):
+            return
+        taken.append((start, end))
+        facts.append({
+            "kind": kind,
+            "value": value,
+            "unit": unit,
+            "start": start,
+            "end": end,
+            "text": match.group(0),
+            "label": _label(content, clause_starts, start),
+        })
+
+    for match in _MONEY.finditer(content):
+        amount = float(match.group(1).replace(",", ""))
+        add("money", amount * _MONEY_SCALE[match.group(2) or ""], "USD", match)
+    for match in _PERCENT.finditer(content):
+        add("percent", float(match.group(1)), "%", match)
+    for match in _DURATION.finditer(content):
+        add("duration", float(match.group(1)) * _DURATION_DAYS[match.group(2).lower()], "days", match)
+    for match in _COUNT.finditer(content):
+        add("count", float(match.group(1).replace(",", "")), match.group(2).lower(), match)
+    facts.sort(key=lambda fact: fact["start"])
+    return facts
+
+
+class FactTable:
+    """
+    Columnar table of extracted facts backed by NumPy arrays.
+
+    Columns: ``doc_ids``, ``kinds`` (index into ``FACT_KINDS``), ``values``,
+    ``starts``, ``ends``, ``categories`` (index into ``category_names``) and
+    ``labels`` (index into ``label_names``). Units and matched text are kept in
+    parallel Python lists since they are only needed when materialising rows.
+    """
+
+    def __init__(self):
+        self.category_names: List[str] = []
+        self.label_names: List[str] = []
+        self.doc_ids = np.zeros(0, dtype=np.int64)
+        self.kinds = np.zeros(0, dtype=np.int8)
+        self.values = np.zeros(0, dtype=np.float64)
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+        self.categories = np.zeros(0, dtype=np.int32)
+        self.labels = np.zeros(0, dtype=np.int32)
+        self.units: List[str] = []
+        self.texts: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Tuple[int, Mapping[str, Any]]]) -> "FactTable":
+        """
+        Extracts facts from (id, document) pairs into a table.
+
+        Args:
+            documents (Iterable[Tuple[int, Mapping[str, Any]]]): Documents with their ids
+
+        Returns:
+            FactTable: The populated table
+        """
+        table = cls()
+        category_lookup: Dict[str, int] = {}
+        label_lookup: Dict[str, int] = {}
+        columns: Dict[str, List[Any]] = {name: [] for name in ("doc_ids", "kinds", "values", "starts", "ends", "categories", "labels")}
+        kind_codes = {kind: code for code, kind in enumerate(FACT_KINDS)}
+        for doc_id, document in documents:
+            category = category_lookup.setdefault(document["category"], len(category_lookup))
+            for fact in extract_facts(document["content"]):
+                columns["doc_ids"].append(doc_id)
+                columns["kinds"].append(kind_codes[fact["kind"]])
+                columns["values"].append(fact["value"])
+                columns["starts"].append(fact["start"])
+                columns["ends"].append(fact["end"])
+                columns["categories"].append(category)
+                columns["labels"].append(label_lookup.setdefault(fact["label"], len(label_lookup)))
+                table.units.append(fact["unit"])
+                table.texts.append(fact["text"])
+        table.category_names = list(category_lookup)
+        table.label_names = list(label_lookup)
+        for name, values in columns.items():
+            setattr(table, name, np.asarray(values, dtype=getattr(table, name).dtype))
+        return table
+
+    def mask(
+        self,
+        kind: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        category: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Evaluates a filter over all facts at once.
+
+        Args:
+            kind (str): One of ``FACT_KINDS``
+            min_value (float): Inclusive lower bound on the normalised value
+            max_value (float): Inclusive upper bound on the normalised value
+            category (str): Document category
+            label (str): Case-insensitive substring of the fact label, e.g. "budget"
+
+        Returns:
+            np.ndarray: Boolean mask over the table rows
+
+        Raises:
+            ValueError: If ``kind`` is not one of ``FACT_KINDS``
+        """
+        if kind is not None and kind not in FACT_KINDS:
+            raise ValueError(f"Unknown fact kind {kind!r}; expected one of {', '.join(FACT_KINDS)}")
+        mask = np.ones(len(self), dtype=bool)
+        if kind is not None:
+            mask &= self.kinds == FACT_KINDS.index(kind)
+        if min_value is not None:
+            mask &= self.values >= min_value
+        if max_value is not None:
+            mask &= self.values <= max_value
+        if category is not None:
+            code = self.category_names.index(category) if category in self.category_names else -1
+            mask &= self.categories == code
+        if label is not None:
+            needle = label.lower()
+            matching = [code for code, name in enumerate(self.label_names) if needle in name.lower()]
+            mask &= np.isin(self.labels, matching)
+        return mask
+
+    def rows(self, mask: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """
+        Materialises the rows selected by a mask.
+
+        Args:
+            mask (np.ndarray): Boolean mask from ``mask``
+
+        Returns:
+            Iterator[Dict[str, Any]]: Facts with ``doc_id``, ``category`` and the
+            fields produced by ``extract_facts``
+        """
+        for row in np.flatnonzero(mask):
+            yield {
+                "doc_id": int(self.doc_ids[row]),
+                "category": self.category_names[self.categories[row]],
+                "kind": FACT_KINDS[self.kinds[row]],
+                "value": float(self.values[row]),
+                "unit": self.units[row],
+                "start": int(self.starts[row]),
+                "end": int(self.ends[row]),
+                "text": self.texts[row],
+                "label": self.label_names[self.labels[row]],
+            }
+
+    def aggregate(self, mask: np.ndarray, by: str = "category") -> Dict[str, Dict[str, float]]:
+        """
+        Computes count, sum, mean, min and max of the selected values per group.
+
+        Args:
+            mask (np.ndarray): Boolean mask from ``mask``
+            by (str): "category" or "label"
+
+        Returns:
+            Dict[str, Dict[str, float]]: Statistics keyed by group name
+        """
+        if by not in ("category", "label"):
+            raise ValueError(f"Cannot aggregate by {by!r}")
+        groups, names = (self.categories, self.category_names) if by == "category" else (self.labels, self.label_names)
+        groups, values = groups[mask], self.values[mask]
+        if not len(values):
+            return {}
+        counts = np.bincount(groups, minlength=len(names))
+        sums = np.bincount(groups, weights=values, minlength=len(names))
+        minimums = np.full(len(names), np.inf)
+        maximums = np.full(len(names), -np.inf)
+        np.minimum.at(minimums, groups, values)
+        np.maximum.at(maximums, groups, values)
+        return {
+            names[code]: {
+                "count": int(counts[code]),
+                "sum": float(sums[code]),
+                "mean": float(sums[code] / counts[code]),
+                "min": float(minimums[code]),
+                "max": float(maximums[code]),
+            }
+            for code in np.flatnonzero(counts)
+        }
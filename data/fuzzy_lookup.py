@@ -0,0 +1,233 @@
+"""
+Fuzzy Lookup Module
+
+This module provides typo-tolerant, case-insensitive lookup over small
+vocabularies such as the tag and category names of a collection. Values are
+normalized (case-folded, punctuation and spacing removed) and stored in a
+BK-tree keyed by Levenshtein distance, so a lookup with a small edit budget
+only visits the part of the tree within that distance instead of comparing
+against every value.
+
+The tree grows incrementally; values that disappear from the collection are
+hidden rather than removed, since BK-trees do not support deletion.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+def normalize_term(value: str) -> str:
+    """
+    Normalizes a tag or category for fuzzy comparison.
+
+    "Risk Management", "risk-management" and "RiskManagement" all normalize
+    to "riskmanagement"; "R&D" normalizes to "rd".
+
+    Args:
+        value (str): Original value
+
+    Returns:
+        str: Case-folded value without spaces or punctuation
+    """
+    normalized = _NON_ALPHANUMERIC.sub("", value.casefold())
+    return normalized or value.casefold().strip()
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Computes the edit distance between two strings.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+
+    Returns:
+        int: Minimum number of single-character insertions, deletions and substitutions
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over strings under Levenshtein distance.
+
+    Each node keeps its children keyed by their distance to it; by the
+    triangle inequality a search with tolerance ``k`` at a node at distance
+    ``d`` only needs to descend into children keyed ``d - k`` to ``d + k``.
+    """
+
+    def __init__(self):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, term: str) -> bool:
+        """
+        Inserts a term.
+
+        Args:
+            term (str): Term to insert
+
+        Returns:
+            bool: False if the term was already present
+        """
+        if self._root is None:
+            self._root = (term, {})
+            self._size += 1
+            return True
+        node = self._root
+        while True:
+            distance = levenshtein(term, node[0])
+            if distance == 0:
+                return False
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (term, {})
+                self._size += 1
+                return True
+            node = child
+
+    def search(self, term: str, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Finds all terms within an edit distance.
+
+        Args:
+            term (str): Query term
+            max_distance (int): Maximum Levenshtein distance
+
+        Returns:
+            List[Tuple[str, int]]: (term, distance) pairs, closest first
+        """
+        matches = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            value, children = stack.pop()
+            distance = levenshtein(term, value)
+            if distance <= max_distance:
+                matches.append((value, distance))
+            for edge in range(max(1, distance - max_distance), distance + max_distance + 1):
+                child = children.get(edge)
+                if child is not None:
+                    stack.append(child)
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def __iter__(self) -> Iterator[str]:
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            value, children = stack.pop()
+            yield value
+            stack.extend(children.values())
+
+
+def default_max_distance(term: str) -> int:
+    """
+    Returns the edit budget for a normalized term.
+
+    Args:
+        term (str): Normalized term
+
+    Returns:
+        int: 0 for terms of up to three characters, 1 up to eight and 2 beyond
+    """
+    if len(term) <= 3:
+        return 0
+    return 1 if len(term) <= 8 else 2
+
+
+class VocabularyIndex:
+    """
+    Typo-tolerant, case-insensitive lookup of the original spellings of values.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self._tree = BKTree()
+        self._originals: Dict[str, List[str]] = {}
+        for value in values:
+            self.add(value)
+
+    def __len__(self) -> int:
+        return sum(1 for spellings in self._originals.values() if spellings)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._originals.get(normalize_term(value), ())
+
+    def add(self, value: str) -> None:
+        """
+        Adds a value; adding a known value is a no-op.
+
+        Args:
+            value (str): Original spelling
+        """
+        key = normalize_term(value)
+        spellings = self._originals.setdefault(key, [])
+        if value not in spellings:
+            spellings.append(value)
+        self._tree.add(key)
+
+    def discard(self, value: str) -> None:
+        """
+        Hides a value that no longer occurs in the collection.
+
+        Args:
+            value (str): Original spelling
+        """
+        spellings = self._originals.get(normalize_term(value))
+        if spellings and value in spellings:
+            spellings.remove(value)
+
+    def search(self, value: str, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Finds values within an edit distance of a query, ignoring case,
+        spacing and punctuation.
+
+        Args:
+            value (str): Query, e.g. "cyber security"
+            max_distance (int): Maximum edit distance between normalized forms;
+                defaults to ``default_max_distance``
+
+        Returns:
+            List[Tuple[str, int]]: (original value, distance) pairs, closest first
+        """
+        key = normalize_term(value)
+        if max_distance is None:
+            max_distance = default_max_distance(key)
+        return [
+            (spelling, distance)
+            for term, distance in self._tree.search(key, max_distance)
+            for spelling in self._originals[term]
+        ]
+
+    def resolve(self, value: str, max_distance: Optional[int] = None) -> List[str]:
+        """
+        Returns the best-matching values for a query.
+
+        Args:
+            value (str): Query
+            max_distance (int): Maximum edit distance; see ``search``
+
+        Returns:
+            List[str]: Every value at the smallest distance found (several
+            if spellings tie), or an empty list if nothing is close enough
+        """
+        matches = self.search(value, max_distance)
+        if not matches:
+            return []
+        best = matches[0][1]
+        return [spelling for spelling, distance in matches if distance == best]
@@ -0,0 +1,188 @@
+"""
+Async HTTP Client Module
+
+This module provides a small asyncio HTTP/1.1 client with a bounded pool of
+keep-alive connections, used to talk to the ZeroEntropy API (or a local stand-in)
+without third-party dependencies. It supports exactly what the API needs: JSON
+POST requests, Content-Length and chunked responses, and TLS.
+"""
+
+import asyncio
+import json
+import ssl
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class HTTPError(Exception):
+    """Raised for transport failures and malformed responses."""
+
+
+class HTTPResponse:
+    """
+    A fully read HTTP response.
+    """
+
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        """
+        Decodes the body as JSON.
+
+        Returns:
+            Any: The decoded body, or None if it is empty
+        """
+        return json.loads(self.body) if self.body else None
+
+
+class _Connection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of keep-alive connections to a single origin.
+
+    At most ``size`` requests are in flight at once; idle connections are
+    reused most-recently-used first so that surplus sockets time out on the
+    server side instead of being kept warm.
+    """
+
+    def __init__(self, base_url: str, size: int = 32, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme in {base_url!r}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.timeout = timeout
+        self.size = size
+        self._host_header = parts.netloc
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def __aenter__(self) -> "ConnectionPool":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes all idle connections."""
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+        for connection in idle:
+            try:
+                await connection.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        return _Connection(reader, writer)
+
+    async def post_json(
+        self,
+        path: str,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HTTPResponse:
+        """
+        Sends a JSON POST request and reads the whole response.
+
+        Args:
+            path (str): Request path, appended to the base URL path
+            payload (Any): JSON-serialisable request body
+            headers (Dict[str, str]): Extra request headers
+
+        Returns:
+            HTTPResponse: The response
+
+        Raises:
+            HTTPError: On connection failures, timeouts or malformed responses
+        """
+        body = json.dumps(payload).encode("utf-8")
+        head = [
+            f"POST {self.prefix}{path} HTTP/1.1",
+            f"Host: {self._host_header}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+        ]
+        head.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        request = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(self._connect(), self.timeout)
+                try:
+                    response, keep_alive = await asyncio.wait_for(self._exchange(connection, request), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # The server may have closed an idle connection; retry once on a fresh one.
+                    connection.close()
+                    connection = await asyncio.wait_for(self._connect(), self.timeout)
+                    response, keep_alive = await asyncio.wait_for(self._exchange(connection, request), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+                if connection is not None:
+                    connection.close()
+                raise HTTPError(f"POST {path} failed: {error!r}") from error
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection.close()
+            return response
+
+    @staticmethod
+    async def _exchange(connection: _Connection, request: bytes) -> Tuple[HTTPResponse, bool]:
+        connection.writer.write(request)
+        await connection.writer.drain()
+        reader = connection.reader
+        status_line = await reader.readuntil(b"\r\n")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ValueError(f"malformed status line {status_line!r}")
+        status = int(parts[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close" and parts[0] != "HTTP/1.0"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readuntil(b"\r\n")
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return HTTPResponse(status, headers, body), keep_alive
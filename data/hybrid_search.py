@@ -0,0 +1,143 @@
+"""
+Hybrid Search Module
+
+This module combines keyword (BM25) and dense vector retrieval into a single
+hybrid query. Metadata filters are resolved first and pushed into both
+retrievers, the two retrievers run concurrently, and their rankings are merged
+with reciprocal-rank fusion or weighted score fusion. Every query reports how
+long each stage took so latency can be attributed as the corpus grows.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .document_index import DocumentIndex
+from .keyword_search import BM25Index
+from .vector_search import DenseVectorIndex
+
+Ranking = List[Tuple[int, float]]
+
+FUSION_METHODS = ("rrf", "weighted")
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hybrid-search")
+    return _EXECUTOR
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Ranking], k: int = 60) -> Ranking:
+    """
+    Merges rankings by summing 1 / (k + rank) for every list a document appears in.
+
+    Args:
+        rankings (Iterable[Ranking]): (document id, score) lists, best first
+        k (int): Rank smoothing constant
+
+    Returns:
+        Ranking: Fused (document id, score) pairs, best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (doc_id, _) in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+
+
+def weighted_score_fusion(rankings: Iterable[Ranking], weights: Iterable[float]) -> Ranking:
+    """
+    Merges rankings by a weighted sum of max-normalised scores.
+
+    Args:
+        rankings (Iterable[Ranking]): (document id, score) lists, best first
+        weights (Iterable[float]): One weight per ranking
+
+    Returns:
+        Ranking: Fused (document id, score) pairs, best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        if not ranking:
+            continue
+        top = max(score for _, score in ranking) or 1.0
+        for doc_id, score in ranking:
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight * score / top
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _timed(function: Callable[..., Ranking], *args: Any) -> Tuple[Ranking, float]:
+    start = time.perf_counter()
+    ranking = function(*args)
+    return ranking, (time.perf_counter() - start) * 1000
+
+
+def hybrid_search(
+    query: str,
+    document_index: DocumentIndex,
+    keyword_index: BM25Index,
+    vector_index: DenseVectorIndex,
+    k: int = 10,
+    category: Optional[str] = None,
+    all_tags: Iterable[str] = (),
+    any_tags: Iterable[str] = (),
+    none_tags: Iterable[str] = (),
+    fusion: str = "rrf",
+    keyword_weight: float = 0.5,
+    depth: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Runs keyword and vector retrieval concurrently and fuses the results.
+
+    Args:
+        query (str): Free-text query
+        document_index (DocumentIndex): Metadata index used for filtering
+        keyword_index (BM25Index): Keyword retriever
+        vector_index (DenseVectorIndex): Vector retriever
+        k (int): Number of fused results to return
+        category (str): Optional category filter
+        all_tags (Iterable[str]): Tags that must all be present (AND)
+        any_tags (Iterable[str]): Tags of which at least one must be present (OR)
+        none_tags (Iterable[str]): Tags that must not be present (NOT)
+        fusion (str): "rrf" for reciprocal-rank fusion or "weighted" for score fusion
+        keyword_weight (float): Keyword share of the score for weighted fusion
+        depth (int): Results fetched from each retriever before fusion
+
+    Returns:
+        Dict[str, Any]: ``results`` as fused (document id, score) pairs and
+        ``timings`` with per-stage and total latency in milliseconds
+    """
+    if fusion not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method {fusion!r}; expected one of {FUSION_METHODS}")
+    started = time.perf_counter()
+    depth = depth or max(4 * k, 20)
+
+    candidates: Optional[set] = None
+    all_tags, any_tags, none_tags = list(all_tags), list(any_tags), list(none_tags)
+    if category or all_tags or any_tags or none_tags:
+        candidates = set(document_index.search(category, all_tags, any_tags, none_tags))
+    filter_ms = (time.perf_counter() - started) * 1000
+
+    timings = {"filter": filter_ms, "keyword": 0.0, "vector": 0.0, "fusion": 0.0}
+    if candidates is not None and not candidates:
+        timings["total"] = (time.perf_counter() - started) * 1000
+        return {"results": [], "timings": timings}
+
+    executor = _executor()
+    keyword_future = executor.submit(_timed, keyword_index.search, query, depth, candidates)
+    vector_future = executor.submit(_timed, vector_index.search, query, depth, candidates)
+    keyword_ranking, timings["keyword"] = keyword_future.result()
+    vector_ranking, timings["vector"] = vector_future.result()
+
+    fusion_started = time.perf_counter()
+    rankings = (keyword_ranking, vector_ranking)
+    if fusion == "rrf":
+        fused = reciprocal_rank_fusion(rankings)
+    else:
+        fused = weighted_score_fusion(rankings, (keyword_weight, 1.0 - keyword_weight))
+    timings["fusion"] = (time.perf_counter() - fusion_started) * 1000
+    timings["total"] = (time.perf_counter() - started) * 1000
+    return {"results": fused[:k], "timings": timings}
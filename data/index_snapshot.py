@@ -0,0 +1,302 @@
+"""
+Index Snapshot Module
+
+This module defines an on-disk format for built indexes that is opened with
+``mmap`` instead of being deserialized. A snapshot is a set of named NumPy
+arrays plus a small JSON table:
+
+    header   magic (8 bytes), format version (u32), reserved (u32), table
+             position (u64), table length (u64), BLAKE2b digest of the table
+             (16 bytes)
+    arrays   little-endian array data, each section aligned to 64 bytes
+    table    JSON: corpus version, per-index metadata, and the name, dtype,
+             shape, position and BLAKE2b digest of every section
+
+Opening a snapshot reads the header and the table only, so it costs the same
+regardless of collection size. Arrays are zero-copy views of a private
+(copy-on-write) mapping: processes that open the same file share its pages
+until an index modifies an array, at which point only the touched pages are
+copied. Section digests are checked by ``verify``, which reads every page.
+
+The corpus version identifies the collection the indexes were built from;
+a snapshot whose version does not match the collection must not be used.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .mmap_corpus import MmapCorpus, encode_document
+
+MAGIC = b"ZESNAP\x00\x01"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ16s")
+_ALIGNMENT = 64
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a valid snapshot or fails validation."""
+
+
+def _digest(data: Any = b"") -> "hashlib.blake2b":
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(data)
+    return digest
+
+
+def corpus_version(documents: Sequence[Mapping[str, Any]]) -> str:
+    """
+    Identifies the contents of a collection.
+
+    Corpus files are identified by a digest of their header and offset table,
+    which covers the count and encoded length of every document and is read
+    without decoding any document. Other collections are identified by a
+    digest of every encoded document.
+
+    Args:
+        documents (Sequence[Mapping[str, Any]]): Collection
+
+    Returns:
+        str: Version string
+    """
+    if isinstance(documents, MmapCorpus):
+        digest = _digest(documents._mmap[:_HEADER.size])
+        digest.update(documents._offsets)
+        return f"mmap:{len(documents)}:{digest.hexdigest()}"
+    digest = _digest()
+    count = 0
+    for document in documents:
+        to_dict = getattr(document, "to_dict", None)
+        digest.update(encode_document(to_dict() if to_dict else dict(document)))
+        count += 1
+    return f"documents:{count}:{digest.hexdigest()}"
+
+
+def write_snapshot(
+    path: str,
+    version: str,
+    sections: Iterable[Tuple[str, np.ndarray]],
+    meta: Mapping[str, Any],
+) -> int:
+    """
+    Writes arrays and metadata to a snapshot file in one pass.
+
+    The file is written next to ``path`` under a name unique to this process
+    and moved into place once complete, so readers never see a partial
+    snapshot and concurrent writers do not interleave.
+
+    Args:
+        path (str): Destination file
+        version (str): Corpus version from ``corpus_version``
+        sections (Iterable[Tuple[str, np.ndarray]]): Named arrays
+        meta (Mapping[str, Any]): JSON-serialisable metadata
+
+    Returns:
+        int: Size of the snapshot in bytes
+    """
+    partial = f"{path}.{os.getpid()}.partial"
+    table: Dict[str, Any] = {"corpus_version": version, "meta": meta, "sections": []}
+    with open(partial, "wb") as handle:
+        handle.write(b"\x00" * _HEADER.size)
+        position = _HEADER.size
+        for name, array in sections:
+            array = np.ascontiguousarray(array)
+            array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+            padding = -position % _ALIGNMENT
+            handle.write(b"\x00" * padding)
+            position += padding
+            data = memoryview(array.reshape(-1)).cast("B")
+            handle.write(data)
+            table["sections"].append({
+                "name": name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "position": position,
+                "length": len(data),
+                "digest": _digest(data).hexdigest(),
+            })
+            position += len(data)
+        encoded = json.dumps(table, separators=(",", ":")).encode("utf-8")
+        handle.write(encoded)
+        handle.seek(0)
+        handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, position, len(encoded), _digest(encoded).digest()))
+        size = position + len(encoded)
+    os.replace(partial, path)
+    return size
+
+
+class IndexSnapshot:
+    """
+    Read-only view of a snapshot file.
+    """
+
+    def __init__(self, path: str, verify: bool = False):
+        """
+        Maps a snapshot and validates its header and table.
+
+        Args:
+            path (str): Snapshot file
+            verify (bool): Also check the digest of every section
+
+        Raises:
+            SnapshotError: If the file is not a valid version
+                ``FORMAT_VERSION`` snapshot or a digest does not match
+        """
+        self.path = path
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < _HEADER.size:
+                raise SnapshotError(f"{path} is too small to be a snapshot")
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, _, table_position, table_length, table_digest = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise SnapshotError(f"{path} is not a version {FORMAT_VERSION} snapshot")
+        if table_position + table_length > size:
+            raise SnapshotError(f"{path} is truncated")
+        encoded = self._mmap[table_position:table_position + table_length]
+        if _digest(encoded).digest() != table_digest:
+            raise SnapshotError(f"{path} has a corrupt section table")
+        table = json.loads(encoded)
+        self.corpus_version: str = table["corpus_version"]
+        self.meta: Dict[str, Any] = table["meta"]
+        self._sections: Dict[str, Dict[str, Any]] = {section["name"]: section for section in table["sections"]}
+        for section in self._sections.values():
+            if section["position"] + section["length"] > table_position:
+                raise SnapshotError(f"{path} has a section outside the data area")
+        if verify:
+            self.verify()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def verify(self) -> None:
+        """
+        Checks the digest of every section.
+
+        Raises:
+            SnapshotError: If a section does not match its digest
+        """
+        for name, section in self._sections.items():
+            data = memoryview(self._mmap)[section["position"]:section["position"] + section["length"]]
+            try:
+                if _digest(data).hexdigest() != section["digest"]:
+                    raise SnapshotError(f"{self.path}: section {name!r} is corrupt")
+            finally:
+                data.release()
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Returns a section as an array backed by the mapping.
+
+        Args:
+            name (str): Section name
+
+        Returns:
+            np.ndarray: Writable copy-on-write view; writes stay private to
+            this process
+
+        Raises:
+            KeyError: If there is no such section
+        """
+        section = self._sections[name]
+        dtype = np.dtype(section["dtype"])
+        count = section["length"] // dtype.itemsize
+        array = np.frombuffer(self._mmap, dtype, count, section["position"]).reshape(section["shape"])
+        return array if dtype.isnative else array.astype(dtype.newbyteorder("="))
+
+    def arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """
+        Returns every section under a prefix.
+
+        Args:
+            prefix (str): Index name, e.g. "keyword"
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays keyed by their name without the prefix
+        """
+        start = prefix + "/"
+        return {name[len(start):]: self.array(name) for name in self._sections if name.startswith(start)}
+
+
+def prefixed(prefix: str, arrays: Mapping[str, np.ndarray]) -> List[Tuple[str, np.ndarray]]:
+    """
+    Names arrays for ``write_snapshot`` under an index prefix.
+
+    Args:
+        prefix (str): Index name
+        arrays (Mapping[str, np.ndarray]): Arrays keyed by name
+
+    Returns:
+        List[Tuple[str, np.ndarray]]: (prefix/name, array) pairs
+    """
+    return [(f"{prefix}/{name}", array) for name, array in arrays.items()]
+
+
+class StringTable(Sequence):
+    """
+    Sequence of strings stored as one UTF-8 buffer and an offset array, so a
+    large vocabulary can live in a snapshot without being decoded up front.
+    Sorted tables support lookups by binary search.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[str]) -> "StringTable":
+        """
+        Encodes strings into a table.
+
+        Args:
+            strings (Sequence[str]): Strings in table order
+
+        Returns:
+            StringTable: The table
+        """
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the arrays to store in a snapshot.
+
+        Returns:
+            Dict[str, np.ndarray]: ``data`` and ``offsets``
+        """
+        return {"data": self._data, "offsets": self._offsets}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        return self._data[self._offsets[position]:self._offsets[position + 1]].tobytes().decode("utf-8")
+
+    def position(self, value: str) -> int:
+        """
+        Finds a string in a sorted table.
+
+        Args:
+            value (str): String to look up
+
+        Returns:
+            int: Its position, or -1 if it is not in the table
+        """
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self[middle] < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < len(self) and self[low] == value else -1
@@ -0,0 +1,425 @@
+"""
+Bulk Ingestion Module
+
+This module uploads a document collection to ZeroEntropy concurrently. It
+replaces the one-document-at-a-time loop in ``ZeroEntropyClient.loadDocuments``
+with:
+
+- a bounded pool of keep-alive connections shared by all uploads
+- documents read from the corpus in batches through a bounded queue, so a
+  slow API applies backpressure all the way to the reader
+- an AIMD concurrency limit that halves on 429/5xx responses (honouring
+  Retry-After) and grows back additively on success
+- retries with capped exponential backoff and full jitter
+- throughput and latency reporting, and status polling with backoff
+
+The API has no bulk endpoint, so batching happens on the client side: each
+worker takes a batch of documents off the queue and uploads all of them
+concurrently through ``/documents/add-document`` within the shared
+concurrency limit. Enough workers run that a batch held up by a retrying
+document does not leave the limit idle.
+
+Usage:
+    python -m data.ingest [--corpus FILE] [--base-url URL] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .http_client import ConnectionPool, HTTPError
+from .near_duplicates import distinct_documents
+
+DEFAULT_BASE_URL = "https://api.zeroentropy.dev/v1"
+DEFAULT_COLLECTION = "synthesis_comparison_demo"
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit with additive increase and multiplicative decrease.
+
+    Each success raises the limit by ``1 / limit`` (about one slot per round
+    trip of the whole window); each throttle halves it and can pause all new
+    requests until a Retry-After deadline.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Grows the limit after a successful request."""
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Shrinks the limit after a 429 or 5xx response.
+
+        Args:
+            retry_after (float): Optional server-requested pause in seconds
+        """
+        self.limit = max(self.minimum, self.limit / 2)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+class IngestionStats:
+    """
+    Counters and per-request latencies for one ingestion run.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.submitted = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttled = 0
+        self.latencies: List[float] = []
+        self.errors: List[str] = []
+        self.failed_paths: List[str] = []
+
+    def summary(self, limiter: Optional[AdaptiveLimiter] = None) -> Dict[str, Any]:
+        """
+        Summarises the run.
+
+        Args:
+            limiter (AdaptiveLimiter): Optional limiter to report the final limit of
+
+        Returns:
+            Dict[str, Any]: Counts, elapsed time, throughput, latency percentiles
+            and the paths that could not be uploaded
+        """
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        summary = {
+            "documents": self.submitted,
+            "uploaded": self.uploaded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "elapsed_s": elapsed,
+            "documents_per_s": self.uploaded / elapsed if elapsed else 0.0,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p95_ms": percentile(0.95),
+            "latency_p99_ms": percentile(0.99),
+            "errors": self.errors[:10],
+            "failed_paths": list(self.failed_paths),
+        }
+        if limiter is not None:
+            summary["final_concurrency"] = int(limiter.limit)
+        return summary
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class ZeroEntropyIngestor:
+    """
+    Concurrent uploader for the ZeroEntropy documents API.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        api_key: Optional[str] = None,
+        collection_name: str = DEFAULT_COLLECTION,
+        concurrency: int = 32,
+        batch_size: int = 100,
+        max_retries: int = 5,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 10.0,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url
+        self.collection_name = collection_name
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self._headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._pool: Optional[ConnectionPool] = None
+        self.limiter: Optional[AdaptiveLimiter] = None
+
+    async def __aenter__(self) -> "ZeroEntropyIngestor":
+        self._pool = ConnectionPool(self.base_url, size=self.concurrency, timeout=self.timeout)
+        # One limiter for every request of the session, so throttling seen by
+        # any call slows down all of them.
+        self.limiter = AdaptiveLimiter(initial=max(1, self.concurrency // 4), maximum=self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._pool.close()
+        self._pool = None
+        self.limiter = None
+
+    async def request(self, endpoint: str, payload: Dict[str, Any]) -> Tuple[int, Any, Mapping[str, str]]:
+        """
+        Sends one API request without retries.
+
+        Args:
+            endpoint (str): API endpoint, e.g. "/status/get-status"
+            payload (Dict[str, Any]): JSON body
+
+        Returns:
+            Tuple[int, Any, Mapping[str, str]]: Status code, decoded body and headers
+        """
+        response = await self._pool.post_json(endpoint, payload, self._headers)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.body.decode("utf-8", "replace")
+        return response.status, body, response.headers
+
+    async def request_with_retries(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        stats: Optional[IngestionStats] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Sends one API request under the concurrency limit, retrying 429, 5xx
+        and transport errors with capped exponential backoff.
+
+        Args:
+            endpoint (str): API endpoint
+            payload (Dict[str, Any]): JSON body
+            stats (IngestionStats): Optional run to count retries, throttles
+                and latencies in
+
+        Returns:
+            Tuple[int, Any]: Status code and body of the last attempt; status
+            0 means the last attempt failed in transport
+        """
+        limiter = self.limiter
+        for attempt in range(self.max_retries + 1):
+            async with limiter:
+                started = time.perf_counter()
+                try:
+                    status, body, headers = await self.request(endpoint, payload)
+                except HTTPError as error:
+                    status, body, headers = 0, str(error), {}
+                if stats is not None:
+                    stats.latencies.append(time.perf_counter() - started)
+            if status != 429 and 0 < status < 500:
+                if status < 300:
+                    limiter.on_success()
+                return status, body
+            if stats is not None:
+                stats.throttled += status != 0
+            retry_after = _retry_after(headers)
+            limiter.on_throttle(retry_after)
+            if attempt < self.max_retries:
+                if stats is not None:
+                    stats.retries += 1
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+                await asyncio.sleep(max(delay, retry_after or 0.0))
+        return status, body
+
+    async def create_collection(self) -> None:
+        """
+        Creates the target collection, ignoring 409 Conflict if it already exists.
+
+        Raises:
+            HTTPError: If the API still rejects the request after retries
+        """
+        status, body = await self.request_with_retries(
+            "/collections/add-collection", {"collection_name": self.collection_name}
+        )
+        if not 200 <= status < 300 and status != 409:
+            raise HTTPError(f"API Error {status}: {body}")
+
+    async def delete_document(self, path: str, stats: Optional[IngestionStats] = None) -> bool:
+        """
+        Deletes one document with retries, treating 404 as already deleted.
+
+        Args:
+            path (str): Document path
+            stats (IngestionStats): Optional run to count retries in
+
+        Returns:
+            bool: True if the document is gone
+        """
+        status, _ = await self.request_with_retries(
+            "/documents/delete-document", {"collection_name": self.collection_name, "path": path}, stats
+        )
+        return 200 <= status < 300 or status == 404
+
+    def _add_payload(self, path: str, document: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            "collection_name": self.collection_name,
+            "path": path,
+            "content": {"type": "text", "text": document["content"]},
+            "metadata": {"category": document["category"], "name": document["title"]},
+            "overwrite": True,
+        }
+
+    async def _upload(self, path: str, document: Mapping[str, Any], stats: IngestionStats) -> bool:
+        status, body = await self.request_with_retries("/documents/add-document", self._add_payload(path, document), stats)
+        if 200 <= status < 300:
+            stats.uploaded += 1
+            return True
+        stats.failed += 1
+        stats.failed_paths.append(path)
+        if status == 429 or status >= 500 or status == 0:
+            stats.errors.append(f"{path}: gave up after {self.max_retries + 1} attempts (last status {status})")
+        else:
+            stats.errors.append(f"{path}: API Error {status}: {body}")
+        return False
+
+    async def ingest(self, documents: Iterable[Tuple[str, Mapping[str, Any]]]) -> Dict[str, Any]:
+        """
+        Uploads (path, document) pairs concurrently.
+
+        Args:
+            documents (Iterable[Tuple[str, Mapping[str, Any]]]): Documents with
+                their paths, e.g. from ``sample_documents.iter_document_paths``
+
+        Returns:
+            Dict[str, Any]: Summary from ``IngestionStats.summary``
+        """
+        stats = IngestionStats()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        documents = iter(documents)
+        # Each worker uploads a whole batch at once; with at least two workers
+        # and twice the limit in flight, a straggling batch never idles it.
+        workers = max(2, -(-2 * self.concurrency // self.batch_size))
+
+        async def produce() -> None:
+            while True:
+                batch = list(islice(documents, self.batch_size))
+                if not batch:
+                    break
+                stats.submitted += len(batch)
+                await queue.put(batch)
+            for _ in range(workers):
+                await queue.put(None)
+
+        async def consume() -> None:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                await asyncio.gather(*(self._upload(path, document, stats) for path, document in batch))
+
+        await asyncio.gather(produce(), *(consume() for _ in range(workers)))
+        stats.finished = time.perf_counter()
+        return stats.summary(self.limiter)
+
+    async def wait_for_indexing(self, timeout: float = 300.0, interval: float = 0.5) -> Dict[str, Any]:
+        """
+        Polls collection status until every document is indexed or failed.
+
+        The poll interval doubles from ``interval`` up to 10 seconds. Each poll
+        is retried like an upload.
+
+        Args:
+            timeout (float): Maximum seconds to wait
+            interval (float): Initial poll interval in seconds
+
+        Returns:
+            Dict[str, Any]: The last status response
+        """
+        deadline = time.monotonic() + timeout
+        status: Dict[str, Any] = {}
+        while True:
+            code, body = await self.request_with_retries("/status/get-status", {"collection_name": self.collection_name})
+            # A poll that still fails after retries, or returns something other
+            # than a status object, is skipped rather than ending the run.
+            if 200 <= code < 300 and isinstance(body, dict):
+                status = body
+                done = status.get("num_indexed_documents", 0) + status.get("num_failed_documents", 0)
+                if done >= status.get("num_documents", 0):
+                    return status
+            if time.monotonic() + interval > deadline:
+                return status
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 10.0)
+
+
+def api_key_from_env() -> Optional[str]:
+    """
+    Returns the ZeroEntropy API key from the environment.
+
+    Returns:
+        Optional[str]: ZEROENTROPY_API_KEY, falling back to NEXT_PUBLIC_ZEROENTROPY_API_KEY
+    """
+    return os.environ.get("ZEROENTROPY_API_KEY") or os.environ.get("NEXT_PUBLIC_ZEROENTROPY_API_KEY")
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    from . import sample_documents
+
+    if args.corpus:
+        sample_documents.load_corpus_file(args.corpus)
+    documents: Iterator[Tuple[str, Mapping[str, Any]]] = sample_documents.iter_document_paths()
+    if args.collapse_duplicates:
+        documents = distinct_documents(documents)
+    if args.limit:
+        documents = islice(documents, args.limit)
+    async with ZeroEntropyIngestor(
+        args.base_url, api_key_from_env(), args.collection, args.concurrency, args.batch_size, args.max_retries
+    ) as ingestor:
+        await ingestor.create_collection()
+        summary = await ingestor.ingest(documents)
+        if not args.no_wait:
+            summary["status"] = await ingestor.wait_for_indexing(args.wait_timeout)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upload the document collection to ZeroEntropy.")
+    parser.add_argument("--corpus", help="corpus file (defaults to the active collection)")
+    parser.add_argument("--base-url", default=os.environ.get("ZEROENTROPY_BASE_URL", DEFAULT_BASE_URL))
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--limit", type=int, help="upload at most this many documents")
+    parser.add_argument(
+        "--collapse-duplicates", action="store_true", help="skip near-duplicates of earlier documents"
+    )
+    parser.add_argument("--no-wait", action="store_true", help="do not wait for indexing to finish")
+    parser.add_argument("--wait-timeout", type=float, default=300.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
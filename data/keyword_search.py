@@ -0,0 +1,384 @@
+"""
+Keyword Search Module
+
+This module implements an in-process BM25 keyword search engine over the
+``title`` and ``content`` fields of documents. It serves as a local stand-in
+for the keyword half of ZeroEntropy's hybrid retrieval, answering queries
+offline without a round-trip to the remote API.
+
+An index restored from a snapshot keeps its postings in flat arrays that are
+shared with the snapshot file; documents added afterwards go into ordinary
+postings dicts on top, and queries score both with NumPy.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Container, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .index_snapshot import StringTable
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our that
+    the their this to was were will with
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase alphanumeric tokens, dropping stopwords.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        List[str]: Tokens in order of appearance
+    """
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class _FrozenPostings:
+    # Postings restored from a snapshot, in compressed sparse row form: the
+    # postings of the term at position i of the sorted vocabulary are
+    # ids[offsets[i]:offsets[i + 1]]. Removals clear a document's live flag
+    # and are subtracted from document frequencies until the next snapshot.
+
+    def __init__(self, arrays: Mapping[str, np.ndarray], count: int):
+        self.terms = StringTable(arrays["terms.data"], arrays["terms.offsets"])
+        self.offsets = arrays["offsets"]
+        self.ids = arrays["ids"]
+        self.frequencies = arrays["frequencies"]
+        self.lengths = arrays["lengths"]
+        self.live = arrays["live"]
+        self.count = count
+        self.removed: Counter = Counter()
+
+    def __contains__(self, doc_id: int) -> bool:
+        return 0 <= doc_id < len(self.live) and bool(self.live[doc_id])
+
+    def document_frequency(self, term: str) -> int:
+        position = self.terms.position(term)
+        if position < 0:
+            return 0
+        return int(self.offsets[position + 1] - self.offsets[position]) - self.removed[term]
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        position = self.terms.position(term)
+        if position < 0:
+            return self.ids[:0], self.frequencies[:0]
+        postings = slice(self.offsets[position], self.offsets[position + 1])
+        ids, frequencies = self.ids[postings], self.frequencies[postings]
+        if self.removed[term]:
+            live = self.live[ids]
+            ids, frequencies = ids[live], frequencies[live]
+        return ids, frequencies
+
+    def remove(self, doc_id: int, terms: Iterable[str]) -> int:
+        self.live[doc_id] = False
+        self.count -= 1
+        for term in terms:
+            self.removed[term] += 1
+        return int(self.lengths[doc_id])
+
+
+class BM25Index:
+    """
+    BM25 index with per-term postings lists mapping document ids to term frequencies.
+
+    Title tokens are counted ``title_weight`` times, which gives title matches
+    a proportional boost without maintaining a second set of field statistics.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        # Collection-wide (document count, total length, document frequencies)
+        # used instead of local statistics when this index holds one shard.
+        self._global_statistics: Optional[Tuple[int, int, Mapping[str, int]]] = None
+        self._base: Optional[_FrozenPostings] = None
+
+    def __len__(self) -> int:
+        return len(self._lengths) + (self._base.count if self._base is not None else 0)
+
+    def _term_frequencies(self, document: Mapping[str, Any]) -> Counter:
+        frequencies = Counter(tokenize(document["content"]))
+        for token in tokenize(document["title"]):
+            frequencies[token] += self.title_weight
+        return frequencies
+
+    def add(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        """
+        Indexes a document under the given id.
+
+        Args:
+            doc_id (int): Caller-assigned document id
+            document (Mapping[str, Any]): Document with ``title`` and ``content`` fields
+        """
+        frequencies = self._term_frequencies(document)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        """
+        Removes a document from the index.
+
+        Args:
+            doc_id (int): Id the document was added under
+            document (Mapping[str, Any]): The document as it was added
+        """
+        if doc_id not in self._lengths and self._base is not None and doc_id in self._base:
+            self._total_length -= self._base.remove(doc_id, self._term_frequencies(document))
+            return
+        for term in self._term_frequencies(document):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def idf(self, term: str) -> float:
+        """
+        Returns the BM25 inverse document frequency of a term.
+
+        Args:
+            term (str): Token as produced by ``tokenize``
+
+        Returns:
+            float: Non-negative IDF weight (0.0 for unknown terms)
+        """
+        if self._global_statistics is not None:
+            count, _, frequencies = self._global_statistics
+            document_frequency = frequencies.get(term, 0)
+        else:
+            count, document_frequency = len(self), len(self._postings.get(term, ()))
+            if self._base is not None:
+                document_frequency += self._base.document_frequency(term)
+        if not document_frequency:
+            return 0.0
+        return math.log(1 + (count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def statistics(self) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Returns the local statistics that BM25 scores depend on.
+
+        Returns:
+            Tuple[int, int, Dict[str, int]]: Document count, total document
+            length and document frequency per term
+        """
+        frequencies = {term: len(postings) for term, postings in self._postings.items()}
+        if self._base is not None:
+            removed = self._base.removed
+            for term, frequency in zip(self._base.terms, np.diff(self._base.offsets).tolist()):
+                frequency -= removed[term]
+                if frequency:
+                    frequencies[term] = frequencies.get(term, 0) + frequency
+        return len(self), self._total_length, frequencies
+
+    def use_global_statistics(self, count: int, total_length: int, frequencies: Mapping[str, int]) -> None:
+        """
+        Scores with statistics summed over all shards of a collection.
+
+        With the same statistics in every shard, scores are comparable across
+        shards and merged results match those of a single unsharded index.
+
+        Args:
+            count (int): Total number of documents
+            total_length (int): Total length of all documents
+            frequencies (Mapping[str, int]): Document frequency per term
+        """
+        self._global_statistics = (count, total_length, frequencies)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        candidates: Optional[Container[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Scores documents against a query and returns the k best.
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of results to return
+            candidates (Container[int]): Optional set of ids to restrict scoring to
+
+        Returns:
+            List[Tuple[int, float]]: (document id, score) pairs, best first
+        """
+        if not len(self) or k <= 0:
+            return []
+        if self._global_statistics is not None:
+            count, total_length, _ = self._global_statistics
+            average_length = total_length / count
+        else:
+            average_length = self._total_length / len(self)
+        if self._base is not None:
+            return self._search_arrays(query, k, candidates, average_length)
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for term, query_frequency in Counter(tokenize(query)).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            weight = self.idf(term) * query_frequency
+            for doc_id, frequency in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = k1 * (1 - b + b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * frequency * (k1 + 1) / (frequency + norm)
+        # Ties are broken by lower id so results are deterministic.
+        best = heapq.nsmallest(k, ((-score, doc_id) for doc_id, score in scores.items()))
+        return [(doc_id, -negative) for negative, doc_id in best]
+
+    def _term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Ids, term frequencies and document lengths of every posting of a
+        # term, snapshot postings first.
+        ids, frequencies = self._base.postings(term)
+        lengths = self._base.lengths[ids]
+        added = self._postings.get(term)
+        if added:
+            ids = np.concatenate((ids, np.fromiter(added, np.int64, len(added))))
+            frequencies = np.concatenate((frequencies, np.fromiter(added.values(), np.int64, len(added))))
+            lengths = np.concatenate((lengths, np.fromiter(map(self._lengths.__getitem__, added), np.int64, len(added))))
+        return ids, frequencies, lengths
+
+    def _search_arrays(
+        self,
+        query: str,
+        k: int,
+        candidates: Optional[Container[int]],
+        average_length: float,
+    ) -> List[Tuple[int, float]]:
+        # Same scores and order as the dict path in search: terms are added in
+        # query order with the same floating-point operations per posting.
+        k1, b = self.k1, self.b
+        matched, contributions = [], []
+        for term, query_frequency in Counter(tokenize(query)).items():
+            ids, frequencies, lengths = self._term_postings(term)
+            if candidates is not None:
+                keep = np.fromiter((doc_id in candidates for doc_id in ids.tolist()), bool, len(ids))
+                ids, frequencies, lengths = ids[keep], frequencies[keep], lengths[keep]
+            if not len(ids):
+                continue
+            weight = self.idf(term) * query_frequency
+            norm = k1 * (1 - b + b * lengths / average_length)
+            matched.append(ids)
+            contributions.append(weight * frequencies * (k1 + 1) / (frequencies + norm))
+        if not matched:
+            return []
+        doc_ids, positions = np.unique(np.concatenate(matched), return_inverse=True)
+        scores = np.zeros(len(doc_ids))
+        np.add.at(scores, positions, np.concatenate(contributions))
+        if len(scores) > k:
+            # Keep everything tied with the k-th best score, then order by
+            # score and id.
+            threshold = np.partition(-scores, k - 1)[k - 1]
+            best = np.flatnonzero(-scores <= threshold)
+            doc_ids, scores = doc_ids[best], scores[best]
+        order = np.lexsort((doc_ids, -scores))[:k]
+        return list(zip(doc_ids[order].tolist(), scores[order].tolist()))
+
+    def snapshot_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Returns the postings in compressed sparse row form for an index snapshot.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], Dict[str, Any]]: Arrays and metadata
+            accepted by ``from_snapshot``
+        """
+        terms = set(self._postings)
+        if self._base is not None:
+            terms.update(self._base.terms)
+        terms = sorted(terms)
+        ids, frequencies = [], []
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        for position, term in enumerate(terms):
+            if self._base is None:
+                postings = self._postings[term]
+                term_ids = np.fromiter(postings, np.int64, len(postings))
+                term_frequencies = np.fromiter(postings.values(), np.int64, len(postings))
+            else:
+                term_ids, term_frequencies, _ = self._term_postings(term)
+            order = np.argsort(term_ids, kind="stable")
+            ids.append(term_ids[order])
+            frequencies.append(term_frequencies[order])
+            offsets[position + 1] = offsets[position] + len(order)
+
+        size = max(self._lengths, default=-1) + 1
+        if self._base is not None:
+            size = max(size, len(self._base.live))
+        lengths = np.zeros(size, dtype=np.int64)
+        live = np.zeros(size, dtype=bool)
+        if self._base is not None:
+            base = np.flatnonzero(self._base.live)
+            lengths[base] = self._base.lengths[base]
+            live[base] = True
+        added = np.fromiter(self._lengths, np.int64, len(self._lengths))
+        lengths[added] = np.fromiter(self._lengths.values(), np.int64, len(self._lengths))
+        live[added] = True
+
+        vocabulary = StringTable.from_strings(terms).arrays()
+        arrays = {
+            "terms.data": vocabulary["data"],
+            "terms.offsets": vocabulary["offsets"],
+            "offsets": offsets,
+            "ids": np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64),
+            "frequencies": np.concatenate(frequencies) if frequencies else np.zeros(0, dtype=np.int64),
+            "lengths": lengths,
+            "live": live,
+        }
+        meta = {
+            "k1": self.k1,
+            "b": self.b,
+            "title_weight": self.title_weight,
+            "count": len(self),
+            "total_length": self._total_length,
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_snapshot(cls, arrays: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> "BM25Index":
+        """
+        Restores an index from snapshot arrays without copying them.
+
+        Args:
+            arrays (Mapping[str, np.ndarray]): Arrays from ``snapshot_arrays``
+            meta (Mapping[str, Any]): Metadata from ``snapshot_arrays``
+
+        Returns:
+            BM25Index: The index; documents added later are kept in postings
+            dicts on top of the snapshot arrays
+        """
+        index = cls(meta["k1"], meta["b"], meta["title_weight"])
+        index._base = _FrozenPostings(arrays, meta["count"])
+        index._total_length = meta["total_length"]
+        return index
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Tuple[int, Mapping[str, Any]]], **kwargs: Any) -> "BM25Index":
+        """
+        Builds an index from (id, document) pairs.
+
+        Args:
+            documents (Iterable[Tuple[int, Mapping[str, Any]]]): Documents with their ids
+            **kwargs: BM25 parameters passed to the constructor
+
+        Returns:
+            BM25Index: The populated index
+        """
+        index = cls(**kwargs)
+        for doc_id, document in documents:
+            index.add(doc_id, document)
+        return index
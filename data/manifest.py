@@ -0,0 +1,273 @@
+"""
+Ingestion Manifest Module
+
+This module keeps a persistent manifest of what has been uploaded to a
+ZeroEntropy collection: a map from each document path to a hash of the fields
+that are uploaded. Syncing diffs the active collection against the manifest and
+only uploads added or changed documents and deletes removed ones, instead of
+re-sending everything with ``overwrite: true``.
+
+The manifest is only advanced for uploads and deletions the API accepted
+(after retries), so a partially failed sync is retried on the next run.
+
+Usage:
+    python -m data.manifest MANIFEST [--corpus FILE] [--dry-run] [--base-url URL]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .ingest import DEFAULT_BASE_URL, DEFAULT_COLLECTION, IngestionStats, ZeroEntropyIngestor, api_key_from_env
+
+MANIFEST_VERSION = 1
+
+
+def document_hash(document: Mapping[str, Any]) -> str:
+    """
+    Hashes the fields of a document that end up in the collection.
+
+    Only the uploaded fields (see ZeroEntropyIngestor._add_payload) are
+    covered, so edits to fields the API never receives, such as tags, do not
+    cause a re-upload.
+
+    Args:
+        document (Mapping[str, Any]): Document with title, content and category
+
+    Returns:
+        str: Hex digest that changes whenever uploaded content or metadata change
+    """
+    canonical = json.dumps(
+        [document["title"], document["category"], document["content"]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def build_manifest(documents: Iterable[Tuple[str, Mapping[str, Any]]]) -> Dict[str, str]:
+    """
+    Hashes every document of a collection.
+
+    Args:
+        documents (Iterable[Tuple[str, Mapping[str, Any]]]): (path, document) pairs
+
+    Returns:
+        Dict[str, str]: Hash keyed by path
+    """
+    return {path: document_hash(document) for path, document in documents}
+
+
+class ManifestDiff:
+    """
+    Paths that differ between a stored manifest and the current collection.
+    """
+
+    __slots__ = ("added", "changed", "removed", "unchanged")
+
+    def __init__(self, added: List[str], changed: List[str], removed: List[str], unchanged: int):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Returns the number of paths in each state."""
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
+
+
+def diff_manifests(previous: Mapping[str, str], current: Mapping[str, str]) -> ManifestDiff:
+    """
+    Compares two manifests.
+
+    Args:
+        previous (Mapping[str, str]): Manifest of what was last uploaded
+        current (Mapping[str, str]): Manifest of the active collection
+
+    Returns:
+        ManifestDiff: Added, changed and removed paths, each in sorted order
+    """
+    added, changed = [], []
+    for path, digest in current.items():
+        before = previous.get(path)
+        if before is None:
+            added.append(path)
+        elif before != digest:
+            changed.append(path)
+    removed = [path for path in previous if path not in current]
+    unchanged = len(current) - len(added) - len(changed)
+    return ManifestDiff(sorted(added), sorted(changed), sorted(removed), unchanged)
+
+
+def load_manifest(path: str, collection_name: str) -> Dict[str, str]:
+    """
+    Reads a manifest file.
+
+    A missing file, or one recorded for a different collection, yields an
+    empty manifest so that everything is uploaded.
+
+    Args:
+        path (str): Manifest file
+        collection_name (str): Collection the manifest must belong to
+
+    Returns:
+        Dict[str, str]: Hash keyed by path
+
+    Raises:
+        ValueError: If the file is not a manifest of a supported version
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"{path} is not a version {MANIFEST_VERSION} manifest")
+    if data.get("collection") != collection_name:
+        return {}
+    return data["documents"]
+
+
+def save_manifest(path: str, collection_name: str, documents: Mapping[str, str]) -> None:
+    """
+    Writes a manifest file atomically.
+
+    Args:
+        path (str): Manifest file
+        collection_name (str): Collection the manifest describes
+        documents (Mapping[str, str]): Hash keyed by path
+    """
+    partial = path + ".partial"
+    with open(partial, "w", encoding="utf-8") as handle:
+        json.dump(
+            {"version": MANIFEST_VERSION, "collection": collection_name, "documents": dict(sorted(documents.items()))},
+            handle,
+            separators=(",", ":"),
+        )
+    os.replace(partial, path)
+
+
+async def sync(
+    ingestor: ZeroEntropyIngestor,
+    manifest_path: str,
+    documents: Optional[Iterable[Tuple[str, Mapping[str, Any]]]] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Brings a collection in line with the active documents.
+
+    Args:
+        ingestor (ZeroEntropyIngestor): Open ingestor for the target collection
+        manifest_path (str): Manifest file, created if missing
+        documents (Iterable[Tuple[str, Mapping[str, Any]]]): (path, document)
+            pairs, read once; defaults to ``sample_documents.iter_document_paths()``
+        dry_run (bool): Only report the diff
+
+    Returns:
+        Dict[str, Any]: Diff counts, hashing and diff time in milliseconds, and
+        the upload summary and deletion counts unless ``dry_run`` is set
+    """
+    from . import sample_documents
+
+    started = time.perf_counter()
+    previous = load_manifest(manifest_path, ingestor.collection_name)
+    # Documents are read once, keeping the added and changed ones, so that
+    # only hashes of documents that were actually sent can be recorded.
+    current: Dict[str, str] = {}
+    pending: List[Tuple[str, Mapping[str, Any]]] = []
+    for path, document in sample_documents.iter_document_paths() if documents is None else documents:
+        digest = current[path] = document_hash(document)
+        if previous.get(path) != digest:
+            pending.append((path, document))
+    hashed = time.perf_counter()
+    diff = diff_manifests(previous, current)
+    finished = time.perf_counter()
+    report: Dict[str, Any] = {
+        **diff.to_dict(),
+        "hash_ms": (hashed - started) * 1000,
+        "diff_ms": (finished - hashed) * 1000,
+    }
+    if dry_run or not diff:
+        return report
+
+    reached: Set[str] = set()
+
+    def send() -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        for path, document in pending:
+            reached.add(path)
+            yield path, document
+
+    upload = await ingestor.ingest(send())
+    unreached = [path for path, _ in pending if path not in reached]
+    upload["failed"] += len(unreached)
+    upload["failed_paths"].extend(unreached)
+    report["upload"] = upload
+
+    deleted = []
+    deletions = IngestionStats()
+    window = max(1, ingestor.concurrency)
+    for start in range(0, len(diff.removed), window):
+        paths = diff.removed[start:start + window]
+        outcomes = await asyncio.gather(
+            *(ingestor.delete_document(path, deletions) for path in paths), return_exceptions=True
+        )
+        deleted.extend(path for path, outcome in zip(paths, outcomes) if outcome is True)
+    report["deleted"] = len(deleted)
+    report["delete_failed"] = len(diff.removed) - len(deleted)
+    report["delete_retries"] = deletions.retries
+
+    # Only uploaded documents get their new hash; failed or unreached ones keep
+    # their previous hash (or stay absent) so the next sync retries them, and
+    # failed deletions stay listed for the same reason.
+    failed = set(upload["failed_paths"])
+    updated = dict(previous)
+    for path, _ in pending:
+        if path not in failed:
+            updated[path] = current[path]
+    for path in deleted:
+        del updated[path]
+    save_manifest(manifest_path, ingestor.collection_name, updated)
+    return report
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    from . import sample_documents
+
+    if args.corpus:
+        sample_documents.load_corpus_file(args.corpus)
+    async with ZeroEntropyIngestor(
+        args.base_url, api_key_from_env(), args.collection, args.concurrency
+    ) as ingestor:
+        if not args.dry_run:
+            await ingestor.create_collection()
+        return await sync(ingestor, args.manifest, dry_run=args.dry_run)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upload only added or changed documents and delete removed ones.")
+    parser.add_argument("manifest", help="manifest file recording what has been uploaded")
+    parser.add_argument("--corpus", help="corpus file (defaults to the active collection)")
+    parser.add_argument("--base-url", default=os.environ.get("ZEROENTROPY_BASE_URL", DEFAULT_BASE_URL))
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    args = parser.parse_args()
+    report = asyncio.run(_run(args))
+    if "upload" in report:
+        report["upload"].pop("failed_paths")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
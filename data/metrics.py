@@ -0,0 +1,304 @@
+"""
+Metrics Module
+
+This module records call counts, errors, latency histograms and result-size
+histograms for instrumented functions, and exports them as a JSON-friendly
+snapshot or in the Prometheus text exposition format.
+
+Histograms use fixed bucket bounds, so recording a call is a bisection and a
+few increments under a lock, and quantiles in snapshots are interpolated
+within buckets. A disabled registry costs one attribute check per call.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+# Upper bounds in seconds, 10 µs to 10 s in 1-2.5-5 steps.
+LATENCY_BUCKETS = tuple(
+    scale * step for scale in (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0) for step in (1.0, 2.5, 5.0)
+) + (10.0,)
+# Upper bounds on the number of results returned.
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10_000, 100_000, 1_000_000)
+
+
+def result_size(result: Any) -> Optional[int]:
+    """
+    Returns the number of results in a return value.
+
+    Args:
+        result (Any): Return value of an instrumented function
+
+    Returns:
+        Optional[int]: ``len`` of the ``results`` or ``documents`` entry of a
+        response dict, its ``total``, or ``len`` of the value itself; None if
+        the value has no size
+    """
+    kind = type(result)
+    if kind is list or kind is tuple:
+        return len(result)
+    if isinstance(result, Mapping):
+        for key in ("results", "documents"):
+            if key in result:
+                return len(result[key])
+        if "total" in result:
+            return result["total"]
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+class Histogram:
+    """
+    Counts of observations per fixed bucket, plus their sum and maximum.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # One count per bound, plus an overflow bucket for larger values.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value (float): Observed value
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimates a quantile by interpolating within its bucket.
+
+        Args:
+            fraction (float): Quantile between 0 and 1
+
+        Returns:
+            float: Estimated value, clamped to the observed minimum and maximum
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for position, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[position - 1] if position else 0.0
+                upper = self.bounds[position] if position < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+
+class _Series:
+    # Everything recorded for one instrumented function.
+
+    __slots__ = ("calls", "errors", "latency", "sizes")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sizes = Histogram(SIZE_BUCKETS)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of per-function call metrics.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "zeroentropy",
+        enabled: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Creates an empty registry.
+
+        Args:
+            namespace (str): Prefix of the exported Prometheus metric names
+            enabled (bool): Whether instrumented calls are recorded
+            clock (Callable[[], float]): Monotonic clock in seconds
+        """
+        self.namespace = namespace
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._series: Dict[str, _Series] = {}
+        self._started = clock()
+
+    def record(self, name: str, seconds: float, size: Optional[int] = None, error: bool = False) -> None:
+        """
+        Records one call.
+
+        Args:
+            name (str): Function name
+            seconds (float): Call duration
+            size (int): Number of results returned, if known
+            error (bool): Whether the call raised
+        """
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series()
+            series.calls += 1
+            series.latency.observe(seconds)
+            if error:
+                series.errors += 1
+            elif size is not None:
+                series.sizes.observe(size)
+
+    def instrument(
+        self,
+        name: Optional[str] = None,
+        size: Callable[[Any], Optional[int]] = result_size,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Decorates a function so that its calls are recorded.
+
+        Args:
+            name (str): Name to record under (defaults to the function name)
+            size (Callable[[Any], Optional[int]]): Extracts the result size
+                from a return value
+
+        Returns:
+            Callable[[Callable[..., Any]], Callable[..., Any]]: The decorator
+        """
+        def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+            label = name or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started = self._clock()
+                try:
+                    result = function(*args, **kwargs)
+                except BaseException:
+                    self.record(label, self._clock() - started, error=True)
+                    raise
+                self.record(label, self._clock() - started, size(result))
+                return result
+
+            return wrapper
+
+        return decorate
+
+    def reset(self) -> None:
+        """Discards everything recorded so far."""
+        with self._lock:
+            self._series = {}
+            self._started = self._clock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarizes the recorded metrics.
+
+        Returns:
+            Dict[str, Any]: ``enabled``, ``elapsed_s`` since creation or the
+            last reset, and per function ``calls``, ``errors``,
+            ``calls_per_s``, ``latency_ms`` (mean, p50, p95, p99, max) and
+            ``result_size`` (mean, p50, p99, max)
+        """
+        with self._lock:
+            elapsed = self._clock() - self._started
+            functions = {}
+            for name, series in sorted(self._series.items()):
+                latency, sizes = series.latency, series.sizes
+                functions[name] = {
+                    "calls": series.calls,
+                    "errors": series.errors,
+                    "calls_per_s": series.calls / elapsed if elapsed > 0 else 0.0,
+                    "latency_ms": {
+                        "mean": latency.sum / latency.count * 1000 if latency.count else 0.0,
+                        "p50": latency.quantile(0.50) * 1000,
+                        "p95": latency.quantile(0.95) * 1000,
+                        "p99": latency.quantile(0.99) * 1000,
+                        "max": latency.max * 1000,
+                    },
+                    "result_size": {
+                        "mean": sizes.sum / sizes.count if sizes.count else 0.0,
+                        "p50": sizes.quantile(0.50),
+                        "p99": sizes.quantile(0.99),
+                        "max": sizes.max,
+                    },
+                }
+        return {"enabled": self.enabled, "elapsed_s": elapsed, "functions": functions}
+
+    def prometheus_text(self) -> str:
+        """
+        Renders the recorded metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Counters ``<namespace>_calls_total`` and
+            ``<namespace>_errors_total`` and histograms
+            ``<namespace>_call_duration_seconds`` and
+            ``<namespace>_result_size``, labelled by function
+        """
+        prefix = self.namespace
+        lines = [
+            f"# HELP {prefix}_calls_total Calls of instrumented functions.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+            lines += [f'{prefix}_calls_total{{function="{name}"}} {values.calls}' for name, values in series]
+            lines += [
+                f"# HELP {prefix}_errors_total Calls of instrumented functions that raised.",
+                f"# TYPE {prefix}_errors_total counter",
+            ]
+            lines += [f'{prefix}_errors_total{{function="{name}"}} {values.errors}' for name, values in series]
+            for metric, description, attribute in (
+                ("call_duration_seconds", "Duration of instrumented calls.", "latency"),
+                ("result_size", "Number of results returned by instrumented calls.", "sizes"),
+            ):
+                lines += [f"# HELP {prefix}_{metric} {description}", f"# TYPE {prefix}_{metric} histogram"]
+                for name, values in series:
+                    lines += _histogram_lines(f"{prefix}_{metric}", name, getattr(values, attribute))
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, function: str, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{function="{function}",le="{bound:g}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{function="{function}",le="+Inf"}} {histogram.count}')
+    lines.append(f'{metric}_sum{{function="{function}"}} {float(histogram.sum)!r}')
+    lines.append(f'{metric}_count{{function="{function}"}} {histogram.count}')
+    return lines
+
+
+def enabled_from_env(default: bool = True) -> bool:
+    """
+    Reads the instrumentation switch from ZEROENTROPY_METRICS.
+
+    Args:
+        default (bool): Value when the variable is unset
+
+    Returns:
+        bool: False if the variable is "0", "false", "no" or "off"
+    """
+    value = os.environ.get("ZEROENTROPY_METRICS")
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
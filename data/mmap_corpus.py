@@ -0,0 +1,233 @@
+"""
+Memory-Mapped Corpus Module
+
+This module defines an on-disk corpus format that is opened with ``mmap`` and
+decoded lazily, so opening a corpus costs the same regardless of its size. A
+corpus file holds one JSON document per line followed by an offset table:
+
+    header   magic (8 bytes), format version (u32), document count (u64),
+             offset table position (u64)
+    data     newline-terminated JSON documents
+    offsets  count + 1 little-endian u64 offsets into the data section
+
+Run ``python -m data.mmap_corpus OUTPUT`` to convert SAMPLE_DOCUMENTS.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping as MappingABC, Sequence as SequenceABC
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b"ZECORP\x00\x01"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIQQ")
+# Lines are always UTF-8, so they skip json.loads' encoding detection.
+_DECODER = json.JSONDecoder()
+
+
+class CorpusFormatError(ValueError):
+    """Raised when a file is not a valid corpus file."""
+
+
+def encode_document(document: Dict[str, Any]) -> bytes:
+    """
+    Encodes a document as one corpus line.
+
+    Args:
+        document (Dict[str, Any]): Document to encode
+
+    Returns:
+        bytes: Compact UTF-8 JSON terminated by a newline
+    """
+    return json.dumps(dict(document), ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def write_corpus(documents: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    Streams documents into a corpus file.
+
+    Args:
+        documents (Iterable[Dict[str, Any]]): Documents to write
+        path (str): Destination file path
+
+    Returns:
+        int: Number of documents written
+    """
+    return write_corpus_lines((encode_document(document) for document in documents), path)
+
+
+def write_corpus_lines(lines: Iterable[bytes], path: str) -> int:
+    """
+    Streams pre-encoded document lines into a corpus file.
+
+    Args:
+        lines (Iterable[bytes]): Lines produced by ``encode_document``
+        path (str): Destination file path
+
+    Returns:
+        int: Number of documents written
+    """
+    offsets = array("Q", [0])
+    with open(path, "wb") as handle:
+        handle.write(b"\x00" * _HEADER.size)
+        position = 0
+        for line in lines:
+            handle.write(line)
+            position += len(line)
+            offsets.append(position)
+        # Align the offset table so it can be cast to u64 in place.
+        padding = -(_HEADER.size + position) % 8
+        handle.write(b"\x00" * padding)
+        table_position = _HEADER.size + position + padding
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        offsets.tofile(handle)
+        handle.seek(0)
+        handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(offsets) - 1, table_position))
+    return len(offsets) - 1
+
+
+class CorpusDocument(MappingABC):
+    """
+    Read-only mapping view over one document of a ``MmapCorpus``.
+
+    The underlying JSON line is decoded on access. The corpus keeps the most
+    recently decoded document, so reading several fields of one document in a
+    row decodes it once without pinning decoded documents in memory.
+    """
+
+    __slots__ = ("_corpus", "row")
+
+    def __init__(self, corpus: "MmapCorpus", row: int):
+        self._corpus = corpus
+        self.row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._corpus._decode_cached(self.row)[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._corpus._decode_cached(self.row))
+
+    def __len__(self) -> int:
+        return len(self._corpus._decode_cached(self.row))
+
+    def __repr__(self) -> str:
+        return f"CorpusDocument(row={self.row})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Decodes the document into a plain dict.
+
+        Returns:
+            Dict[str, Any]: The stored document, owned by the caller
+        """
+        return self._corpus.decode(self.row)
+
+
+class MmapCorpus(SequenceABC):
+    """
+    Sequence of documents backed by a memory-mapped corpus file.
+
+    Opening maps the file and casts the offset table in place; no document is
+    read until it is accessed, and pages are shared between processes that map
+    the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise CorpusFormatError(f"{path} is too small to be a corpus file")
+        magic, version, count, table_position = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise CorpusFormatError(f"{path} is not a version {FORMAT_VERSION} corpus file")
+        self._count = count
+        self._data = memoryview(self._mmap)[_HEADER.size:table_position]
+        self._offsets = memoryview(self._mmap)[table_position:table_position + 8 * (count + 1)].cast("Q")
+        if sys.byteorder != "little":
+            offsets = array("Q", self._offsets)
+            offsets.byteswap()
+            self._offsets.release()
+            self._offsets = memoryview(offsets)
+        # (row, document) of the last document decoded for a field access.
+        self._last: Tuple[int, Optional[Dict[str, Any]]] = (-1, None)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, row: int) -> CorpusDocument:
+        if isinstance(row, slice):
+            return [CorpusDocument(self, index) for index in range(*row.indices(self._count))]
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("document row out of range")
+        return CorpusDocument(self, row)
+
+    def __iter__(self) -> Iterator[CorpusDocument]:
+        return (CorpusDocument(self, row) for row in range(self._count))
+
+    def __enter__(self) -> "MmapCorpus":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def raw(self, row: int) -> memoryview:
+        """
+        Returns the encoded JSON line of a document without copying.
+
+        Args:
+            row (int): Document row
+
+        Returns:
+            memoryview: UTF-8 JSON bytes including the trailing newline
+        """
+        return self._data[self._offsets[row]:self._offsets[row + 1]]
+
+    def decode(self, row: int) -> Dict[str, Any]:
+        """
+        Decodes one document.
+
+        Args:
+            row (int): Document row
+
+        Returns:
+            Dict[str, Any]: The stored document
+        """
+        return _DECODER.decode(str(self.raw(row), "utf-8"))
+
+    def _decode_cached(self, row: int) -> Dict[str, Any]:
+        # Index builders read the fields of one document after another, so a
+        # single cached document turns those reads into one decode. The dict
+        # is shared between views and must not be handed out for mutation.
+        last_row, document = self._last
+        if last_row != row:
+            document = self.decode(row)
+            self._last = (row, document)
+        return document
+
+    def close(self) -> None:
+        """Releases the offset views and unmaps the file."""
+        self._offsets.release()
+        self._data.release()
+        self._mmap.close()
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m data.mmap_corpus OUTPUT")
+    from .sample_documents import SAMPLE_DOCUMENTS
+
+    count = write_corpus(SAMPLE_DOCUMENTS, sys.argv[1])
+    print(f"Wrote {count} documents to {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+Mock ZeroEntropy API Module
+
+This module serves a local stand-in for the ZeroEntropy API over asyncio
+streams, so the ingestion and query paths can be exercised and load-tested
+offline. It implements the endpoints the TypeScript client and data.ingest
+use:
+
+- ``/status/get-status``
+- ``/collections/get-collection-list``, ``/collections/add-collection`` and
+  ``/collections/delete-collection``
+- ``/documents/add-document`` and ``/documents/delete-document``
+- ``/queries/top-snippets``
+
+Documents are split into passages with data.chunking and ranked with BM25,
+and a collection can be preloaded from the corpus in data.sample_documents.
+Every request can be delayed by a fixed latency plus uniform jitter, and can
+fail with an injected 500 or a 429 with Retry-After, each at a configurable
+rate. Paths may carry the ``/v1`` prefix of the real API.
+
+Usage:
+    python -m data.mock_api [--port 8000] [--corpus FILE] [--latency 0.02] [--error-rate 0.01]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .chunking import chunk_text, normalize_whitespace
+from .ingest import DEFAULT_COLLECTION
+from .keyword_search import BM25Index
+
+Response = Tuple[int, Any]
+
+
+class MockCollection:
+    """
+    Documents of one collection, indexed by passage for snippet queries.
+    """
+
+    def __init__(self, max_chars: int = 500):
+        self.max_chars = max_chars
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self._passages: Dict[int, Tuple[str, int, int, Dict[str, Any]]] = {}
+        self._passage_ids: Dict[str, List[int]] = {}
+        self._keyword_index = BM25Index()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, path: str, text: str, metadata: Mapping[str, Any]) -> None:
+        """
+        Adds or replaces a document.
+
+        Args:
+            path (str): Document path
+            text (str): Document text
+            metadata (Mapping[str, Any]): Metadata sent with the document
+        """
+        self.remove(path)
+        content = normalize_whitespace(text)
+        title = str(metadata.get("name", ""))
+        self.documents[path] = {"path": path, "content": content, "metadata": dict(metadata)}
+        ids = self._passage_ids[path] = []
+        for start, end in chunk_text(content, self.max_chars):
+            passage = {"title": title, "content": content[start:end]}
+            self._keyword_index.add(self._next_id, passage)
+            self._passages[self._next_id] = (path, start, end, passage)
+            ids.append(self._next_id)
+            self._next_id += 1
+
+    def remove(self, path: str) -> bool:
+        """
+        Removes a document.
+
+        Args:
+            path (str): Document path
+
+        Returns:
+            bool: False if there was no such document
+        """
+        if self.documents.pop(path, None) is None:
+            return False
+        for passage_id in self._passage_ids.pop(path):
+            _, _, _, passage = self._passages.pop(passage_id)
+            self._keyword_index.remove(passage_id, passage)
+        return True
+
+    def top_snippets(self, query: str, k: int) -> List[Dict[str, Any]]:
+        """
+        Returns the passages that best match a query.
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of snippets
+
+        Returns:
+            List[Dict[str, Any]]: Snippets shaped like the API's, best first
+        """
+        results = []
+        for passage_id, score in self._keyword_index.search(query, k):
+            path, start, end, passage = self._passages[passage_id]
+            results.append({
+                "path": path,
+                "start_index": start,
+                "end_index": end,
+                "page_span": [0, 1],
+                "content": passage["content"],
+                "score": score,
+            })
+        return results
+
+
+class MockZeroEntropyServer:
+    """
+    In-process HTTP/1.1 server emulating the ZeroEntropy API.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        api_key: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Creates a server with no collections.
+
+        Args:
+            latency (float): Seconds added to every request
+            jitter (float): Maximum extra seconds added uniformly at random
+            error_rate (float): Fraction of requests failing with 500
+            throttle_rate (float): Fraction of requests rejected with 429
+            retry_after (float): Retry-After seconds sent with 429 responses
+            api_key (str): If set, requests must send it as a Bearer token
+            seed (int): Seed for latency and error injection
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.api_key = api_key
+        self.collections: Dict[str, MockCollection] = {}
+        self.requests: Counter = Counter()
+        self.responses: Counter = Counter()
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes: Dict[str, Callable[[Dict[str, Any]], Awaitable[Response]]] = {
+            "/status/get-status": self._get_status,
+            "/collections/get-collection-list": self._get_collection_list,
+            "/collections/add-collection": self._add_collection,
+            "/collections/delete-collection": self._delete_collection,
+            "/documents/add-document": self._add_document,
+            "/documents/delete-document": self._delete_document,
+            "/queries/top-snippets": self._top_snippets,
+        }
+
+    async def __aenter__(self) -> "MockZeroEntropyServer":
+        if self._server is None:
+            await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def load(self, documents: Iterable[Tuple[str, Mapping[str, Any]]], collection_name: str = DEFAULT_COLLECTION) -> int:
+        """
+        Preloads (path, document) pairs into a collection, creating it if needed.
+
+        Args:
+            documents (Iterable[Tuple[str, Mapping[str, Any]]]): Pairs such as
+                those from sample_documents.iter_document_paths
+            collection_name (str): Collection to load into
+
+        Returns:
+            int: Number of documents loaded
+        """
+        collection = self.collections.setdefault(collection_name, MockCollection())
+        count = 0
+        for path, document in documents:
+            collection.add(path, document["content"], {"category": document["category"], "name": document["title"]})
+            count += 1
+        return count
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Starts listening.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind, or 0 for any free port
+        """
+        self._server = await asyncio.start_server(self._serve_connection, host, port, backlog=1024)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server, including the /v1 prefix."""
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """
+        Starts listening and serves until cancelled.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind
+        """
+        await self.start(host, port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stops listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns request counters.
+
+        Returns:
+            Dict[str, Any]: Request count per endpoint and response count per status
+        """
+        return {
+            "requests": dict(self.requests),
+            "responses": {str(status): count for status, count in sorted(self.responses.items())},
+        }
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+                if "transfer-encoding" in headers:
+                    # Clients of this API always send Content-Length.
+                    status, body, extra = HTTPStatus.LENGTH_REQUIRED, {"detail": "Length Required"}, {}
+                    keep_alive = False
+                else:
+                    payload = await reader.readexactly(int(headers.get("content-length", 0)))
+                    status, body, extra = await self._respond(method, target, headers, payload)
+                writer.write(self._render(status, body, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _render(status: int, body: Any, headers: Mapping[str, str], keep_alive: bool) -> bytes:
+        encoded = json.dumps(body).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(encoded)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + encoded
+
+    async def _respond(
+        self,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        payload: bytes,
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        path = target.split("?", 1)[0]
+        if path.startswith("/v1/"):
+            path = path[3:]
+        route = self._routes.get(path)
+        self.requests[path if route else "unknown"] += 1
+        status, body, extra = await self._route(method, route, headers, payload)
+        self.responses[int(status)] += 1
+        return status, body, extra
+
+    async def _route(
+        self,
+        method: str,
+        route: Optional[Callable[[Dict[str, Any]], Awaitable[Response]]],
+        headers: Mapping[str, str],
+        payload: bytes,
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"detail": "Not Found"}, {}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"detail": "Method Not Allowed"}, {}
+        if self.api_key and headers.get("authorization") != f"Bearer {self.api_key}":
+            return HTTPStatus.UNAUTHORIZED, {"detail": "Invalid API key"}, {}
+        delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            return HTTPStatus.TOO_MANY_REQUESTS, {"detail": "Rate limit exceeded"}, {"Retry-After": f"{self.retry_after:g}"}
+        if roll < self.throttle_rate + self.error_rate:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"detail": "Injected failure"}, {}
+        try:
+            request = json.loads(payload) if payload else {}
+        except ValueError:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"detail": "Invalid JSON body"}, {}
+        if not isinstance(request, dict):
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"detail": "Expected a JSON object"}, {}
+        try:
+            status, body = await route(request)
+        except (KeyError, TypeError) as error:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"detail": f"Invalid request: {error}"}, {}
+        return status, body, {}
+
+    def _collection(self, request: Mapping[str, Any]) -> Optional[MockCollection]:
+        return self.collections.get(request["collection_name"])
+
+    async def _get_status(self, request: Dict[str, Any]) -> Response:
+        if "collection_name" in request:
+            collection = self._collection(request)
+            if collection is None:
+                return HTTPStatus.NOT_FOUND, {"detail": "Collection not found"}
+            count = len(collection)
+        else:
+            count = sum(len(collection) for collection in self.collections.values())
+        return HTTPStatus.OK, {
+            "num_documents": count,
+            "num_parsing_documents": 0,
+            "num_indexing_documents": 0,
+            "num_indexed_documents": count,
+            "num_failed_documents": 0,
+        }
+
+    async def _get_collection_list(self, request: Dict[str, Any]) -> Response:
+        return HTTPStatus.OK, {"collection_names": sorted(self.collections)}
+
+    async def _add_collection(self, request: Dict[str, Any]) -> Response:
+        name = request["collection_name"]
+        if name in self.collections:
+            return HTTPStatus.CONFLICT, {"detail": "Collection already exists"}
+        self.collections[name] = MockCollection()
+        return HTTPStatus.CREATED, {"message": "Success!"}
+
+    async def _delete_collection(self, request: Dict[str, Any]) -> Response:
+        if self.collections.pop(request["collection_name"], None) is None:
+            return HTTPStatus.NOT_FOUND, {"detail": "Collection not found"}
+        return HTTPStatus.OK, {"message": "Success!"}
+
+    async def _add_document(self, request: Dict[str, Any]) -> Response:
+        collection = self._collection(request)
+        if collection is None:
+            return HTTPStatus.NOT_FOUND, {"detail": "Collection not found"}
+        path, content = request["path"], request["content"]
+        if path in collection.documents and not request.get("overwrite", False):
+            return HTTPStatus.CONFLICT, {"detail": "Document already exists"}
+        if content.get("type") != "text":
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"detail": "Only text content is supported"}
+        collection.add(path, content["text"], request.get("metadata") or {})
+        return HTTPStatus.CREATED, {"message": "Success!"}
+
+    async def _delete_document(self, request: Dict[str, Any]) -> Response:
+        collection = self._collection(request)
+        if collection is None or not collection.remove(request["path"]):
+            return HTTPStatus.NOT_FOUND, {"detail": "Document not found"}
+        return HTTPStatus.OK, {"message": "Success!"}
+
+    async def _top_snippets(self, request: Dict[str, Any]) -> Response:
+        collection = self._collection(request)
+        if collection is None:
+            return HTTPStatus.NOT_FOUND, {"detail": "Collection not found"}
+        return HTTPStatus.OK, {"results": collection.top_snippets(request["query"], int(request.get("k", 10)))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local mock of the ZeroEntropy API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--corpus", help="corpus file to preload (defaults to the active collection)")
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--no-preload", action="store_true", help="start without any collection")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum random extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests failing with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--api-key", help="require this Bearer token")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = MockZeroEntropyServer(
+        args.latency, args.jitter, args.error_rate, args.throttle_rate, args.retry_after, args.api_key, args.seed
+    )
+    if not args.no_preload:
+        from . import sample_documents
+
+        if args.corpus:
+            sample_documents.load_corpus_file(args.corpus)
+        count = server.load(sample_documents.iter_document_paths(), args.collection)
+        print(f"Loaded {count} documents into {args.collection}")
+    print(f"Serving on http://{args.host}:{args.port}/v1")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Near-Duplicate Detection Module
+
+This module finds documents whose content is nearly identical, such as
+successive revisions of the same report, without comparing every pair. Each
+document is reduced to a MinHash signature over its word shingles, and the
+signature is split into bands that are hashed into buckets (locality-sensitive
+hashing). Only documents sharing a bucket are compared, so building clusters
+costs roughly linear time in the number of documents.
+
+With the default 128 hash functions in 16 bands of 8 rows, pairs with a
+Jaccard similarity of 0.8 share a bucket with probability above 0.99, while
+pairs below 0.5 almost never do. Candidates are confirmed by comparing their
+full signatures against ``threshold``.
+"""
+
+import zlib
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .keyword_search import tokenize
+
+_SHINGLE_BASE = np.uint64(0x100000001B3)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index over document content.
+
+    Documents are grouped into clusters with a union-find structure as they
+    are added: a new document is compared with every document of the buckets
+    it falls into and joined to each one that is similar enough.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        threshold: float = 0.8,
+        seed: int = 0,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: the top 32 bits of (a * x + b) mod 2**64,
+        # with odd multipliers, behave like independent random permutations.
+        self._a = rng.integers(1, 2**63, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=(num_perm, 1), dtype=np.uint64)
+        # Each band of rows is folded into one 64-bit bucket key.
+        self._band_weights = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._token_hashes: Dict[str, int] = {}
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._parents: Dict[int, int] = {}
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _shingles(self, text: str) -> Optional[np.ndarray]:
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        cache = self._token_hashes
+        hashes = np.array(
+            [cache[token] if token in cache else cache.setdefault(token, zlib.crc32(token.encode("utf-8"))) for token in tokens],
+            dtype=np.uint64,
+        )
+        width = min(self.shingle_size, len(hashes))
+        count = len(hashes) - width + 1
+        shingles = hashes[:count].copy()
+        for offset in range(1, width):
+            shingles = shingles * _SHINGLE_BASE + hashes[offset:offset + count]
+        return shingles
+
+    def signatures(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Computes MinHash signatures for a batch of texts.
+
+        The shingles of the whole batch are permuted in one array operation
+        and reduced per text, which is much faster than one text at a time.
+
+        Args:
+            texts (Sequence[str]): Document contents
+
+        Returns:
+            List[Optional[np.ndarray]]: Per text, ``num_perm`` uint32 minimum
+            hashes, or None if the text has no tokens
+        """
+        shingles = [self._shingles(text) for text in texts]
+        present = [array for array in shingles if array is not None]
+        if not present:
+            return [None] * len(texts)
+        offsets = np.cumsum([0] + [len(array) for array in present[:-1]])
+        permuted = (self._a * np.concatenate(present) + self._b) >> np.uint64(32)
+        minima = iter(np.minimum.reduceat(permuted, offsets, axis=1).T.astype(np.uint32))
+        return [None if array is None else next(minima) for array in shingles]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Computes the MinHash signature of a text.
+
+        Args:
+            text (str): Document content
+
+        Returns:
+            Optional[np.ndarray]: ``num_perm`` uint32 minimum hashes, or None
+            if the text has no tokens
+        """
+        return self.signatures([text])[0]
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Estimates the Jaccard similarity of two documents from their signatures.
+
+        Args:
+            first (np.ndarray): Signature
+            second (np.ndarray): Signature
+
+        Returns:
+            float: Fraction of agreeing hash functions
+        """
+        return float(np.count_nonzero(first == second)) / self.num_perm
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        return (signature.reshape(self.bands, self.rows).astype(np.uint64) @ self._band_weights).tolist()
+
+    def _candidates(self, signature: np.ndarray, keys: List[int]) -> Iterator[int]:
+        seen = set()
+        for band, key in enumerate(keys):
+            for other in self._buckets[band].get(key, ()):
+                if other not in seen:
+                    seen.add(other)
+                    if self.similarity(signature, self._signatures[other]) >= self.threshold:
+                        yield other
+
+    def _find(self, doc_id: int) -> int:
+        parents = self._parents
+        root = doc_id
+        while parents[root] != root:
+            root = parents[root]
+        while parents[doc_id] != root:
+            parents[doc_id], doc_id = root, parents[doc_id]
+        return root
+
+    def _union(self, first: int, second: int) -> None:
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            # The older document stays the representative of the cluster.
+            self._parents[max(first, second)] = min(first, second)
+
+    def match_signature(self, signature: np.ndarray) -> Optional[int]:
+        """
+        Finds an indexed document that a signature is a near-duplicate of.
+
+        Args:
+            signature (np.ndarray): Signature from ``signature`` or ``signatures``
+
+        Returns:
+            Optional[int]: Id of the first bucket-sharing document at or above
+            ``threshold``, or None
+        """
+        return next(self._candidates(signature, self._band_keys(signature)), None)
+
+    def match(self, text: str) -> Optional[int]:
+        """
+        Finds an indexed document that a text is a near-duplicate of.
+
+        Args:
+            text (str): Content to check
+
+        Returns:
+            Optional[int]: Id of a bucket-sharing document at or above
+            ``threshold``, or None
+        """
+        signature = self.signature(text)
+        return None if signature is None else self.match_signature(signature)
+
+    def add_signature(self, doc_id: int, signature: np.ndarray) -> None:
+        """
+        Indexes a precomputed signature, e.g. one of a batch from ``signatures``.
+
+        Args:
+            doc_id (int): Id of the document; ids must increase as documents are added
+            signature (np.ndarray): Signature of the document's content
+        """
+        keys = self._band_keys(signature)
+        if not self._stale:
+            self._parents[doc_id] = doc_id
+            for other in self._candidates(signature, keys):
+                self._union(doc_id, other)
+        self._signatures[doc_id] = signature
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(doc_id)
+
+    def add(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        """
+        Indexes a document's content.
+
+        Args:
+            doc_id (int): Id of the document; ids must increase as documents are added
+            document (Mapping[str, Any]): Document with a ``content`` field
+        """
+        signature = self.signature(document["content"])
+        if signature is not None:
+            self.add_signature(doc_id, signature)
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Removes a document from the index.
+
+        Args:
+            doc_id (int): Id of a previously added document
+        """
+        signature = self._signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band][key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del self._buckets[band][key]
+        # The removed document may have been the link between two parts of a
+        # cluster, so clusters are rebuilt on the next lookup.
+        self._stale = True
+
+    def _refresh(self) -> None:
+        if not self._stale:
+            return
+        # Re-adding the remaining documents in id order links each one to
+        # every similar document before it, as building from scratch would.
+        signatures = self._signatures
+        self._signatures = {}
+        self._buckets = [{} for _ in range(self.bands)]
+        self._parents = {}
+        self._stale = False
+        for doc_id in sorted(signatures):
+            self.add_signature(doc_id, signatures[doc_id])
+
+    def representative(self, doc_id: int) -> int:
+        """
+        Returns the oldest document in the cluster of a document.
+
+        Args:
+            doc_id (int): Document id
+
+        Returns:
+            int: Id of the cluster representative (``doc_id`` itself if the
+            document has no near-duplicates or was never indexed)
+        """
+        self._refresh()
+        return self._find(doc_id) if doc_id in self._parents else doc_id
+
+    def clusters(self) -> List[List[int]]:
+        """
+        Groups indexed documents into near-duplicate clusters.
+
+        Returns:
+            List[List[int]]: Clusters of two or more ids, each sorted with its
+            representative first, ordered by representative
+        """
+        self._refresh()
+        groups: Dict[int, List[int]] = {}
+        for doc_id in sorted(self._signatures):
+            groups.setdefault(self._find(doc_id), []).append(doc_id)
+        return [members for _, members in sorted(groups.items()) if len(members) > 1]
+
+    def collapse(self, results: Iterable[Tuple[int, float]]) -> Iterator[Tuple[int, float]]:
+        """
+        Keeps only the best-ranked result of each near-duplicate cluster.
+
+        Args:
+            results (Iterable[Tuple[int, float]]): (id, score) pairs, best first
+
+        Returns:
+            Iterator[Tuple[int, float]]: The same pairs without lower-ranked duplicates
+        """
+        seen = set()
+        for doc_id, score in results:
+            cluster = self.representative(doc_id)
+            if cluster not in seen:
+                seen.add(cluster)
+                yield doc_id, score
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: Iterable[Tuple[int, Mapping[str, Any]]],
+        batch_size: int = 256,
+        **kwargs: Any,
+    ) -> "NearDuplicateIndex":
+        """
+        Builds an index from (id, document) pairs.
+
+        Args:
+            documents (Iterable[Tuple[int, Mapping[str, Any]]]): Documents with their ids
+            batch_size (int): Documents whose signatures are computed together
+            **kwargs (Any): Parameters passed to the constructor
+
+        Returns:
+            NearDuplicateIndex: The populated index
+        """
+        index = cls(**kwargs)
+        documents = iter(documents)
+        while True:
+            batch = list(islice(documents, batch_size))
+            if not batch:
+                return index
+            signatures = index.signatures([document["content"] for _, document in batch])
+            for (doc_id, _), signature in zip(batch, signatures):
+                if signature is not None:
+                    index.add_signature(doc_id, signature)
+
+
+def distinct_documents(
+    items: Iterable[Tuple[Any, Mapping[str, Any]]],
+    batch_size: int = 256,
+    **kwargs: Any,
+) -> Iterator[Tuple[Any, Mapping[str, Any]]]:
+    """
+    Streams (key, document) pairs, dropping near-duplicates of earlier documents.
+
+    Used to collapse duplicates at ingestion time; the first document of each
+    cluster is kept.
+
+    Args:
+        items (Iterable[Tuple[Any, Mapping[str, Any]]]): Pairs such as (path, document)
+        batch_size (int): Documents whose signatures are computed together
+        **kwargs (Any): Parameters passed to NearDuplicateIndex
+
+    Returns:
+        Iterator[Tuple[Any, Mapping[str, Any]]]: Pairs whose document is not a
+        near-duplicate of one already yielded
+    """
+    index = NearDuplicateIndex(**kwargs)
+    items = iter(items)
+    position = 0
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        for (key, document), signature in zip(batch, index.signatures([document["content"] for _, document in batch])):
+            if signature is not None:
+                if index.match_signature(signature) is not None:
+                    continue
+                index.add_signature(position, signature)
+                position += 1
+            yield key, document
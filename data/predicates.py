@@ -0,0 +1,121 @@
+"""
+Document Predicates Module
+
+This module provides small composable predicates for filtering documents while
+streaming them from the corpus. A predicate is any callable that takes a
+document mapping and returns a bool; the combinators below build compound
+predicates from simpler ones.
+"""
+
+from typing import Any, Callable, Iterable, Mapping
+
+Predicate = Callable[[Mapping[str, Any]], bool]
+
+
+def category_is(*categories: str) -> Predicate:
+    """
+    Matches documents in any of the given categories.
+
+    Args:
+        *categories (str): Accepted categories
+
+    Returns:
+        Predicate: The predicate
+    """
+    accepted = frozenset(categories)
+    return lambda document: document["category"] in accepted
+
+
+def has_all_tags(*tags: str) -> Predicate:
+    """
+    Matches documents carrying every given tag.
+
+    Args:
+        *tags (str): Required tags
+
+    Returns:
+        Predicate: The predicate
+    """
+    required = frozenset(tags)
+    return lambda document: required.issubset(document["tags"])
+
+
+def has_any_tag(*tags: str) -> Predicate:
+    """
+    Matches documents carrying at least one of the given tags.
+
+    Args:
+        *tags (str): Accepted tags
+
+    Returns:
+        Predicate: The predicate
+    """
+    accepted = frozenset(tags)
+    return lambda document: not accepted.isdisjoint(document["tags"])
+
+
+def text_contains(text: str) -> Predicate:
+    """
+    Matches documents whose title or content contains the text, ignoring case.
+
+    Args:
+        text (str): Substring to look for
+
+    Returns:
+        Predicate: The predicate
+    """
+    needle = text.lower()
+    return lambda document: needle in document["title"].lower() or needle in document["content"].lower()
+
+
+def all_of(*predicates: Predicate) -> Predicate:
+    """
+    Matches documents accepted by every predicate.
+
+    Args:
+        *predicates (Predicate): Predicates to combine
+
+    Returns:
+        Predicate: The conjunction
+    """
+    return lambda document: all(predicate(document) for predicate in predicates)
+
+
+def any_of(*predicates: Predicate) -> Predicate:
+    """
+    Matches documents accepted by at least one predicate.
+
+    Args:
+        *predicates (Predicate): Predicates to combine
+
+    Returns:
+        Predicate: The disjunction
+    """
+    return lambda document: any(predicate(document) for predicate in predicates)
+
+
+def negate(predicate: Predicate) -> Predicate:
+    """
+    Matches documents rejected by a predicate.
+
+    Args:
+        predicate (Predicate): Predicate to invert
+
+    Returns:
+        Predicate: The negation
+    """
+    return lambda document: not predicate(document)
+
+
+def matches(document: Mapping[str, Any], predicates: Iterable[Predicate]) -> bool:
+    """
+    Returns whether a document satisfies every predicate.
+
+    Args:
+        document (Mapping[str, Any]): Document to test
+        predicates (Iterable[Predicate]): Predicates to apply
+
+    Returns:
+        bool: True if all predicates accept the document
+    """
+    return all(predicate(document) for predicate in predicates)
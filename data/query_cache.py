@@ -0,0 +1,207 @@
+"""
+Query Cache Module
+
+This module provides a bounded in-process cache for search and filter
+results. Entries are evicted least-recently-used first once either the entry
+or the byte budget is exceeded, expire after a time-to-live, and are dropped
+wholesale when the version of the collection they were computed from changes.
+
+Cached values should be compact result ids rather than documents, so that the
+byte accounting reflects what the cache actually owns.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes free-text query so that trivially different spellings share a key.
+
+    Args:
+        query (str): Query text
+
+    Returns:
+        str: Lowercased text with runs of whitespace collapsed, matching the
+        case-insensitivity of ``keyword_search.tokenize``
+    """
+    return " ".join(query.lower().split())
+
+
+def normalize_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Normalizes an order-insensitive tag list for use in a key.
+
+    Args:
+        tags (Iterable[str]): Tags
+
+    Returns:
+        Tuple[str, ...]: Sorted distinct tags
+    """
+    return tuple(sorted(set(tags)))
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximates the memory held by a value and the containers inside it.
+
+    Args:
+        value (Any): Key or cached value
+
+    Returns:
+        int: Size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    return size
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with a TTL, a byte budget and version invalidation.
+
+    Every lookup and insert carries the current collection version; the first
+    call that sees a different version than the cached entries were computed
+    for clears the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 2**20,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Hashable = None
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, version: Hashable) -> None:
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.nbytes = 0
+            self._version = version
+
+    def get(self, key: Hashable, version: Hashable, default: Any = None) -> Any:
+        """
+        Looks up a cached value.
+
+        Args:
+            key (Hashable): Cache key
+            version (Hashable): Current collection version
+            default (Any): Returned on a miss
+
+        Returns:
+            Any: The cached value, or ``default``
+        """
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                self.nbytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: Hashable) -> None:
+        """
+        Stores a value, evicting least recently used entries to fit the budgets.
+
+        Values larger than the whole byte budget are not cached.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to cache; must not be mutated afterwards
+            version (Hashable): Collection version the value was computed from
+        """
+        size = estimate_size(key) + estimate_size(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        expires = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            self._entries[key] = (value, size, expires)
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, version: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for a key, computing and storing it on a miss.
+
+        Args:
+            key (Hashable): Cache key
+            version (Hashable): Current collection version
+            compute (Callable[[], Any]): Produces the value on a miss
+
+        Returns:
+            Any: The cached or freshly computed value
+        """
+        value = self.get(key, version, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value, version)
+        return value
+
+    def clear(self) -> None:
+        """Drops every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            Dict[str, Any]: Entries, bytes, hits, misses, hit rate, evictions,
+            expirations and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
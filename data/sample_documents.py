@@ -6,7 +6,27 @@ industries and use cases to demonstrate ZeroEntropy's knowledge synthesis capabi
 Documents are structured to show real-world enterprise scenarios and challenges.
 """
 
-from typing import List, Dict, Any
+import os
+import re
+import time
+from itertools import islice
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from .bitset_index import BitsetIndex
+from .boolean_query import evaluate, parse_query
+from .columnar_store import ColumnarDocumentStore
+from .document_index import DocumentIndex
+from .facts import FactTable
+from .fuzzy_lookup import VocabularyIndex
+from .hybrid_search import hybrid_search
+from .index_snapshot import IndexSnapshot, SnapshotError, corpus_version, prefixed, write_snapshot
+from .keyword_search import BM25Index
+from .metrics import MetricsRegistry, enabled_from_env
+from .near_duplicates import NearDuplicateIndex
+from .mmap_corpus import MmapCorpus
+from .predicates import Predicate, matches
+from .query_cache import QueryCache, normalize_query, normalize_tags
+from .vector_search import DenseVectorIndex
 
 # Sample documents organized by industry and use case
 SAMPLE_DOCUMENTS = [
@@ -523,32 +543,438 @@ SAMPLE_DOCUMENTS = [
     }
 ]
 
-def get_documents_by_category(category: str = None) -> List[Dict[str, Any]]:
+# The active document collection. Defaults to SAMPLE_DOCUMENTS, or to the
+# memory-mapped corpus file named by ZEROENTROPY_CORPUS_PATH; any sequence of
+# document mappings (e.g. a ColumnarDocumentStore) can be swapped in with
+# load_collection. Use add_document and remove_document to change it so the
+# indexes below stay in sync.
+_COLLECTION: Optional[Sequence[Dict[str, Any]]] = None
+
+def _collection() -> Sequence[Dict[str, Any]]:
+    global _COLLECTION
+    if _COLLECTION is None:
+        path = os.environ.get("ZEROENTROPY_CORPUS_PATH")
+        _COLLECTION = MmapCorpus(path) if path else SAMPLE_DOCUMENTS
+    return _COLLECTION
+
+# Inverted category/tag index over the active collection, built on first use
+# so that importing this module stays cheap for large corpora.
+_INDEX: Optional[DocumentIndex] = None
+
+def _index() -> DocumentIndex:
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = DocumentIndex(_collection())
+    return _INDEX
+
+# BM25 index over title and content, built on first search.
+_KEYWORD_INDEX: Optional[BM25Index] = None
+
+def _keyword_index() -> BM25Index:
+    global _KEYWORD_INDEX
+    if _KEYWORD_INDEX is None:
+        _KEYWORD_INDEX = BM25Index.from_documents(_index().items())
+    return _KEYWORD_INDEX
+
+# Hashed TF-IDF vector index, built on first vector search.
+_VECTOR_INDEX: Optional[DenseVectorIndex] = None
+
+def _vector_index() -> DenseVectorIndex:
+    global _VECTOR_INDEX
+    if _VECTOR_INDEX is None:
+        _VECTOR_INDEX = DenseVectorIndex.from_documents(_index().items())
+    return _VECTOR_INDEX
+
+# Numeric fact table, extracted on first fact query and discarded whenever
+# the collection changes.
+_FACT_TABLE: Optional[FactTable] = None
+
+def _fact_table() -> FactTable:
+    global _FACT_TABLE
+    if _FACT_TABLE is None:
+        _FACT_TABLE = FactTable.from_documents(_index().items())
+    return _FACT_TABLE
+
+# MinHash/LSH near-duplicate index over document content, built on first use.
+_DUPLICATE_INDEX: Optional[NearDuplicateIndex] = None
+
+def _duplicate_index() -> NearDuplicateIndex:
+    global _DUPLICATE_INDEX
+    if _DUPLICATE_INDEX is None:
+        _DUPLICATE_INDEX = NearDuplicateIndex.from_documents(_index().items())
+    return _DUPLICATE_INDEX
+
+# Per-value bitsets and co-occurrence counts for facet counts, built on first
+# use and kept in sync by add_document and remove_document.
+_BITSET_INDEX: Optional[BitsetIndex] = None
+
+def _bitset_index() -> BitsetIndex:
+    global _BITSET_INDEX
+    if _BITSET_INDEX is None:
+        _BITSET_INDEX = BitsetIndex.from_documents(_index().items())
+    return _BITSET_INDEX
+
+# Typo-tolerant lookup over the tag and category vocabularies, built on the
+# first fuzzy lookup and kept in sync by add_document and remove_document.
+_TAG_VOCABULARY: Optional[VocabularyIndex] = None
+_CATEGORY_VOCABULARY: Optional[VocabularyIndex] = None
+
+def _tag_vocabulary() -> VocabularyIndex:
+    global _TAG_VOCABULARY
+    if _TAG_VOCABULARY is None:
+        _TAG_VOCABULARY = VocabularyIndex(_index().tags())
+    return _TAG_VOCABULARY
+
+def _category_vocabulary() -> VocabularyIndex:
+    global _CATEGORY_VOCABULARY
+    if _CATEGORY_VOCABULARY is None:
+        _CATEGORY_VOCABULARY = VocabularyIndex(_index().categories())
+    return _CATEGORY_VOCABULARY
+
+# Filter and search results keyed on normalized arguments. Results are cached
+# as document ids and tied to the index version, so adding or removing a
+# document invalidates every entry.
+_QUERY_CACHE = QueryCache()
+
+def _cached(key: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+    return _QUERY_CACHE.get_or_compute(key, _index().version, compute)
+
+# Call counts, latency and result-size histograms of the public lookup and
+# search functions. Set ZEROENTROPY_METRICS=0 or call configure_metrics(False)
+# to stop recording.
+_METRICS = MetricsRegistry(enabled=enabled_from_env())
+
+def load_corpus_file(path: str, snapshot: Optional[str] = None) -> None:
+    """
+    Opens a memory-mapped corpus file and makes it the active collection.
+    
+    Args:
+        path (str): Corpus file written by data.mmap_corpus.write_corpus
+        snapshot (str): Optional index snapshot to restore the indexes from,
+            see load_snapshot
+    """
+    load_collection(MmapCorpus(path))
+    if snapshot:
+        load_snapshot(snapshot)
+
+def load_collection(documents: Sequence[Dict[str, Any]]) -> None:
+    """
+    Replaces the active document collection and rebuilds its indexes.
+    
+    Args:
+        documents (Sequence[Dict[str, Any]]): List of document dicts, a
+            ColumnarDocumentStore or an MmapCorpus
+    """
+    global _COLLECTION, _INDEX, _KEYWORD_INDEX, _VECTOR_INDEX, _FACT_TABLE
+    global _TAG_VOCABULARY, _CATEGORY_VOCABULARY, _DUPLICATE_INDEX, _BITSET_INDEX
+    _COLLECTION = documents
+    _INDEX = None
+    _KEYWORD_INDEX = None
+    _VECTOR_INDEX = None
+    _FACT_TABLE = None
+    _TAG_VOCABULARY = None
+    _CATEGORY_VOCABULARY = None
+    _DUPLICATE_INDEX = None
+    _BITSET_INDEX = None
+    _QUERY_CACHE.clear()
+
+def save_snapshot(path: str) -> int:
+    """
+    Builds the category/tag, keyword, vector and bitset indexes of the active
+    collection and writes them to a snapshot file.
+    
+    The fact table and the near-duplicate index are not included; they are
+    rebuilt on first use as before.
+    
+    Args:
+        path (str): Snapshot file to write; replaced atomically if it exists
+        
+    Returns:
+        int: Size of the snapshot in bytes
+        
+    Raises:
+        SnapshotError: If documents were removed from a collection that keeps
+            removed rows in storage, so that ids no longer follow positions
+    """
+    collection = _collection()
+    index = _index()
+    if len(index) != len(collection):
+        raise SnapshotError("the collection has removed rows; reload it before taking a snapshot")
+    parts = {
+        "documents": index.snapshot_arrays(),
+        "keyword": _keyword_index().snapshot_arrays(),
+        "vectors": _vector_index().snapshot_arrays(),
+        "bitsets": _bitset_index().snapshot_arrays(),
+    }
+    sections = [section for name, (arrays, _) in parts.items() for section in prefixed(name, arrays)]
+    meta = {name: part_meta for name, (_, part_meta) in parts.items()}
+    return write_snapshot(path, corpus_version(collection), sections, meta)
+
+def load_snapshot(path: str, verify: bool = False) -> bool:
+    """
+    Restores the indexes of the active collection from a snapshot file.
+    
+    The snapshot is memory-mapped and only its section table is read, so this
+    takes the same time whatever the collection size, and worker processes
+    that load the same file share its pages instead of each holding a copy.
+    If the file is missing or invalid, or was written for a different version
+    of the collection, the indexes are rebuilt and the snapshot is rewritten.
+    
+    Args:
+        path (str): Snapshot file written by save_snapshot
+        verify (bool): Also check the checksum of every section, which reads
+            the whole file
+        
+    Returns:
+        bool: True if the indexes were restored, False if they were rebuilt
+    """
+    global _INDEX, _KEYWORD_INDEX, _VECTOR_INDEX, _BITSET_INDEX
+    collection = _collection()
+    load_collection(collection)
+    try:
+        snapshot = IndexSnapshot(path, verify)
+    except (OSError, SnapshotError):
+        snapshot = None
+    if snapshot is None or snapshot.corpus_version != corpus_version(collection):
+        save_snapshot(path)
+        return False
+    meta = snapshot.meta
+    _INDEX = DocumentIndex.from_snapshot(snapshot.arrays("documents"), meta["documents"], collection)
+    _KEYWORD_INDEX = BM25Index.from_snapshot(snapshot.arrays("keyword"), meta["keyword"])
+    _VECTOR_INDEX = DenseVectorIndex.from_snapshot(snapshot.arrays("vectors"), meta["vectors"])
+    _BITSET_INDEX = BitsetIndex.from_snapshot(snapshot.arrays("bitsets"), meta["bitsets"])
+    return True
+
+def add_document(document: Dict[str, Any]) -> None:
+    """
+    Adds a document to the collection and indexes it.
+    
+    Args:
+        document (Dict[str, Any]): Document with title, content, category and tags
+    """
+    collection = _collection()
+    # Build the index before appending, or a lazily built index would pick up
+    # the new document from the collection and then index it a second time.
+    index = _index()
+    if isinstance(collection, ColumnarDocumentStore):
+        document = collection.append(document)
+    elif isinstance(collection, list):
+        collection.append(document)
+    else:
+        raise TypeError(f"{type(collection).__name__} collections are read-only")
+    doc_id = index.add(document)
+    if _KEYWORD_INDEX is not None:
+        _KEYWORD_INDEX.add(doc_id, document)
+    if _VECTOR_INDEX is not None:
+        _VECTOR_INDEX.add(doc_id, document)
+    if _DUPLICATE_INDEX is not None:
+        _DUPLICATE_INDEX.add(doc_id, document)
+    if _BITSET_INDEX is not None:
+        _BITSET_INDEX.add(doc_id, document)
+    if _TAG_VOCABULARY is not None:
+        for tag in document["tags"]:
+            _TAG_VOCABULARY.add(tag)
+    if _CATEGORY_VOCABULARY is not None:
+        _CATEGORY_VOCABULARY.add(document["category"])
+    global _FACT_TABLE
+    _FACT_TABLE = None
+
+def remove_document(document: Dict[str, Any]) -> None:
+    """
+    Removes a document from the collection and the index.
+    
+    Columnar stores and corpus files are append-only or read-only, so a removed
+    row stays in storage but is no longer returned by any of the helpers below.
+    
+    Args:
+        document (Dict[str, Any]): A document previously returned by this module
+    """
+    doc_id = _index().remove(document)
+    if _KEYWORD_INDEX is not None:
+        _KEYWORD_INDEX.remove(doc_id, document)
+    if _VECTOR_INDEX is not None:
+        _VECTOR_INDEX.remove(doc_id)
+    if _DUPLICATE_INDEX is not None:
+        _DUPLICATE_INDEX.remove(doc_id)
+    if _BITSET_INDEX is not None:
+        _BITSET_INDEX.remove(doc_id, document)
+    if _TAG_VOCABULARY is not None:
+        for tag in document["tags"]:
+            if not _index().tag_ids(tag):
+                _TAG_VOCABULARY.discard(tag)
+    if _CATEGORY_VOCABULARY is not None and not _index().category_ids(document["category"]):
+        _CATEGORY_VOCABULARY.discard(document["category"])
+    global _FACT_TABLE
+    _FACT_TABLE = None
+    if isinstance(_COLLECTION, list):
+        # list.remove compares by equality and could drop an equal copy;
+        # the index removed this exact object, so the list must too.
+        del _COLLECTION[next(position for position, stored in enumerate(_COLLECTION) if stored is document)]
+
+@_METRICS.instrument()
+def query_documents(
+    category: str = None,
+    all_tags: List[str] = (),
+    any_tags: List[str] = (),
+    none_tags: List[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Retrieves documents matching a combined category and tag filter.
+    
+    Args:
+        category (str): Optional category filter
+        all_tags (List[str]): Tags that must all be present (AND)
+        any_tags (List[str]): Tags of which at least one must be present (OR)
+        none_tags (List[str]): Tags that must not be present (NOT)
+        
+    Returns:
+        List[Dict[str, Any]]: Matching documents in collection order
+    """
+    key = ("query", category, normalize_tags(all_tags), normalize_tags(any_tags), normalize_tags(none_tags))
+    ids = _cached(key, lambda: tuple(_index().search(category, all_tags, any_tags, none_tags)))
+    return _index().documents(ids)
+
+@_METRICS.instrument()
+def filter_documents(expression: str) -> List[Dict[str, Any]]:
+    """
+    Retrieves documents matching a boolean metadata expression, evaluated on
+    per-value bitsets.
+    
+    Values without a prefix are categories; tags use "tag:". For example:
+    '(Finance OR Legal) AND tag:Risk AND NOT tag:Compliance'.
+    
+    Args:
+        expression (str): Expression; see data.boolean_query for the grammar
+        
+    Returns:
+        List[Dict[str, Any]]: Matching documents in collection order
+        
+    Raises:
+        QuerySyntaxError: If the expression is malformed
+    """
+    node = parse_query(expression)
+    ids = _cached(("expression", node), lambda: tuple(BitsetIndex.ids(evaluate(node, _bitset_index())).tolist()))
+    return _index().documents(ids)
+
+@_METRICS.instrument()
+def facet_counts(
+    category: str = None,
+    all_tags: List[str] = (),
+    any_tags: List[str] = (),
+    none_tags: List[str] = (),
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """
+    Counts the documents matching a filter per category and per tag, as shown
+    next to each value in a faceted sidebar.
+    
+    Args:
+        category (str): Optional category filter
+        all_tags (List[str]): Tags that must all be present (AND)
+        any_tags (List[str]): Tags of which at least one must be present (OR)
+        none_tags (List[str]): Tags that must not be present (NOT)
+        top_n (int): Number of values to return per field, or None for all
+        
+    Returns:
+        Dict[str, Any]: "total" matching documents, and "category" and "tags"
+        as (value, count) pairs by descending count
+    """
+    return _bitset_index().facets(category, all_tags, any_tags, none_tags, top_n)
+
+def document_path(document: Dict[str, Any]) -> str:
+    """
+    Returns the stable ZeroEntropy path used to store a document.
+    
+    Documents may carry an explicit "path"; otherwise one is derived from the
+    category and title.
+    
+    Args:
+        document (Dict[str, Any]): Document with title and category
+        
+    Returns:
+        str: Path of the form "category/title-slug.md"
+    """
+    if "path" in document:
+        return document["path"]
+    category = re.sub(r"[^a-z0-9]+", "-", document["category"].lower()).strip("-")
+    title = re.sub(r"[^a-z0-9]+", "-", document["title"].lower()).strip("-")
+    return f"{category}/{title}.md"
+
+def iter_document_paths(documents: Iterable[Dict[str, Any]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Pairs documents with paths that are unique within the collection.
+    
+    Documents whose derived path repeats an earlier one (e.g. revisions that
+    share a title) get a numeric suffix, so paths stay stable as long as the
+    collection order does.
+    
+    Args:
+        documents (Iterable[Dict[str, Any]]): Documents to name (defaults to
+            the active collection)
+        
+    Returns:
+        Iterator[Tuple[str, Dict[str, Any]]]: (path, document) pairs
+    """
+    seen: Dict[str, int] = {}
+    used = set()
+    for document in iter_documents() if documents is None else documents:
+        base = path = document_path(document)
+        repeats = seen.get(base, 0)
+        # A suffixed path can also be derived directly from another title
+        # (e.g. "Report 2"), so keep counting until the path is free.
+        while path in used:
+            repeats += 1
+            stem, dot, extension = base.rpartition(".")
+            path = f"{stem}-{repeats + 1}{dot}{extension}" if dot else f"{base}-{repeats + 1}"
+        seen[base] = repeats
+        used.add(path)
+        yield path, document
+
+@_METRICS.instrument()
+def get_documents_by_category(category: str = None, fuzzy: bool = False) -> List[Dict[str, Any]]:
     """
     Retrieves documents filtered by category.
     
     Args:
         category (str): Optional category filter
+        fuzzy (bool): Match the category ignoring case, spacing and small
+            typos (see find_categories)
         
     Returns:
         List[Dict[str, Any]]: Filtered list of documents
     """
+    if category and fuzzy:
+        categories = _category_vocabulary().resolve(category)
+        ids = sorted(doc_id for name in categories for doc_id in _index().category_ids(name))
+        return _index().documents(ids)
     if category:
-        return [doc for doc in SAMPLE_DOCUMENTS if doc["category"] == category]
-    return SAMPLE_DOCUMENTS
+        return _index().documents(_index().category_ids(category))
+    collection = _collection()
+    if isinstance(collection, list):
+        return collection
+    return list(_index())
 
-def get_documents_by_tags(tags: List[str]) -> List[Dict[str, Any]]:
+@_METRICS.instrument()
+def get_documents_by_tags(tags: List[str], fuzzy: bool = False) -> List[Dict[str, Any]]:
     """
     Retrieves documents filtered by tags.
     
     Args:
         tags (List[str]): List of tags to filter by
+        fuzzy (bool): Match tags ignoring case, spacing and small typos
+            (see find_tags)
         
     Returns:
         List[Dict[str, Any]]: Filtered list of documents
     """
-    return [doc for doc in SAMPLE_DOCUMENTS if any(tag in doc["tags"] for tag in tags)]
+    if fuzzy:
+        tags = [match for tag in tags for match in _tag_vocabulary().resolve(tag)]
+    if not tags:
+        return []
+    ids = _cached(("tags", normalize_tags(tags)), lambda: tuple(_index().search(any_tags=tags)))
+    return _index().documents(ids)
 
+@_METRICS.instrument()
 def get_all_categories() -> List[str]:
     """
     Returns all unique categories in the document collection.
@@ -556,8 +982,9 @@ def get_all_categories() -> List[str]:
     Returns:
         List[str]: List of unique categories
     """
-    return list(set(doc["category"] for doc in SAMPLE_DOCUMENTS))
+    return _index().categories()
 
+@_METRICS.instrument()
 def get_all_tags() -> List[str]:
     """
     Returns all unique tags in the document collection.
@@ -565,7 +992,425 @@ def get_all_tags() -> List[str]:
     Returns:
         List[str]: List of unique tags
     """
-    all_tags = []
-    for doc in SAMPLE_DOCUMENTS:
-        all_tags.extend(doc["tags"])
-    return list(set(all_tags)) 
\ No newline at end of file
+    return _index().tags()
+
+@_METRICS.instrument()
+def find_tags(query: str, max_distance: int = None) -> List[Tuple[str, int]]:
+    """
+    Finds tags close to a possibly misspelled or differently cased query.
+    
+    Args:
+        query (str): Tag to look up, e.g. "risk managment"
+        max_distance (int): Maximum edit distance after case folding and
+            removing spaces and punctuation; defaults to one typo for short
+            tags and two for long ones
+        
+    Returns:
+        List[Tuple[str, int]]: (tag, distance) pairs, closest first
+    """
+    return _tag_vocabulary().search(query, max_distance)
+
+@_METRICS.instrument()
+def find_categories(query: str, max_distance: int = None) -> List[Tuple[str, int]]:
+    """
+    Finds categories close to a possibly misspelled or differently cased query.
+    
+    Args:
+        query (str): Category to look up, e.g. "finace"
+        max_distance (int): Maximum edit distance; see find_tags
+        
+    Returns:
+        List[Tuple[str, int]]: (category, distance) pairs, closest first
+    """
+    return _category_vocabulary().search(query, max_distance)
+
+def _iter_items(
+    predicates: Sequence[Predicate],
+    category: str,
+    all_tags: List[str],
+    any_tags: List[str],
+    none_tags: List[str],
+    after: Optional[int],
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if _INDEX is None and not (category or all_tags or any_tags or none_tags):
+        # The index numbers documents in collection order and is built before
+        # any change to the collection, so until it exists ids are positions
+        # and unfiltered streams read the collection without building it.
+        collection = _collection()
+        for doc_id in range(0 if after is None else after + 1, len(collection)):
+            document = collection[doc_id]
+            if matches(document, predicates):
+                yield doc_id, document
+        return
+    index = _index()
+    for doc_id in index.iter_search(category, all_tags, any_tags, none_tags, after):
+        document = index.get(doc_id)
+        if matches(document, predicates):
+            yield doc_id, document
+
+def iter_documents(
+    *predicates: Predicate,
+    category: str = None,
+    all_tags: List[str] = (),
+    any_tags: List[str] = (),
+    none_tags: List[str] = (),
+    after: int = None,
+    limit: int = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily streams documents matching a filter from the active collection.
+    
+    Category and tag constraints are resolved through the index; without
+    them the collection is read directly, so the index is not built. Predicates
+    are applied to each candidate as it is read, so stopping early skips the
+    rest of the corpus entirely.
+    
+    Args:
+        *predicates (Predicate): Callables that must all accept a document
+            (see data.predicates)
+        category (str): Optional category filter
+        all_tags (List[str]): Tags that must all be present (AND)
+        any_tags (List[str]): Tags of which at least one must be present (OR)
+        none_tags (List[str]): Tags that must not be present (NOT)
+        after (int): Optional cursor from paginate_documents
+        limit (int): Optional maximum number of documents to yield
+        
+    Returns:
+        Iterator[Dict[str, Any]]: Matching documents in collection order
+    """
+    items = _iter_items(predicates, category, all_tags, any_tags, none_tags, after)
+    return (document for _, document in islice(items, limit))
+
+def iter_documents_by_category(category: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming version of get_documents_by_category.
+    
+    Args:
+        category (str): Optional category filter
+        
+    Returns:
+        Iterator[Dict[str, Any]]: Matching documents in collection order
+    """
+    return iter_documents(category=category)
+
+def iter_documents_by_tags(tags: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming version of get_documents_by_tags.
+    
+    Args:
+        tags (List[str]): List of tags to filter by
+        
+    Returns:
+        Iterator[Dict[str, Any]]: Matching documents in collection order
+    """
+    if not tags:
+        return iter(())
+    return iter_documents(any_tags=tags)
+
+@_METRICS.instrument()
+def paginate_documents(
+    *predicates: Predicate,
+    limit: int = 20,
+    after: int = None,
+    category: str = None,
+    all_tags: List[str] = (),
+    any_tags: List[str] = (),
+    none_tags: List[str] = (),
+) -> Dict[str, Any]:
+    """
+    Returns one page of matching documents with a cursor to the next page.
+    
+    Args:
+        *predicates (Predicate): Callables that must all accept a document
+        limit (int): Page size
+        after (int): Cursor returned with the previous page
+        category (str): Optional category filter
+        all_tags (List[str]): Tags that must all be present (AND)
+        any_tags (List[str]): Tags of which at least one must be present (OR)
+        none_tags (List[str]): Tags that must not be present (NOT)
+        
+    Returns:
+        Dict[str, Any]: ``documents`` on this page and ``next_cursor``, which
+        is None once the last page has been returned
+        
+    Raises:
+        ValueError: If limit is less than 1
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    items = _iter_items(predicates, category, all_tags, any_tags, none_tags, after)
+    page = list(islice(items, limit + 1))
+    next_cursor = page[limit - 1][0] if len(page) > limit else None
+    return {"documents": [document for _, document in page[:limit]], "next_cursor": next_cursor}
+
+def _resolve(results: List[Tuple[int, float]]) -> List[Tuple[Dict[str, Any], float]]:
+    documents = _index().documents(doc_id for doc_id, _ in results)
+    return [(document, score) for document, (_, score) in zip(documents, results)]
+
+def _collapse(search: Callable[[int], Sequence[Tuple[int, float]]], k: int) -> List[Tuple[int, float]]:
+    # Keeps the best result of each near-duplicate cluster, searching deeper
+    # until k distinct results are found or the ranking runs out.
+    depth = k
+    while True:
+        results = search(depth)
+        collapsed = list(islice(_duplicate_index().collapse(results), k))
+        if len(collapsed) >= k or len(results) < depth:
+            return collapsed
+        depth *= 4
+
+@_METRICS.instrument()
+def search_documents(
+    query: str,
+    k: int = 10,
+    category: str = None,
+    collapse_duplicates: bool = False,
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Runs a BM25 keyword search over document titles and content.
+    
+    Args:
+        query (str): Free-text query
+        k (int): Number of results to return
+        category (str): Optional category filter applied before scoring
+        collapse_duplicates (bool): Return only the best-ranked document of
+            each near-duplicate cluster
+        
+    Returns:
+        List[Tuple[Dict[str, Any], float]]: (document, score) pairs, best first
+    """
+    def search(depth: int) -> Tuple[Tuple[int, float], ...]:
+        def compute() -> Tuple[Tuple[int, float], ...]:
+            candidates = set(_index().category_ids(category)) if category else None
+            return tuple(_keyword_index().search(query, depth, candidates))
+
+        return _cached(("keyword", normalize_query(query), depth, category), compute)
+
+    return _resolve(_collapse(search, k) if collapse_duplicates else search(k))
+
+@_METRICS.instrument()
+def vector_search_documents(
+    query: str,
+    k: int = 10,
+    category: str = None,
+    collapse_duplicates: bool = False,
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Runs a dense vector search over document titles and content.
+    
+    Args:
+        query (str): Free-text query
+        k (int): Number of results to return
+        category (str): Optional category filter applied before scoring
+        collapse_duplicates (bool): Return only the best-ranked document of
+            each near-duplicate cluster
+        
+    Returns:
+        List[Tuple[Dict[str, Any], float]]: (document, cosine score) pairs, best first
+    """
+    def search(depth: int) -> Tuple[Tuple[int, float], ...]:
+        def compute() -> Tuple[Tuple[int, float], ...]:
+            candidates = _index().category_ids(category) if category else None
+            return tuple(_vector_index().search_batch([query], depth, candidates)[0])
+
+        return _cached(("vector", normalize_query(query), depth, category), compute)
+
+    return _resolve(_collapse(search, k) if collapse_duplicates else search(k))
+
+@_METRICS.instrument()
+def vector_search_batch(queries: List[str], k: int = 10, category: str = None) -> List[List[Tuple[Dict[str, Any], float]]]:
+    """
+    Runs a batch of dense vector searches with a single matrix multiply.
+    
+    Args:
+        queries (List[str]): Free-text queries
+        k (int): Number of results per query
+        category (str): Optional category filter applied before scoring
+        
+    Returns:
+        List[List[Tuple[Dict[str, Any], float]]]: Per query, (document, score) pairs
+    """
+    candidates = _index().category_ids(category) if category else None
+    batches = _vector_index().search_batch(queries, k, candidates)
+    return [_resolve(results) for results in batches]
+
+@_METRICS.instrument()
+def hybrid_search_documents(
+    query: str,
+    k: int = 10,
+    category: str = None,
+    all_tags: List[str] = (),
+    any_tags: List[str] = (),
+    none_tags: List[str] = (),
+    fusion: str = "rrf",
+    collapse_duplicates: bool = False,
+) -> Dict[str, Any]:
+    """
+    Runs keyword and vector search concurrently and fuses the rankings.
+    
+    Args:
+        query (str): Free-text query
+        k (int): Number of results to return
+        category (str): Optional category filter applied before scoring
+        all_tags (List[str]): Tags that must all be present (AND)
+        any_tags (List[str]): Tags of which at least one must be present (OR)
+        none_tags (List[str]): Tags that must not be present (NOT)
+        fusion (str): "rrf" for reciprocal-rank fusion or "weighted" for score fusion
+        collapse_duplicates (bool): Return only the best-ranked document of
+            each near-duplicate cluster
+        
+    Returns:
+        Dict[str, Any]: ``results`` as (document, score) pairs, ``timings``
+        with filter, keyword, vector, fusion and total latency in milliseconds,
+        and ``cached``, which is True when the results came from the query cache
+    """
+    started = time.perf_counter()
+    response: Dict[str, Any] = {}
+
+    def search(depth: int) -> Tuple[Tuple[int, float], ...]:
+        key = (
+            "hybrid", normalize_query(query), depth, category,
+            normalize_tags(all_tags), normalize_tags(any_tags), normalize_tags(none_tags), fusion,
+        )
+        results = _QUERY_CACHE.get(key, _index().version)
+        if results is not None:
+            response["cached"] = True
+            return results
+        response.update(hybrid_search(
+            query, _index(), _keyword_index(), _vector_index(), k=depth, category=category,
+            all_tags=all_tags, any_tags=any_tags, none_tags=none_tags, fusion=fusion,
+        ))
+        response["cached"] = False
+        results = tuple(response["results"])
+        _QUERY_CACHE.put(key, results, _index().version)
+        return results
+
+    results = _collapse(search, k) if collapse_duplicates else search(k)
+    response["results"] = _resolve(results)
+    if response["cached"]:
+        total = (time.perf_counter() - started) * 1000
+        response["timings"] = {"filter": 0.0, "keyword": 0.0, "vector": 0.0, "fusion": 0.0, "total": total}
+    return response
+
+def near_duplicate_clusters() -> List[List[Dict[str, Any]]]:
+    """
+    Groups documents whose content is nearly identical, such as revisions of
+    the same report.
+    
+    Returns:
+        List[List[Dict[str, Any]]]: Clusters of two or more documents, each in
+        collection order with the earliest document first
+    """
+    return [_index().documents(cluster) for cluster in _duplicate_index().clusters()]
+
+def query_facts(
+    kind: str = None,
+    min_value: float = None,
+    max_value: float = None,
+    category: str = None,
+    label: str = None,
+) -> List[Dict[str, Any]]:
+    """
+    Returns numeric facts extracted from document content that match a filter.
+    
+    For example, query_facts("money", min_value=1e6, category="Finance",
+    label="budget") finds budgets over $1M in Finance documents.
+    
+    Args:
+        kind (str): "money", "percent", "duration" or "count"
+        min_value (float): Inclusive lower bound (dollars, percent, days or items)
+        max_value (float): Inclusive upper bound
+        category (str): Optional category filter
+        label (str): Optional case-insensitive substring of the fact label
+        
+    Returns:
+        List[Dict[str, Any]]: Facts with their document, span, value and label
+        
+    Raises:
+        ValueError: If kind is not one of the fact kinds
+    """
+    table = _fact_table()
+    facts = list(table.rows(table.mask(kind, min_value, max_value, category, label)))
+    for fact in facts:
+        fact["document"] = _index().get(fact.pop("doc_id"))
+    return facts
+
+def aggregate_facts(
+    kind: str,
+    by: str = "category",
+    min_value: float = None,
+    max_value: float = None,
+    category: str = None,
+    label: str = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregates numeric facts of one kind per category or per label.
+    
+    Args:
+        kind (str): "money", "percent", "duration" or "count"
+        by (str): "category" or "label"
+        min_value (float): Inclusive lower bound
+        max_value (float): Inclusive upper bound
+        category (str): Optional category filter
+        label (str): Optional case-insensitive substring of the fact label
+        
+    Returns:
+        Dict[str, Dict[str, float]]: count, sum, mean, min and max per group
+        
+    Raises:
+        ValueError: If kind is not one of the fact kinds
+    """
+    table = _fact_table()
+    return table.aggregate(table.mask(kind, min_value, max_value, category, label), by)
+
+def query_cache_stats() -> Dict[str, Any]:
+    """
+    Returns hit, miss, eviction and size counters of the query cache.
+    
+    Returns:
+        Dict[str, Any]: Counters from QueryCache.stats
+    """
+    return _QUERY_CACHE.stats()
+
+def configure_query_cache(max_entries: int = 1024, max_bytes: int = 64 * 2**20, ttl: Optional[float] = 300.0) -> None:
+    """
+    Replaces the query cache with an empty one using new limits.
+    
+    Args:
+        max_entries (int): Maximum number of cached queries; 0 disables caching
+        max_bytes (int): Maximum approximate size of cached keys and results
+        ttl (float): Seconds an entry stays valid, or None for no expiry
+    """
+    global _QUERY_CACHE
+    _QUERY_CACHE = QueryCache(max_entries, max_bytes, ttl)
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """
+    Returns call counts, throughput, latency and result-size percentiles of
+    the instrumented functions.
+    
+    Returns:
+        Dict[str, Any]: Snapshot from MetricsRegistry.snapshot
+    """
+    return _METRICS.snapshot()
+
+def metrics_prometheus() -> str:
+    """
+    Returns the instrumentation metrics in the Prometheus text format, for
+    serving from a /metrics endpoint.
+    
+    Returns:
+        str: Exposition text
+    """
+    return _METRICS.prometheus_text()
+
+def configure_metrics(enabled: bool = True, reset: bool = False) -> None:
+    """
+    Switches instrumentation on or off.
+    
+    Args:
+        enabled (bool): Whether calls are recorded
+        reset (bool): Discard everything recorded so far
+    """
+    _METRICS.enabled = enabled
+    if reset:
+        _METRICS.reset()
@@ -0,0 +1,236 @@
+"""
+Sharded Search Module
+
+This module partitions a collection into contiguous shards, each served by a
+dedicated worker process that builds and holds its own metadata and BM25
+indexes. Queries are scattered to every shard at once, category and tag
+filters are evaluated inside the shards, and the per-shard top-k lists are
+merged with a heap.
+
+Document frequencies and lengths are summed across shards once the shards are
+built and sent back to every worker, so shard scores are computed against the
+whole collection and merged results match an unsharded index exactly.
+
+Document ids are positions in the source collection, so results can be
+resolved against the same corpus file or sequence.
+"""
+
+import heapq
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .document_index import DocumentIndex
+from .keyword_search import BM25Index
+from .mmap_corpus import MmapCorpus
+
+
+def _shard_documents(source: Union[str, Sequence[Mapping[str, Any]]], start: int, end: int) -> Iterable[Mapping[str, Any]]:
+    if isinstance(source, str):
+        corpus = MmapCorpus(source)
+        return (corpus.decode(row) for row in range(start, end))
+    return (source[row] for row in range(start, end))
+
+
+def _search_shard(
+    index: DocumentIndex,
+    keyword_index: BM25Index,
+    start: int,
+    queries: Sequence[str],
+    k: int,
+    filters: Tuple[Optional[str], Sequence[str], Sequence[str], Sequence[str]],
+) -> List[List[Tuple[int, float]]]:
+    category, all_tags, any_tags, none_tags = filters
+    candidates = None
+    if category or all_tags or any_tags or none_tags:
+        candidates = set(index.search(category, all_tags, any_tags, none_tags))
+    return [
+        [(start + doc_id, score) for doc_id, score in keyword_index.search(query, k, candidates)]
+        for query in queries
+    ]
+
+
+def _serve(connection: Connection, source: Union[str, Sequence[Mapping[str, Any]]], start: int, end: int) -> None:
+    # Worker loop: build the shard, report its statistics, then answer
+    # requests until told to stop. Local ids are offsets from ``start``.
+    index = DocumentIndex()
+    keyword_index = BM25Index()
+    for document in _shard_documents(source, start, end):
+        keyword_index.add(index.add(document), document)
+    connection.send(keyword_index.statistics())
+    try:
+        while True:
+            request = connection.recv()
+            command = request[0]
+            if command == "statistics":
+                keyword_index.use_global_statistics(*request[1:])
+                connection.send(None)
+            elif command == "search":
+                connection.send(_search_shard(index, keyword_index, start, *request[1:]))
+            elif command == "filter":
+                connection.send([start + doc_id for doc_id in index.search(*request[1:])])
+            else:
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        connection.close()
+
+
+class ShardedSearch:
+    """
+    Scatter-gather keyword search over a collection split across processes.
+    """
+
+    def __init__(self, source: Union[str, Sequence[Mapping[str, Any]]], shards: Optional[int] = None):
+        """
+        Starts one worker per shard and waits for every shard to be built.
+
+        Args:
+            source (Union[str, Sequence[Mapping[str, Any]]]): Corpus file
+                written by data.mmap_corpus, or a sequence of documents
+            shards (int): Number of shards and worker processes (defaults to
+                the CPU count)
+        """
+        self.source = MmapCorpus(source) if isinstance(source, str) else source
+        size = len(self.source)
+        shards = max(1, min(shards or os.cpu_count() or 1, size or 1))
+        bounds = [size * shard // shards for shard in range(shards + 1)]
+        context = multiprocessing.get_context()
+        self._connections: List[Connection] = []
+        self._processes = []
+        for start, end in zip(bounds, bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child, source, start, end), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+        count, total_length, frequencies = 0, 0, {}
+        for connection in self._connections:
+            shard_count, shard_length, shard_frequencies = connection.recv()
+            count += shard_count
+            total_length += shard_length
+            for term, frequency in shard_frequencies.items():
+                frequencies[term] = frequencies.get(term, 0) + frequency
+        self._scatter(("statistics", count, total_length, frequencies))
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    @property
+    def shards(self) -> int:
+        """Number of shards."""
+        return len(self._connections)
+
+    def __enter__(self) -> "ShardedSearch":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _scatter(self, request: Tuple[Any, ...]) -> List[Any]:
+        for connection in self._connections:
+            connection.send(request)
+        return [connection.recv() for connection in self._connections]
+
+    def search_batch(
+        self,
+        queries: Sequence[str],
+        k: int = 10,
+        category: str = None,
+        all_tags: Sequence[str] = (),
+        any_tags: Sequence[str] = (),
+        none_tags: Sequence[str] = (),
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Runs a batch of BM25 queries on every shard in parallel.
+
+        Args:
+            queries (Sequence[str]): Free-text queries
+            k (int): Number of results per query
+            category (str): Optional category filter, applied inside each shard
+            all_tags (Sequence[str]): Tags that must all be present (AND)
+            any_tags (Sequence[str]): Tags of which at least one must be present (OR)
+            none_tags (Sequence[str]): Tags that must not be present (NOT)
+
+        Returns:
+            List[List[Tuple[int, float]]]: Per query, (document id, score)
+            pairs, best first
+        """
+        filters = (category, list(all_tags), list(any_tags), list(none_tags))
+        replies = self._scatter(("search", list(queries), k, filters))
+        merged = []
+        for position in range(len(queries)):
+            # Same ordering as BM25Index.search: score descending, then id.
+            candidates = (
+                (-score, doc_id) for shard_results in replies for doc_id, score in shard_results[position]
+            )
+            merged.append([(doc_id, -negative) for negative, doc_id in heapq.nsmallest(k, candidates)])
+        return merged
+
+    def search(self, query: str, k: int = 10, **filters: Any) -> List[Tuple[int, float]]:
+        """
+        Runs a single BM25 query; see ``search_batch``.
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of results to return
+            **filters (Any): category, all_tags, any_tags and none_tags
+
+        Returns:
+            List[Tuple[int, float]]: (document id, score) pairs, best first
+        """
+        return self.search_batch([query], k, **filters)[0]
+
+    def query_ids(
+        self,
+        category: str = None,
+        all_tags: Sequence[str] = (),
+        any_tags: Sequence[str] = (),
+        none_tags: Sequence[str] = (),
+    ) -> List[int]:
+        """
+        Evaluates a metadata filter on every shard.
+
+        Args:
+            category (str): Optional category filter
+            all_tags (Sequence[str]): Tags that must all be present (AND)
+            any_tags (Sequence[str]): Tags of which at least one must be present (OR)
+            none_tags (Sequence[str]): Tags that must not be present (NOT)
+
+        Returns:
+            List[int]: Matching document ids in collection order
+        """
+        replies = self._scatter(("filter", category, list(all_tags), list(any_tags), list(none_tags)))
+        # Shards are contiguous ranges, so concatenating keeps ids sorted.
+        return [doc_id for ids in replies for doc_id in ids]
+
+    def resolve(self, results: Iterable[Tuple[int, float]]) -> List[Tuple[Mapping[str, Any], float]]:
+        """
+        Looks up the documents of (id, score) results.
+
+        Args:
+            results (Iterable[Tuple[int, float]]): Results from ``search``
+
+        Returns:
+            List[Tuple[Mapping[str, Any], float]]: (document, score) pairs
+        """
+        return [(self.source[doc_id], score) for doc_id, score in results]
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        for connection in self._connections:
+            try:
+                connection.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
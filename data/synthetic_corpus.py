@@ -0,0 +1,286 @@
+"""
+Synthetic Corpus Module
+
+This module generates large, reproducible document collections with the same
+schema and statistics as SAMPLE_DOCUMENTS for scale and load testing. A
+profile learned from the sample documents captures the category distribution,
+tags per category and tag counts, content lengths, a word-level Markov chain
+over content, and the style of numeric facts (money, percentages, multiples
+and plain numbers).
+
+Generation is split into fixed-size chunks, each seeded from the corpus seed
+and the chunk number, so the output is identical for any number of workers.
+Chunks are encoded in a process pool and streamed to disk in order.
+
+Usage:
+    python -m data.synthetic_corpus OUTPUT --count 1000000 [--seed 0] [--workers N] [--format corpus|jsonl]
+"""
+
+import argparse
+import bisect
+import os
+import random
+import re
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .mmap_corpus import encode_document, write_corpus_lines
+from .sample_documents import SAMPLE_DOCUMENTS
+
+CHUNK_SIZE = 10_000
+
+_FACT_PATTERNS = (
+    ("money", re.compile(r"\$(\d+(?:\.\d+)?)([KMB]?)")),
+    ("percent", re.compile(r"(\d+(?:\.\d+)?)%")),
+    ("multiple", re.compile(r"(\d+(?:\.\d+)?)x")),
+    ("number", re.compile(r"(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)")),
+)
+_TOKEN_PATTERN = re.compile(r"^(\W*?)(\$?\d[\d,.]*[KMB%x]?)(\W*)$")
+_TITLE_SUFFIXES = ("", "", "", " 2024", " 2025", " Q1", " Q2", " Q3", " Q4", " Update", " Review")
+
+
+class CorpusProfile:
+    """
+    Statistics of a document collection used to generate look-alike documents.
+    """
+
+    def __init__(self, documents: Iterable[Mapping[str, Any]]):
+        categories: Dict[str, int] = {}
+        self.titles: Dict[str, List[str]] = {}
+        self.tags: Dict[str, List[str]] = {}
+        self.tag_counts: List[int] = []
+        self.content_lengths: List[int] = []
+        self.facts: Dict[str, List[str]] = {kind: [] for kind, _ in _FACT_PATTERNS}
+        self.transitions: Dict[str, List[str]] = {}
+        self.starts: List[str] = []
+
+        for document in documents:
+            category = document["category"]
+            categories[category] = categories.get(category, 0) + 1
+            self.titles.setdefault(category, []).append(document["title"])
+            pool = self.tags.setdefault(category, [])
+            pool.extend(tag for tag in document["tags"] if tag not in pool)
+            self.tag_counts.append(len(document["tags"]))
+            words = [self._abstract(word) for word in document["content"].split()]
+            self.content_lengths.append(len(words))
+            if words:
+                self.starts.append(words[0])
+            for current, following in zip(words, words[1:]):
+                self.transitions.setdefault(current, []).append(following)
+
+        self.categories = list(categories)
+        self._category_weights = list(_cumulative(categories.values()))
+        for kind, values in self.facts.items():
+            if not values:
+                values.append("10" if kind != "money" else "1")
+
+    def _abstract(self, word: str) -> str:
+        """Replaces a numeric fact in a word with a ``<kind>`` placeholder."""
+        match = _TOKEN_PATTERN.match(word)
+        if not match:
+            return word
+        prefix, fact, suffix = match.groups()
+        for kind, pattern in _FACT_PATTERNS:
+            fact_match = pattern.fullmatch(fact)
+            if fact_match:
+                self.facts[kind].append(fact_match.group(1))
+                return f"{prefix}<{kind}>{fact_match.group(2) if kind == 'money' else ''}{suffix}"
+        return word
+
+    def sample_category(self, rng: random.Random) -> str:
+        """Samples a category with the observed frequencies."""
+        point = rng.random() * self._category_weights[-1]
+        return self.categories[bisect.bisect_right(self._category_weights, point)]
+
+
+def _cumulative(values: Iterable[int]) -> Iterator[int]:
+    total = 0
+    for value in values:
+        total += value
+        yield total
+
+
+def _fact(kind: str, profile: CorpusProfile, rng: random.Random) -> str:
+    observed = rng.choice(profile.facts[kind])
+    decimals = len(observed.split(".")[1]) if "." in observed else 0
+    value = float(observed.replace(",", "")) * rng.uniform(0.5, 1.5)
+    if kind == "percent":
+        value = min(value, 99.0)
+    if "," in observed:
+        return f"{round(value):,}"
+    return f"{value:.{decimals}f}" if decimals else str(max(1, round(value)))
+
+
+def _fill(word: str, profile: CorpusProfile, rng: random.Random) -> str:
+    if "<" not in word:
+        return word
+    for kind, _ in _FACT_PATTERNS:
+        placeholder = f"<{kind}>"
+        if placeholder in word:
+            value = _fact(kind, profile, rng)
+            if kind == "money":
+                value = "$" + value
+            elif kind == "percent":
+                value += "%"
+            elif kind == "multiple":
+                value += "x"
+            return word.replace(placeholder, value, 1)
+    return word
+
+
+def _content(profile: CorpusProfile, rng: random.Random) -> str:
+    target = max(10, round(rng.choice(profile.content_lengths) * rng.uniform(0.8, 1.2)))
+    word = rng.choice(profile.starts)
+    words = [word]
+    # Keep walking past the target length until a sentence ends, within reason.
+    while len(words) < target or (not word.endswith(".") and len(words) < target + 25):
+        followers = profile.transitions.get(word)
+        word = rng.choice(followers) if followers else rng.choice(profile.starts)
+        words.append(word)
+    # Greedy wrap at 70 columns, indented like the hand-written sample content.
+    lines, line, width = [], [], 0
+    for word in words:
+        word = _fill(word, profile, rng)
+        if line and width + 1 + len(word) > 70:
+            lines.append(" ".join(line))
+            line, width = [], -1
+        line.append(word)
+        width += 1 + len(word)
+    lines.append(" ".join(line))
+    return "\n        " + " \n        ".join(lines) + "\n        "
+
+
+def generate_document(profile: CorpusProfile, rng: random.Random) -> Dict[str, Any]:
+    """
+    Generates one document from a profile.
+
+    Args:
+        profile (CorpusProfile): Statistics to imitate
+        rng (random.Random): Source of randomness
+
+    Returns:
+        Dict[str, Any]: Document with title, content, category and tags
+    """
+    category = profile.sample_category(rng)
+    pool = profile.tags[category]
+    tag_count = min(rng.choice(profile.tag_counts), len(pool))
+    return {
+        "title": rng.choice(profile.titles[category]) + rng.choice(_TITLE_SUFFIXES),
+        "content": _content(profile, rng),
+        "category": category,
+        "tags": rng.sample(pool, tag_count),
+    }
+
+
+_PROFILE: Optional[CorpusProfile] = None
+
+
+def default_profile() -> CorpusProfile:
+    """
+    Returns the profile learned from SAMPLE_DOCUMENTS, computed once per process.
+
+    Returns:
+        CorpusProfile: The sample collection profile
+    """
+    global _PROFILE
+    if _PROFILE is None:
+        _PROFILE = CorpusProfile(SAMPLE_DOCUMENTS)
+    return _PROFILE
+
+
+def _chunk_rng(seed: int, chunk: int) -> random.Random:
+    return random.Random(f"{seed}:{chunk}")
+
+
+def generate_documents(count: int, seed: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily generates documents in a single process.
+
+    Args:
+        count (int): Number of documents
+        seed (int): Corpus seed
+        chunk_size (int): Documents per seeded chunk; must match across runs to
+            reproduce a corpus
+
+    Returns:
+        Iterator[Dict[str, Any]]: Generated documents
+    """
+    profile = default_profile()
+    for chunk in range((count + chunk_size - 1) // chunk_size):
+        rng = _chunk_rng(seed, chunk)
+        for _ in range(min(chunk_size, count - chunk * chunk_size)):
+            yield generate_document(profile, rng)
+
+
+def _encode_chunk(task: Tuple[int, int, int]) -> bytes:
+    seed, chunk, size = task
+    profile = default_profile()
+    rng = _chunk_rng(seed, chunk)
+    return b"".join(encode_document(generate_document(profile, rng)) for _ in range(size))
+
+
+def _iter_chunk_lines(count: int, seed: int, workers: int, chunk_size: int) -> Iterator[bytes]:
+    tasks = [
+        (seed, chunk, min(chunk_size, count - chunk * chunk_size))
+        for chunk in range((count + chunk_size - 1) // chunk_size)
+    ]
+    if workers <= 1:
+        encoded = map(_encode_chunk, tasks)
+        for block in encoded:
+            yield from block.splitlines(keepends=True)
+        return
+    with Pool(workers) as pool:
+        for block in pool.imap(_encode_chunk, tasks):
+            yield from block.splitlines(keepends=True)
+
+
+def generate_corpus(
+    path: str,
+    count: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    format: str = "corpus",
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Generates a corpus in parallel and streams it to disk.
+
+    Args:
+        path (str): Output file path
+        count (int): Number of documents
+        seed (int): Corpus seed
+        workers (int): Worker processes (defaults to the CPU count)
+        format (str): "corpus" for a memory-mappable corpus file or "jsonl"
+        chunk_size (int): Documents per seeded chunk
+
+    Returns:
+        int: Number of documents written
+    """
+    if format not in ("corpus", "jsonl"):
+        raise ValueError(f"Unknown output format {format!r}")
+    lines = _iter_chunk_lines(count, seed, workers or os.cpu_count() or 1, chunk_size)
+    if format == "corpus":
+        return write_corpus_lines(lines, path)
+    written = 0
+    with open(path, "wb") as handle:
+        for line in lines:
+            handle.write(line)
+            written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic document corpus.")
+    parser.add_argument("output")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=("corpus", "jsonl"), default="corpus")
+    args = parser.parse_args()
+
+    written = generate_corpus(args.output, args.count, args.seed, args.workers, args.format)
+    print(f"Wrote {written} documents to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Vector Search Module
+
+This module implements an offline dense retrieval index over document titles
+and content. Documents are embedded with signed feature hashing and TF-IDF
+weighting, stored in one contiguous float32 matrix, and scored with a single
+matrix multiply so that whole batches of queries are answered in one call.
+"""
+
+import math
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .keyword_search import tokenize
+
+
+class HashingVectorizer:
+    """
+    Maps text to fixed-width vectors by hashing tokens into signed buckets.
+
+    Buckets come from CRC32 rather than ``hash()`` so vectors are identical
+    across processes regardless of ``PYTHONHASHSEED``.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.idf = np.ones(dim, dtype=np.float32)
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            digest = zlib.crc32(token.encode("utf-8"))
+            bucket = self._buckets[token] = (digest % self.dim, 1.0 if digest >> 31 else -1.0)
+        return bucket
+
+    def _features(self, text: str) -> Tuple[List[int], List[float]]:
+        indices, values = [], []
+        for token, count in Counter(tokenize(text)).items():
+            index, sign = self._bucket(token)
+            indices.append(index)
+            values.append(sign * (1.0 + math.log(count)))
+        return indices, values
+
+    def fit(self, texts: Iterable[str]) -> "HashingVectorizer":
+        """
+        Learns per-bucket inverse document frequencies from a corpus.
+
+        Args:
+            texts (Iterable[str]): Document texts
+
+        Returns:
+            HashingVectorizer: This vectorizer
+        """
+        document_frequency = np.zeros(self.dim, dtype=np.int64)
+        count = 0
+        for text in texts:
+            indices, _ = self._features(text)
+            document_frequency[np.unique(np.asarray(indices, dtype=np.int64))] += 1
+            count += 1
+        self.idf = (np.log((1 + count) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embeds texts as L2-normalised TF-IDF vectors.
+
+        Args:
+            texts (Sequence[str]): Texts to embed
+
+        Returns:
+            np.ndarray: A (len(texts), dim) float32 matrix
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices, values = self._features(text)
+            np.add.at(matrix[row], indices, values)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+def document_text(document: Mapping[str, Any]) -> str:
+    """
+    Returns the text embedded for a document.
+
+    Args:
+        document (Mapping[str, Any]): Document with ``title`` and ``content`` fields
+
+    Returns:
+        str: Title and content joined together
+    """
+    return f"{document['title']}\n{document['content']}"
+
+
+class DenseVectorIndex:
+    """
+    Dense vector index backed by one contiguous float32 matrix.
+
+    Rows are appended into spare capacity that doubles when exhausted; removed
+    documents leave a dead row behind that is masked out at query time. IDF
+    weights are fixed when the index is built, so documents added afterwards
+    are embedded with the corpus statistics from build time.
+    """
+
+    def __init__(self, vectorizer: Optional[HashingVectorizer] = None):
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self._matrix = np.zeros((0, self.vectorizer.dim), dtype=np.float32)
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        # Row of every live document id; built on first use for snapshot-loaded
+        # indexes, so opening a snapshot does not touch every row.
+        self._row_map: Optional[Dict[int, int]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        if self._row_map is None:
+            return int(np.count_nonzero(self._alive[:self._size]))
+        return len(self._row_map)
+
+    @property
+    def _rows(self) -> Dict[int, int]:
+        if self._row_map is None:
+            live = np.flatnonzero(self._alive[:self._size])
+            self._row_map = dict(zip(self._doc_ids[live].tolist(), live.tolist()))
+        return self._row_map
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: Iterable[Tuple[int, Mapping[str, Any]]],
+        dim: int = 512,
+    ) -> "DenseVectorIndex":
+        """
+        Fits a vectorizer on a corpus and embeds every document.
+
+        Args:
+            documents (Iterable[Tuple[int, Mapping[str, Any]]]): Documents with their ids
+            dim (int): Embedding width
+
+        Returns:
+            DenseVectorIndex: The populated index
+        """
+        documents = list(documents)
+        texts = [document_text(document) for _, document in documents]
+        index = cls(HashingVectorizer(dim).fit(texts))
+        index._append([doc_id for doc_id, _ in documents], index.vectorizer.transform(texts))
+        return index
+
+    def _append(self, doc_ids: Sequence[int], vectors: np.ndarray) -> None:
+        needed = self._size + len(doc_ids)
+        if needed > len(self._matrix):
+            capacity = max(needed, 2 * len(self._matrix))
+            matrix = np.zeros((capacity, self.vectorizer.dim), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            self._matrix = matrix
+            self._doc_ids = np.resize(self._doc_ids, capacity)
+            self._alive = np.resize(self._alive, capacity)
+        rows = slice(self._size, needed)
+        self._matrix[rows] = vectors
+        self._doc_ids[rows] = doc_ids
+        self._alive[rows] = True
+        for row, doc_id in enumerate(doc_ids, self._size):
+            self._rows[doc_id] = row
+        self._size = needed
+
+    def add(self, doc_id: int, document: Mapping[str, Any]) -> None:
+        """
+        Embeds and appends a document.
+
+        Args:
+            doc_id (int): Caller-assigned document id
+            document (Mapping[str, Any]): Document with ``title`` and ``content`` fields
+        """
+        self._append([doc_id], self.vectorizer.transform([document_text(document)]))
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Removes a document from the index.
+
+        Args:
+            doc_id (int): Id the document was added under
+        """
+        row = self._rows.pop(doc_id)
+        self._alive[row] = False
+        self._matrix[row] = 0.0
+
+    def _mask(self, candidates: Optional[Iterable[int]]) -> np.ndarray:
+        alive = self._alive[:self._size]
+        if candidates is None:
+            return alive
+        mask = np.zeros(self._size, dtype=bool)
+        rows = [self._rows[doc_id] for doc_id in candidates if doc_id in self._rows]
+        mask[rows] = True
+        return mask
+
+    def search_batch(
+        self,
+        queries: Sequence[str],
+        k: int = 10,
+        candidates: Optional[Iterable[int]] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Scores a batch of queries with one matrix multiply.
+
+        Args:
+            queries (Sequence[str]): Free-text queries
+            k (int): Number of results per query
+            candidates (Iterable[int]): Optional ids to restrict scoring to
+
+        Returns:
+            List[List[Tuple[int, float]]]: Per query, (document id, cosine score)
+            pairs with a positive score, best first
+        """
+        if not queries:
+            return []
+        mask = self._mask(candidates)
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return [[] for _ in queries]
+        scores = self.vectorizer.transform(queries) @ self._matrix[:self._size].T
+        scores[:, ~mask] = -np.inf
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        # Order each row by descending score, then by ascending row for ties.
+        order = np.lexsort((top, -top_scores), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        doc_ids = self._doc_ids[top]
+        return [
+            [(int(doc_id), float(score)) for doc_id, score in zip(row_ids, row_scores) if score > 0]
+            for row_ids, row_scores in zip(doc_ids, top_scores)
+        ]
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        candidates: Optional[Iterable[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Scores a single query.
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of results to return
+            candidates (Iterable[int]): Optional ids to restrict scoring to
+
+        Returns:
+            List[Tuple[int, float]]: (document id, cosine score) pairs, best first
+        """
+        return self.search_batch([query], k, candidates)[0]
+
+    def snapshot_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Returns the state to store in an index snapshot.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], Dict[str, Any]]: Arrays and metadata
+            accepted by ``from_snapshot``
+        """
+        arrays = {
+            "matrix": self._matrix[:self._size],
+            "doc_ids": self._doc_ids[:self._size],
+            "alive": self._alive[:self._size],
+            "idf": self.vectorizer.idf,
+        }
+        return arrays, {"dim": self.vectorizer.dim}
+
+    @classmethod
+    def from_snapshot(cls, arrays: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> "DenseVectorIndex":
+        """
+        Restores an index from snapshot arrays without copying them.
+
+        Args:
+            arrays (Mapping[str, np.ndarray]): Arrays from ``snapshot_arrays``
+            meta (Mapping[str, Any]): Metadata from ``snapshot_arrays``
+
+        Returns:
+            DenseVectorIndex: The index, backed by the given arrays
+        """
+        vectorizer = HashingVectorizer(meta["dim"])
+        vectorizer.idf = arrays["idf"]
+        index = cls(vectorizer)
+        index._matrix = arrays["matrix"]
+        index._doc_ids = arrays["doc_ids"]
+        index._alive = arrays["alive"]
+        index._size = len(index._matrix)
+        index._row_map = None
+        return index
@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the data package tests.
+"""
+
+import copy
+
+import pytest
+
+from data import sample_documents as corpus
+
+
+@pytest.fixture(autouse=True)
+def sample_collection():
+    """
+    Makes a private copy of SAMPLE_DOCUMENTS the active collection, so tests
+    that add or remove documents never touch the module's own list.
+    """
+    documents = copy.deepcopy(corpus.SAMPLE_DOCUMENTS)
+    corpus.load_collection(documents)
+    yield documents
+    corpus.load_collection(corpus.SAMPLE_DOCUMENTS)
@@ -0,0 +1,114 @@
+"""
+Tests for the bitset filter and facet index.
+"""
+
+import importlib
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from data import bitset_index
+from data import sample_documents as corpus
+from data.bitset_index import BitsetIndex
+
+CATEGORIES = ["Finance", "Legal", "Retail", "R&D"]
+TAGS = [f"tag{i}" for i in range(12)]
+
+
+def _document(rng):
+    return {"category": rng.choice(CATEGORIES), "tags": rng.sample(TAGS, rng.randint(0, 4))}
+
+
+def _brute_force(documents, category=None, all_tags=(), any_tags=(), none_tags=()):
+    matching = [
+        document for document in documents.values()
+        if (not category or document["category"] == category)
+        and all(tag in document["tags"] for tag in all_tags)
+        and (not any_tags or any(tag in document["tags"] for tag in any_tags))
+        and not any(tag in document["tags"] for tag in none_tags)
+    ]
+    categories = Counter(document["category"] for document in matching)
+    tags = Counter(tag for document in matching for tag in document["tags"])
+    return {
+        "total": len(matching),
+        "category": sorted(categories.items(), key=lambda facet: (-facet[1], facet[0])),
+        "tags": sorted(tags.items(), key=lambda facet: (-facet[1], facet[0])),
+    }
+
+
+FILTERS = [
+    {},
+    {"category": "Legal"},
+    {"all_tags": ["tag1"]},
+    {"any_tags": ["tag2"]},
+    {"any_tags": ["tag3", "tag4"]},
+    {"category": "Retail", "all_tags": ["tag5"]},
+    {"all_tags": ["tag6", "tag7"], "none_tags": ["tag8"]},
+    {"none_tags": ["tag0"]},
+    {"category": "Unknown"},
+    {"all_tags": ["unknown"]},
+]
+
+
+def test_facets_match_brute_force_after_removals():
+    rng = random.Random(11)
+    index = BitsetIndex(max_pair_rows=4)
+    live = {}
+    next_id = 0
+    for step in range(900):
+        if live and rng.random() < 0.3:
+            doc_id = rng.choice(sorted(live))
+            index.remove(doc_id, live.pop(doc_id))
+        else:
+            live[next_id] = _document(rng)
+            index.add(next_id, live[next_id])
+            next_id += 1
+        if step % 150 == 0 or step == 899:
+            for filters in FILTERS:
+                assert index.facets(**filters) == _brute_force(live, **filters), filters
+    for filters in FILTERS:
+        bits = index.filter_bits(**filters)
+        expected = _brute_force(live, **filters)["total"]
+        assert index.count(bits) == len(index.ids(bits)) == expected
+
+
+def test_built_index_matches_incremental_adds():
+    rng = random.Random(12)
+    documents = {doc_id: _document(rng) for doc_id in range(300)}
+    built = BitsetIndex.from_documents(documents.items())
+    incremental = BitsetIndex()
+    for doc_id, document in documents.items():
+        incremental.add(doc_id, document)
+
+    for filters in FILTERS:
+        assert built.facets(**filters) == incremental.facets(**filters) == _brute_force(documents, **filters)
+    assert built.facets(top_n=2)["tags"] == _brute_force(documents)["tags"][:2]
+
+
+def test_corpus_facets_follow_collection_changes(sample_collection):
+    documents = dict(enumerate(sample_collection))
+    corpus.remove_document(sample_collection[3])
+    del documents[3]
+    tag = sample_collection[0]["tags"][0]
+
+    assert corpus.facet_counts(top_n=None) == _brute_force(documents)
+    assert corpus.facet_counts(all_tags=[tag], top_n=None) == _brute_force(documents, all_tags=[tag])
+
+
+@pytest.fixture
+def without_bitwise_count(monkeypatch):
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    yield importlib.reload(bitset_index)
+    monkeypatch.undo()
+    importlib.reload(bitset_index)
+
+
+def test_popcount_fallback_for_older_numpy(without_bitwise_count):
+    words = np.random.default_rng(0).integers(0, 2**63, size=(3, 50), dtype=np.uint64) | np.uint64(2**63)
+
+    counts = without_bitwise_count._popcount(words)
+
+    assert without_bitwise_count._popcount is not getattr(np, "bitwise_count", None)
+    assert counts.tolist() == [[bin(int(word)).count("1") for word in row] for row in words]
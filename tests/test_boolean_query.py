@@ -0,0 +1,79 @@
+"""
+Tests for boolean metadata expressions.
+"""
+
+import random
+
+import pytest
+
+from data import sample_documents as corpus
+from data.bitset_index import BitsetIndex
+from data.boolean_query import QuerySyntaxError, evaluate, parse_query, to_predicate, tokenize_query
+
+
+def test_parses_precedence_prefixes_and_quotes():
+    node = parse_query('(Finance OR cat:Legal) tag:"Risk Management" AND NOT tags:Compliance')
+
+    assert node == ("and", (
+        ("or", (("category", "Finance"), ("category", "Legal"))),
+        ("tag", "Risk Management"),
+        ("not", ("tag", "Compliance")),
+    ))
+    assert parse_query("a or b AND c") == ("or", (("category", "a"), ("and", (("category", "b"), ("category", "c")))))
+    assert parse_query('"R&D (Labs)"') == ("category", "R&D (Labs)")
+    assert tokenize_query('tag:"a \\" b"')[0] == ("value", 'tag:a " b', 0)
+
+
+@pytest.mark.parametrize("text, message, position", [
+    ("", "unexpected end of expression", 0),
+    ("Finance AND", "unexpected end of expression", 11),
+    ("NOT", "unexpected end of expression", 3),
+    ("(Finance", "expected ')'", 8),
+    ("Finance)", "unexpected token", 7),
+    ("OR Legal", "expected a value, NOT or '('", 0),
+    ("Finance AND AND Legal", "expected a value, NOT or '('", 12),
+    ('tag:"Risk', "unterminated quote", 4),
+    ('"Risk', "unterminated quote", 0),
+    ("tag:", "missing value after 'tag:'", 0),
+])
+def test_malformed_expressions_report_the_position(text, message, position):
+    with pytest.raises(QuerySyntaxError) as raised:
+        parse_query(text)
+
+    assert raised.value.position == position
+    assert str(raised.value) == f"{message} at position {position}"
+    assert isinstance(raised.value, ValueError)
+
+
+def test_bitset_evaluation_matches_the_predicates():
+    rng = random.Random(4)
+    categories, tags = ["Finance", "Legal", "Retail"], ["Risk", "AI", "ROI", "Cloud"]
+    documents = {
+        doc_id: {"category": rng.choice(categories), "tags": rng.sample(tags, rng.randint(0, 3))}
+        for doc_id in range(200)
+    }
+    index = BitsetIndex.from_documents(documents.items())
+    for doc_id in range(0, 200, 7):
+        index.remove(doc_id, documents.pop(doc_id))
+
+    for text in [
+        "Finance",
+        "NOT tag:Risk",
+        "(Finance OR Legal) AND tag:Risk AND NOT tag:AI",
+        "tag:ROI OR NOT (Retail tag:Cloud)",
+        "NOT Finance NOT tag:AI",
+        "Unknown OR tag:Unknown",
+    ]:
+        node = parse_query(text)
+        predicate = to_predicate(node)
+        expected = [doc_id for doc_id, document in documents.items() if predicate(document)]
+        assert BitsetIndex.ids(evaluate(node, index)).tolist() == expected, text
+
+
+def test_filter_documents_on_the_collection(sample_collection):
+    expression = "(Finance OR Technology) AND NOT tag:Compliance"
+    predicate = to_predicate(parse_query(expression))
+
+    assert corpus.filter_documents(expression) == [document for document in sample_collection if predicate(document)]
+    with pytest.raises(QuerySyntaxError):
+        corpus.filter_documents("Finance AND (")
@@ -0,0 +1,52 @@
+"""
+Tests for passage chunking.
+"""
+
+from data import sample_documents as corpus
+from data.chunking import chunk_document, chunk_text, iter_passages, normalize_whitespace
+
+
+def test_passages_respect_the_length_limit_and_overlap():
+    text = normalize_whitespace(" ".join(f"Sentence number {i} is here." for i in range(40)))
+
+    passages = chunk_text(text, max_chars=120, overlap=1)
+
+    assert passages[0][0] == 0 and passages[-1][1] == len(text)
+    assert all(end - start <= 120 for start, end in passages)
+    assert all(following[0] < previous[1] for previous, following in zip(passages, passages[1:]))
+
+
+def test_long_sentences_are_split_at_word_boundaries():
+    text = " ".join(["word"] * 100)
+
+    passages = chunk_text(text, max_chars=50, overlap=0)
+
+    assert all(end - start <= 50 for start, end in passages)
+    assert all(text[start:end].split() == ["word"] * len(text[start:end].split()) for start, end in passages)
+
+
+def test_chunk_ids_are_unique_for_repeated_titles(sample_collection):
+    first = sample_collection[0]
+    repeated = [
+        first,
+        dict(first, content=first["content"] + " Revised."),
+        dict(first, title=first["title"] + " 2"),
+    ]
+    for document in repeated[1:]:
+        corpus.add_document(document)
+
+    passages = list(iter_passages(corpus.iter_document_paths(), max_chars=200, workers=1))
+
+    ids = [passage["id"] for passage in passages]
+    assert len(ids) == len(set(ids))
+    assert len({passage["path"] for passage in passages}) == len(sample_collection)
+
+
+def test_parallel_chunking_matches_the_calling_process(sample_collection):
+    pairs = list(corpus.iter_document_paths())
+
+    in_process = list(iter_passages(pairs, max_chars=200, workers=1))
+    parallel = list(iter_passages(pairs, max_chars=200, workers=2, batch_size=4))
+
+    assert parallel == in_process
+    assert in_process == [passage for path, document in pairs for passage in chunk_document(path, document, 200)]
@@ -0,0 +1,63 @@
+"""
+Tests for the columnar document store and indexes built over it.
+"""
+
+import pytest
+
+from data import sample_documents as corpus
+from data.columnar_store import ColumnarDocumentStore, DocumentView
+from data.document_index import DocumentIndex
+
+
+@pytest.fixture
+def store(sample_collection):
+    return ColumnarDocumentStore.from_documents(sample_collection)
+
+
+def test_rows_round_trip(store, sample_collection):
+    assert len(store) == len(sample_collection)
+    for view, document in zip(store, sample_collection):
+        assert view == document
+        assert view.to_dict() == {field: document[field] for field in DocumentView.FIELDS}
+    assert store[-1] == sample_collection[-1]
+    with pytest.raises(IndexError):
+        store[len(store)]
+
+
+def test_values_are_interned(store, sample_collection):
+    assert store.category_names == list(dict.fromkeys(document["category"] for document in sample_collection))
+    assert len(store.tag_values) == sum(len(document["tags"]) for document in sample_collection)
+
+
+def test_index_over_store_resolves_rows_on_access(store):
+    index = DocumentIndex(store)
+
+    first, second = index.get(0), index.get(0)
+    assert first == second == store[0]
+    assert first is not second
+
+
+def test_index_removes_any_view_of_a_row(store):
+    index = DocumentIndex(store)
+    category = store[3]["category"]
+
+    assert index.remove(store[3]) == 3
+    assert 3 not in index.category_ids(category)
+    with pytest.raises(KeyError):
+        index.remove(store[3])
+    assert len(index) == len(store) - 1
+
+
+def test_helpers_run_on_a_store(store, sample_collection):
+    corpus.load_collection(store)
+    category = sample_collection[0]["category"]
+    expected = [document for document in sample_collection if document["category"] == category]
+
+    assert corpus.get_documents_by_category(category) == expected
+
+    added = dict(sample_collection[0], title="Appended revision")
+    corpus.add_document(added)
+    assert corpus.get_documents_by_category(category) == expected + [added]
+
+    corpus.remove_document(corpus.get_documents_by_category(category)[0])
+    assert corpus.get_documents_by_category(category) == expected[1:] + [added]
@@ -0,0 +1,40 @@
+"""
+Tests for the corpus benchmark suite.
+"""
+
+import pytest
+
+from benchmarks import corpus_benchmarks
+from data import sample_documents as corpus
+
+
+def _results(**p50_ms):
+    return {"results": [{"size": 1000, "benchmark": name, "p50_ms": value} for name, value in p50_ms.items()]}
+
+
+def test_compare_reports_slowdowns_beyond_the_threshold():
+    baseline = _results(search_documents=1.0, facet_counts=2.0, get_all_tags=0.001)
+    current = _results(search_documents=1.5, facet_counts=2.1, get_all_tags=0.004, find_tags=9.0)
+
+    regressions = corpus_benchmarks.compare(baseline, current, threshold=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("search_documents @ 1,000")
+
+
+@pytest.fixture
+def restore_query_cache():
+    yield
+    corpus.configure_query_cache()
+
+
+@pytest.mark.usefixtures("restore_query_cache")
+def test_every_benchmark_runs_on_a_small_corpus(tmp_path):
+    results = corpus_benchmarks.run(
+        sizes=[200], layout="columnar", iterations=2, max_seconds=1.0, cache_dir=str(tmp_path), seed=0
+    )
+
+    names = {row["benchmark"] for row in results}
+    assert set(corpus_benchmarks.benchmarks()) <= names
+    assert {"build:load", "build:bitset_index", "build:vocabularies"} <= names
+    assert all(row["iterations"] >= 1 and row["p50_ms"] >= 0 for row in results)
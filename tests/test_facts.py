@@ -0,0 +1,57 @@
+"""
+Tests for numeric fact extraction and fact queries.
+"""
+
+import pytest
+
+from data import sample_documents as corpus
+from data.facts import extract_facts
+
+
+def _facts(content):
+    return [(fact["kind"], fact["value"], fact["unit"], fact["text"]) for fact in extract_facts(content)]
+
+
+def test_extracts_each_kind_with_normalised_values():
+    facts = _facts("Investment required: $1.8M over 12 months, lifting margin 15% across 250 stores.")
+
+    assert facts == [
+        ("money", 1.8e6, "USD", "$1.8M"),
+        ("duration", 365.25, "days", "12 months"),
+        ("percent", 15.0, "%", "15%"),
+        ("count", 250.0, "stores", "250 stores"),
+    ]
+    assert extract_facts("Investment required: $1.8M over 12 months")[0]["label"] == "Investment required"
+
+
+def test_money_spans_do_not_include_trailing_space():
+    assert _facts("$1,200 was spent and $3 million more") == [
+        ("money", 1200.0, "USD", "$1,200"),
+        ("money", 3e6, "USD", "$3 million"),
+    ]
+
+
+def test_queries_match_a_scan_of_the_extracted_facts(sample_collection):
+    expected = sorted(
+        (document["title"], fact["value"])
+        for document in sample_collection
+        for fact in extract_facts(document["content"])
+        if fact["kind"] == "money" and fact["value"] >= 1e6
+    )
+
+    found = corpus.query_facts("money", min_value=1e6)
+
+    assert expected
+    assert sorted((fact["document"]["title"], fact["value"]) for fact in found) == expected
+    totals = corpus.aggregate_facts("money", min_value=1e6)
+    assert sum(group["count"] for group in totals.values()) == len(expected)
+
+
+@pytest.mark.parametrize("call", [
+    lambda: corpus.query_facts("currency"),
+    lambda: corpus.aggregate_facts("currency"),
+    lambda: corpus.aggregate_facts("money", by="document"),
+])
+def test_unknown_kinds_and_groupings_raise(call):
+    with pytest.raises(ValueError):
+        call()
@@ -0,0 +1,54 @@
+"""
+Tests for typo-tolerant tag and category lookup.
+"""
+
+import random
+import string
+
+from data import sample_documents as corpus
+from data.fuzzy_lookup import BKTree, VocabularyIndex, levenshtein, normalize_term
+
+
+def test_levenshtein_distances():
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("", "abc") == levenshtein("abc", "") == 3
+    assert levenshtein("finance", "finance") == 0
+
+
+def test_tree_search_matches_a_linear_scan():
+    rng = random.Random(5)
+    words = {"".join(rng.choices(string.ascii_lowercase[:6], k=rng.randint(2, 8))) for _ in range(300)}
+    tree = BKTree()
+    for word in words:
+        tree.add(word)
+
+    for query in list(words)[:20] + ["abc", "ffffffff"]:
+        for max_distance in (0, 1, 2):
+            expected = {(word, levenshtein(query, word)) for word in words if levenshtein(query, word) <= max_distance}
+            assert set(tree.search(query, max_distance)) == expected
+    assert set(tree) == words
+
+
+def test_vocabulary_ignores_case_spacing_and_punctuation():
+    vocabulary = VocabularyIndex(["Risk Management", "R&D", "Finance"])
+
+    assert normalize_term("risk-management") == normalize_term("RiskManagement") == "riskmanagement"
+    assert vocabulary.resolve("risk managment") == ["Risk Management"]
+    assert vocabulary.resolve("r & d") == ["R&D"]
+    assert vocabulary.resolve("rnd") == []
+
+    vocabulary.discard("Finance")
+    assert vocabulary.resolve("finance") == [] and len(vocabulary) == 2
+
+
+def test_fuzzy_accessors_follow_the_collection(sample_collection):
+    assert corpus.find_categories("finace")[0] == ("Finance", 1)
+    assert corpus.get_documents_by_category("finace", fuzzy=True) == corpus.get_documents_by_category("Finance")
+    assert corpus.get_documents_by_tags(["complience"], fuzzy=True) == corpus.get_documents_by_tags(["Compliance"])
+
+    document = dict(sample_collection[0], tags=["Quantum Sensing"])
+    corpus.add_document(document)
+    assert corpus.find_tags("quantum-sensing") == [("Quantum Sensing", 0)]
+
+    corpus.remove_document(document)
+    assert corpus.find_tags("quantum-sensing") == []
@@ -0,0 +1,47 @@
+"""
+Tests for rank fusion and hybrid keyword + vector search.
+"""
+
+import pytest
+
+from data import sample_documents as corpus
+from data.hybrid_search import reciprocal_rank_fusion, weighted_score_fusion
+
+
+def test_reciprocal_rank_fusion_sums_reciprocal_ranks():
+    fused = reciprocal_rank_fusion([[(1, 9.0), (2, 5.0)], [(2, 0.9), (3, 0.1)]], k=60)
+
+    assert [doc_id for doc_id, _ in fused] == [2, 1, 3]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused[1][1] == pytest.approx(1 / 61)
+
+
+def test_weighted_score_fusion_normalises_each_ranking():
+    fused = dict(weighted_score_fusion([[(1, 10.0), (2, 5.0)], [(2, 0.4)]], [0.5, 0.5]))
+
+    assert fused[1] == pytest.approx(0.5)
+    assert fused[2] == pytest.approx(0.25 + 0.5)
+
+
+def test_hybrid_search_applies_filters_and_reports_timings():
+    category = corpus.get_all_categories()[0]
+
+    response = corpus.hybrid_search_documents("risk management", k=5, category=category)
+
+    assert response["results"]
+    assert all(document["category"] == category for document, _ in response["results"])
+    assert set(response["timings"]) == {"filter", "keyword", "vector", "fusion", "total"}
+    assert response["cached"] is False
+
+
+def test_hybrid_search_repeats_are_served_from_the_cache():
+    first = corpus.hybrid_search_documents("cloud migration", k=5)
+    second = corpus.hybrid_search_documents("cloud migration", k=5)
+
+    assert second["cached"] is True
+    assert second["results"] == first["results"]
+
+
+def test_hybrid_search_rejects_unknown_fusion():
+    with pytest.raises(ValueError):
+        corpus.hybrid_search_documents("budget", fusion="median")
@@ -0,0 +1,119 @@
+"""
+Tests for memory-mapped index snapshots.
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from data import sample_documents as corpus
+from data.index_snapshot import IndexSnapshot, SnapshotError, StringTable, write_snapshot
+from data.mmap_corpus import write_corpus
+
+
+def _results():
+    return {
+        "categories": sorted(corpus.get_all_categories()),
+        "tags": sorted(corpus.get_all_tags()),
+        "by_tags": corpus.get_documents_by_tags(["Compliance", "AI"]),
+        "search": corpus.search_documents("risk management compliance", 5),
+        "vector": corpus.vector_search_documents("cloud migration savings", 5),
+        "facets": corpus.facet_counts(all_tags=["Technology"]),
+        "filter": corpus.filter_documents("Finance OR tag:Strategy"),
+    }
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "indexes.zesnap")
+
+
+def test_arrays_and_metadata_round_trip(snapshot_path):
+    arrays = {"ints": np.arange(10, dtype=np.int64).reshape(2, 5), "floats": np.linspace(0, 1, 7, dtype=np.float32)}
+    strings = StringTable.from_strings(["alpha", "", "γάμμα"])
+    sections = list(arrays.items()) + [(f"strings/{name}", array) for name, array in strings.arrays().items()]
+
+    write_snapshot(snapshot_path, "v1", sections, {"note": [1, 2]})
+
+    snapshot = IndexSnapshot(snapshot_path, verify=True)
+    assert (snapshot.corpus_version, snapshot.meta) == ("v1", {"note": [1, 2]})
+    for name, array in arrays.items():
+        assert snapshot.array(name).dtype == array.dtype
+        np.testing.assert_array_equal(snapshot.array(name), array)
+    restored = snapshot.arrays("strings")
+    assert list(StringTable(restored["data"], restored["offsets"])) == ["alpha", "", "γάμμα"]
+
+
+def test_restored_indexes_answer_like_built_ones(snapshot_path, sample_collection):
+    expected = _results()
+    corpus.save_snapshot(snapshot_path)
+
+    corpus.load_collection(copy.deepcopy(sample_collection))
+    assert corpus.load_snapshot(snapshot_path, verify=True)
+    assert _results() == expected
+
+    corpus.add_document(dict(sample_collection[0], title="Written after restoring"))
+    assert len(corpus.get_documents_by_category(sample_collection[0]["category"])) > 1
+    corpus.load_collection(copy.deepcopy(sample_collection))
+    assert corpus.load_snapshot(snapshot_path, verify=True)
+    assert _results() == expected
+
+
+def test_corpus_files_restore_from_a_snapshot(tmp_path, snapshot_path, sample_collection):
+    path = str(tmp_path / "sample.zecorpus")
+    write_corpus(sample_collection, path)
+    expected = _results()
+
+    corpus.load_corpus_file(path, snapshot_path)
+    corpus.load_corpus_file(path)
+    assert corpus.load_snapshot(snapshot_path)
+    assert _results() == expected
+
+    corpus.remove_document(corpus.get_documents_by_category()[0])
+    with pytest.raises(SnapshotError):
+        corpus.save_snapshot(snapshot_path)
+
+
+def test_snapshots_of_another_collection_are_rebuilt(snapshot_path, sample_collection):
+    corpus.save_snapshot(snapshot_path)
+    changed = copy.deepcopy(sample_collection)
+    changed[0]["content"] += " Amended."
+    corpus.load_collection(changed)
+
+    assert not corpus.load_snapshot(snapshot_path)
+    assert corpus.load_snapshot(snapshot_path)
+    assert corpus.search_documents("amended", 1)[0][0] is changed[0]
+
+
+def test_corrupt_snapshots_are_rejected(snapshot_path, sample_collection):
+    corpus.save_snapshot(snapshot_path)
+    with open(snapshot_path, "r+b") as handle:
+        handle.seek(200)
+        byte = handle.read(1)
+        handle.seek(200)
+        handle.write(bytes([byte[0] ^ 0xFF]))
+
+    IndexSnapshot(snapshot_path)
+    with pytest.raises(SnapshotError):
+        IndexSnapshot(snapshot_path, verify=True)
+    assert not corpus.load_snapshot(snapshot_path, verify=True)
+    assert corpus.load_snapshot(snapshot_path, verify=True)
+
+
+@pytest.mark.parametrize("content", [b"", b"ZESNAP\x00\x01" + b"\x00" * 100, b"not a snapshot" * 10])
+def test_invalid_files_raise(snapshot_path, content):
+    with open(snapshot_path, "wb") as handle:
+        handle.write(content)
+
+    with pytest.raises(SnapshotError):
+        IndexSnapshot(snapshot_path)
+
+
+def test_truncated_snapshots_raise(snapshot_path, sample_collection):
+    size = corpus.save_snapshot(snapshot_path)
+    with open(snapshot_path, "r+b") as handle:
+        handle.truncate(size - 10)
+
+    with pytest.raises(SnapshotError):
+        IndexSnapshot(snapshot_path)
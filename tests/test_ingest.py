@@ -0,0 +1,71 @@
+"""
+Tests for the bulk ingestion client against the mock ZeroEntropy server.
+"""
+
+import asyncio
+
+from data import sample_documents as corpus
+from data.ingest import ZeroEntropyIngestor
+from data.mock_api import MockZeroEntropyServer
+
+
+def _ingestor(server, **options):
+    options = {"concurrency": 4, "batch_size": 8, "backoff_base": 0.001, "backoff_cap": 0.01, **options}
+    return ZeroEntropyIngestor(server.url, collection_name="tests", **options)
+
+
+def _run(server_options, session):
+    async def main():
+        async with MockZeroEntropyServer(retry_after=0.001, seed=7, **server_options.pop("server", {})) as server:
+            server.load([], "tests")
+            async with _ingestor(server, **server_options) as ingestor:
+                return server, await session(ingestor)
+
+    return asyncio.run(main())
+
+
+def test_uploads_every_document(sample_collection):
+    pairs = list(corpus.iter_document_paths())
+
+    server, summary = _run({}, lambda ingestor: ingestor.ingest(pairs))
+
+    assert summary["uploaded"] == summary["documents"] == len(pairs)
+    assert summary["failed"] == 0 and summary["failed_paths"] == []
+    assert sorted(server.collections["tests"].documents) == sorted(path for path, _ in pairs)
+
+
+def test_retries_through_errors_and_throttling(sample_collection):
+    pairs = list(corpus.iter_document_paths())
+
+    async def session(ingestor):
+        summary = await ingestor.ingest(pairs)
+        return summary, await ingestor.wait_for_indexing(timeout=5.0, interval=0.001)
+
+    server, (summary, status) = _run(
+        {"server": {"error_rate": 0.3, "throttle_rate": 0.2}, "max_retries": 20}, session
+    )
+
+    assert summary["uploaded"] == len(pairs) and summary["retries"] > 0
+    assert status["num_documents"] == status["num_indexed_documents"] == len(pairs)
+    assert server.stats()["responses"]["500"] > 0
+
+
+def test_reports_documents_that_never_upload(sample_collection):
+    pairs = list(corpus.iter_document_paths())[:5]
+
+    server, summary = _run({"server": {"error_rate": 1.0}, "max_retries": 1}, lambda ingestor: ingestor.ingest(pairs))
+
+    assert summary["uploaded"] == 0 and summary["failed"] == len(pairs)
+    assert sorted(summary["failed_paths"]) == sorted(path for path, _ in pairs)
+    assert summary["retries"] == len(pairs)
+
+
+def test_existing_collections_and_missing_documents_are_not_errors():
+    async def session(ingestor):
+        await ingestor.create_collection()
+        return await ingestor.delete_document("missing/document.md")
+
+    server, deleted = _run({}, session)
+
+    assert deleted
+    assert server.stats()["responses"]["409"] == 1
@@ -0,0 +1,61 @@
+"""
+Tests for streaming iteration and cursor pagination over the collection.
+"""
+
+import pytest
+
+from data import predicates
+from data import sample_documents as corpus
+
+
+def _tags(documents):
+    return sorted({tag for document in documents for tag in document["tags"]})
+
+
+def test_streams_match_the_list_filters(sample_collection):
+    category = sample_collection[0]["category"]
+    tags = _tags(sample_collection)[:3]
+
+    assert list(corpus.iter_documents_by_category(category)) == corpus.get_documents_by_category(category)
+    assert list(corpus.iter_documents_by_tags(tags)) == corpus.get_documents_by_tags(tags)
+    assert list(corpus.iter_documents_by_tags([])) == []
+    assert list(corpus.iter_documents(any_tags=tags, none_tags=[tags[0]])) == corpus.query_documents(
+        any_tags=tags, none_tags=[tags[0]]
+    )
+
+
+def test_predicates_filter_the_stream(sample_collection):
+    tag = _tags(sample_collection)[0]
+    expected = [document for document in sample_collection if tag not in document["tags"]]
+
+    assert list(corpus.iter_documents(predicates.negate(predicates.has_any_tag(tag)))) == expected
+    assert list(corpus.iter_documents(predicates.negate(predicates.has_any_tag(tag)), limit=2)) == expected[:2]
+
+
+def test_unfiltered_streams_do_not_build_the_index(sample_collection):
+    assert corpus._INDEX is None
+
+    assert list(corpus.iter_documents(limit=3)) == sample_collection[:3]
+    assert corpus.paginate_documents(limit=3)["documents"] == sample_collection[:3]
+    assert corpus._INDEX is None
+
+
+@pytest.mark.parametrize("filters", [{}, {"category": "Technology"}, {"any_tags": ["Strategy", "Compliance"]}])
+def test_pages_cover_every_match_once(filters, sample_collection):
+    expected = list(corpus.iter_documents(**filters))
+    assert expected
+
+    pages, cursor = [], None
+    while True:
+        page = corpus.paginate_documents(limit=2, after=cursor, **filters)
+        pages.extend(page["documents"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == expected
+
+
+def test_page_size_must_be_positive():
+    with pytest.raises(ValueError):
+        corpus.paginate_documents(limit=0)
@@ -0,0 +1,95 @@
+"""
+Tests for manifest-based incremental sync.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from data import sample_documents as corpus
+from data.ingest import ZeroEntropyIngestor
+from data.manifest import load_manifest, save_manifest, sync
+from data.mock_api import MockZeroEntropyServer
+
+
+def _sync_rounds(manifest_path, rounds):
+    """Runs sync once per (documents, error_rate) round against one server."""
+
+    async def main():
+        reports = []
+        async with MockZeroEntropyServer(seed=3) as server:
+            server.load([], "tests")
+            async with ZeroEntropyIngestor(
+                server.url, collection_name="tests", concurrency=4, batch_size=8, max_retries=0
+            ) as ingestor:
+                for documents, error_rate in rounds:
+                    server.error_rate = error_rate
+                    reports.append(await sync(ingestor, manifest_path, documents))
+            return server.collections["tests"], reports
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / "manifest.json")
+
+
+def test_only_changes_are_sent_after_the_first_sync(manifest_path, sample_collection):
+    pairs = list(corpus.iter_document_paths())
+    edited = [(path, dict(document)) for path, document in pairs[1:]]
+    edited[0][1]["content"] += " Revised."
+    edited[1][1]["tags"] = edited[1][1]["tags"] + ["Reviewed"]
+
+    collection, (first, repeat, second) = _sync_rounds(
+        manifest_path, [(pairs, 0.0), (pairs, 0.0), (edited, 0.0)]
+    )
+
+    assert first["added"] == first["upload"]["uploaded"] == len(pairs)
+    assert repeat["unchanged"] == len(pairs) and "upload" not in repeat
+    assert (second["added"], second["changed"], second["removed"]) == (0, 1, 1)
+    assert second["upload"]["uploaded"] == 1 and second["deleted"] == 1
+    assert sorted(collection.documents) == sorted(path for path, _ in edited)
+    assert sorted(load_manifest(manifest_path, "tests")) == sorted(path for path, _ in edited)
+
+
+def test_failed_uploads_are_not_recorded(manifest_path, sample_collection):
+    pairs = list(corpus.iter_document_paths())
+
+    collection, (failed, retried) = _sync_rounds(manifest_path, [(pairs, 1.0), (pairs, 0.0)])
+
+    assert failed["upload"]["failed"] == len(pairs)
+    assert retried["added"] == retried["upload"]["uploaded"] == len(pairs)
+    assert len(collection) == len(pairs)
+
+
+def test_failed_deletions_stay_in_the_manifest(manifest_path, sample_collection):
+    pairs = list(corpus.iter_document_paths())
+
+    _, (_, failed, retried) = _sync_rounds(manifest_path, [(pairs, 0.0), (pairs[1:], 1.0), (pairs[1:], 0.0)])
+
+    assert failed["delete_failed"] == 1 and failed["deleted"] == 0
+    assert retried["removed"] == retried["deleted"] == 1
+    assert pairs[0][0] not in load_manifest(manifest_path, "tests")
+
+
+def test_reads_a_one_shot_iterable_once(manifest_path, sample_collection):
+    pairs = list(corpus.iter_document_paths())
+
+    collection, (report,) = _sync_rounds(manifest_path, [(iter(pairs), 0.0)])
+
+    assert report["upload"]["uploaded"] == len(pairs) == len(collection)
+    assert len(load_manifest(manifest_path, "tests")) == len(pairs)
+
+
+def test_manifests_of_other_collections_or_versions(manifest_path):
+    save_manifest(manifest_path, "other", {"a.md": "0" * 32})
+
+    assert load_manifest(manifest_path, "other") == {"a.md": "0" * 32}
+    assert load_manifest(manifest_path, "tests") == {}
+
+    with open(manifest_path, "w", encoding="utf-8") as handle:
+        json.dump({"version": 0, "collection": "tests", "documents": {}}, handle)
+    with pytest.raises(ValueError):
+        load_manifest(manifest_path, "tests")
@@ -0,0 +1,116 @@
+"""
+Tests for call metrics and their exports.
+"""
+
+import pytest
+
+from data import sample_documents as corpus
+from data.metrics import Histogram, MetricsRegistry, enabled_from_env, result_size
+
+
+class StepClock:
+    """Advances by a fixed step on every reading."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def test_records_calls_errors_and_result_sizes():
+    registry = MetricsRegistry(clock=StepClock(0.001))
+
+    @registry.instrument()
+    def lookup(count):
+        if count < 0:
+            raise KeyError(count)
+        return {"documents": [None] * count, "next_cursor": None}
+
+    lookup(3)
+    lookup(7)
+    with pytest.raises(KeyError):
+        lookup(-1)
+
+    metrics = registry.snapshot()["functions"]["lookup"]
+    assert (metrics["calls"], metrics["errors"]) == (3, 1)
+    assert metrics["latency_ms"]["max"] == pytest.approx(1.0)
+    assert metrics["result_size"]["mean"] == 5.0 and metrics["result_size"]["max"] == 7
+
+
+def test_disabled_registries_record_nothing():
+    registry = MetricsRegistry(enabled=False)
+    function = registry.instrument(name="renamed")(lambda: [1, 2])
+
+    assert function() == [1, 2]
+    assert registry.snapshot()["functions"] == {}
+    registry.enabled = True
+    function()
+    assert list(registry.snapshot()["functions"]) == ["renamed"]
+
+
+def test_histogram_quantiles_stay_within_the_observed_range():
+    histogram = Histogram((1, 2, 5, 10))
+    for value in (1.5, 1.5, 1.5, 4, 8):
+        histogram.observe(value)
+
+    assert histogram.counts == [0, 3, 1, 1, 0]
+    assert 1.5 <= histogram.quantile(0.5) <= 2
+    assert histogram.quantile(1.0) == 8
+    assert Histogram((1,)).quantile(0.5) == 0.0
+
+
+def test_result_sizes_of_common_return_values():
+    assert result_size([1, 2, 3]) == 3
+    assert result_size({"results": [1], "timings": {}}) == 1
+    assert result_size({"total": 42, "tags": []}) == 42
+    assert result_size(None) is None
+
+
+def test_prometheus_buckets_are_cumulative():
+    registry = MetricsRegistry(namespace="test", clock=StepClock(0.002))
+    function = registry.instrument(name="search")(lambda: [])
+    function()
+    function()
+
+    text = registry.prometheus_text()
+
+    assert 'test_calls_total{function="search"} 2' in text
+    assert 'test_call_duration_seconds_bucket{function="search",le="0.001"} 0' in text
+    assert 'test_call_duration_seconds_bucket{function="search",le="0.0025"} 2' in text
+    assert 'test_call_duration_seconds_bucket{function="search",le="+Inf"} 2' in text
+    assert 'test_result_size_bucket{function="search",le="0"} 2' in text
+
+
+@pytest.mark.parametrize("value, expected", [(None, True), ("0", False), (" Off ", False), ("1", True)])
+def test_instrumentation_switch_from_the_environment(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("ZEROENTROPY_METRICS", raising=False)
+    else:
+        monkeypatch.setenv("ZEROENTROPY_METRICS", value)
+
+    assert enabled_from_env() is expected
+
+
+@pytest.fixture
+def recording():
+    enabled = corpus._METRICS.enabled
+    corpus.configure_metrics(True, reset=True)
+    yield
+    corpus.configure_metrics(enabled, reset=True)
+
+
+@pytest.mark.usefixtures("recording")
+def test_corpus_lookups_are_instrumented(sample_collection):
+    corpus.get_documents_by_tags(["Compliance"])
+    corpus.paginate_documents(limit=5)
+    with pytest.raises(ValueError):
+        corpus.paginate_documents(limit=0)
+
+    functions = corpus.metrics_snapshot()["functions"]
+    assert functions["get_documents_by_tags"]["calls"] == 1
+    assert functions["paginate_documents"]["calls"] == 2 and functions["paginate_documents"]["errors"] == 1
+    assert functions["paginate_documents"]["result_size"]["max"] == 5
+    assert 'zeroentropy_calls_total{function="paginate_documents"} 2' in corpus.metrics_prometheus()
@@ -0,0 +1,78 @@
+"""
+Tests for memory-mapped corpus files and the accessors on every collection
+layout.
+"""
+
+import pytest
+
+from data import sample_documents as corpus
+from data.columnar_store import ColumnarDocumentStore
+from data.mmap_corpus import CorpusFormatError, MmapCorpus, write_corpus
+
+
+@pytest.fixture
+def corpus_file(tmp_path, sample_collection):
+    path = str(tmp_path / "sample.zecorpus")
+    write_corpus(sample_collection, path)
+    return path
+
+
+def test_corpus_file_round_trip(corpus_file, sample_collection):
+    with MmapCorpus(corpus_file) as documents:
+        assert len(documents) == len(sample_collection)
+        assert [document.to_dict() for document in documents] == sample_collection
+        assert documents[5]["title"] == sample_collection[5]["title"]
+        assert documents[-1] == sample_collection[-1]
+
+
+def test_to_dict_returns_a_private_copy(corpus_file):
+    with MmapCorpus(corpus_file) as documents:
+        view = documents[0]
+        copied = view.to_dict()
+        copied["title"] = "changed"
+
+        assert view["title"] != "changed"
+        assert documents[1]["title"] != view["title"]
+        assert view["title"] == documents.decode(0)["title"]
+
+
+def test_rejects_files_that_are_not_corpora(tmp_path):
+    path = tmp_path / "not-a-corpus"
+    path.write_bytes(b"{}\n" * 20)
+
+    with pytest.raises(CorpusFormatError):
+        MmapCorpus(str(path))
+
+
+def _layout(name, documents, path):
+    if name == "columnar":
+        return ColumnarDocumentStore.from_documents(documents)
+    if name == "mmap":
+        return MmapCorpus(path)
+    return list(documents)
+
+
+@pytest.mark.parametrize("layout", ["list", "columnar", "mmap"])
+def test_accessors_match_the_baseline_scans(layout, corpus_file, sample_collection):
+    corpus.load_collection(_layout(layout, sample_collection, corpus_file))
+
+    assert sorted(corpus.get_all_categories()) == sorted({document["category"] for document in sample_collection})
+    assert sorted(corpus.get_all_tags()) == sorted({tag for document in sample_collection for tag in document["tags"]})
+    assert corpus.get_documents_by_category() == sample_collection
+    for category in {document["category"] for document in sample_collection}:
+        expected = [document for document in sample_collection if document["category"] == category]
+        assert corpus.get_documents_by_category(category) == expected
+    tags = sorted({tag for document in sample_collection for tag in document["tags"]})
+    for selection in ([tags[0]], tags[1:4], ["no such tag"], [tags[2], "no such tag"]):
+        expected = [document for document in sample_collection if any(tag in document["tags"] for tag in selection)]
+        assert corpus.get_documents_by_tags(selection) == expected
+
+
+def test_adding_before_the_index_is_built_indexes_once(sample_collection):
+    document = dict(sample_collection[0], title="Added before any lookup")
+
+    corpus.add_document(document)
+
+    matches = [found for found in corpus.get_documents_by_category(document["category"]) if found is document]
+    assert len(matches) == 1
+    assert len(corpus.get_documents_by_category()) == len(sample_collection)
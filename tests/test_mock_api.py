@@ -0,0 +1,87 @@
+"""
+Tests for the mock ZeroEntropy API server.
+"""
+
+import asyncio
+
+from data import sample_documents as corpus
+from data.http_client import ConnectionPool
+from data.mock_api import MockCollection, MockZeroEntropyServer
+
+
+def _exchange(requests, **options):
+    """Sends (path, payload, headers) requests in order and returns the responses."""
+
+    async def main():
+        async with MockZeroEntropyServer(seed=1, **options) as server:
+            server.load(corpus.iter_document_paths(), "docs")
+            async with ConnectionPool(server.url, size=2) as pool:
+                responses = [await pool.post_json(path, payload, headers) for path, payload, headers in requests]
+            return server, responses
+
+    return asyncio.run(main())
+
+
+def test_serves_the_collection_and_document_endpoints(sample_collection):
+    path = next(corpus.iter_document_paths())[0]
+    document = {"collection_name": "docs", "path": "new.md", "content": {"type": "text", "text": "Fresh text."}}
+
+    server, responses = _exchange([
+        ("/status/get-status", {"collection_name": "docs"}, None),
+        ("/collections/get-collection-list", {}, None),
+        ("/collections/add-collection", {"collection_name": "docs"}, None),
+        ("/documents/add-document", document, None),
+        ("/documents/add-document", document, None),
+        ("/documents/delete-document", {"collection_name": "docs", "path": path}, None),
+        ("/documents/delete-document", {"collection_name": "docs", "path": path}, None),
+        ("/queries/top-snippets", {"collection_name": "docs", "query": "fresh text", "k": 1}, None),
+    ])
+
+    statuses = [response.status for response in responses]
+    assert statuses == [200, 200, 409, 201, 409, 200, 404, 200]
+    assert responses[0].json()["num_documents"] == len(sample_collection)
+    assert responses[1].json() == {"collection_names": ["docs"]}
+    assert responses[7].json()["results"][0]["path"] == "new.md"
+    assert len(server.collections["docs"]) == len(sample_collection)
+    assert server.stats()["requests"]["/documents/add-document"] == 2
+
+
+def test_rejects_bad_requests():
+    _, responses = _exchange([
+        ("/no/such/endpoint", {}, None),
+        ("/documents/add-document", {"collection_name": "docs"}, None),
+        ("/documents/add-document", [], None),
+        ("/queries/top-snippets", {"collection_name": "missing", "query": "x"}, None),
+    ])
+
+    assert [response.status for response in responses] == [404, 422, 422, 404]
+
+
+def test_checks_the_api_key():
+    _, responses = _exchange(
+        [("/status/get-status", {}, None), ("/status/get-status", {}, {"Authorization": "Bearer secret"})],
+        api_key="secret",
+    )
+
+    assert [response.status for response in responses] == [401, 200]
+
+
+def test_injects_throttling_with_retry_after():
+    server, responses = _exchange([("/status/get-status", {}, None)] * 20, throttle_rate=0.5, retry_after=2.5)
+
+    throttled = [response for response in responses if response.status == 429]
+    assert throttled and all(response.headers["retry-after"] == "2.5" for response in throttled)
+    assert server.stats()["responses"]["429"] == len(throttled)
+
+
+def test_replacing_a_document_replaces_its_passages():
+    collection = MockCollection(max_chars=40)
+    collection.add("a.md", "Solar panels cut energy costs. Wind farms add capacity.", {"name": "Energy"})
+    collection.add("a.md", "Payroll software reduces errors.", {"name": "HR"})
+
+    assert len(collection) == 1
+    assert collection.top_snippets("solar wind", 5) == []
+    assert [snippet["content"] for snippet in collection.top_snippets("payroll", 5)] == [
+        "Payroll software reduces errors."
+    ]
+    assert collection.remove("a.md") and not collection.remove("a.md")
@@ -0,0 +1,100 @@
+"""
+Tests for MinHash/LSH near-duplicate detection.
+"""
+
+import random
+
+import numpy as np
+
+from data import sample_documents as corpus
+from data.near_duplicates import NearDuplicateIndex, distinct_documents
+
+
+def _texts(count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    texts = []
+    for i in range(count):
+        if i % 3 == 2:
+            # Revise one word of the previous text.
+            words = texts[-1].split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        else:
+            words = rng.choices(vocabulary, k=120)
+        texts.append(" ".join(words))
+    return texts
+
+
+def _brute_force_clusters(index, texts):
+    signatures = [index.signature(text) for text in texts]
+    parents = list(range(len(texts)))
+
+    def find(i):
+        while parents[i] != i:
+            i = parents[i]
+        return i
+
+    for i in range(len(texts)):
+        for j in range(i):
+            if index.similarity(signatures[i], signatures[j]) >= index.threshold:
+                parents[max(find(i), find(j))] = min(find(i), find(j))
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return [members for _, members in sorted(groups.items()) if len(members) > 1]
+
+
+def test_clusters_match_all_pairs_comparison():
+    texts = _texts(60)
+    index = NearDuplicateIndex.from_documents(enumerate({"content": text} for text in texts), batch_size=16)
+
+    clusters = index.clusters()
+
+    assert clusters == _brute_force_clusters(index, texts)
+    assert [1, 2] in clusters
+
+
+def test_matches_any_similar_member_of_a_shared_bucket():
+    index = NearDuplicateIndex(num_perm=8, bands=2, threshold=0.75)
+    query = np.arange(1, 9, dtype=np.uint32)
+    index.add_signature(0, np.array([1, 2, 3, 4, 100, 101, 102, 103], dtype=np.uint32))
+    index.add_signature(1, np.array([1, 2, 3, 4, 5, 6, 7, 99], dtype=np.uint32))
+
+    assert index.match_signature(query) == 1
+    assert index.clusters() == []
+
+
+def test_removal_matches_a_fresh_build():
+    texts = _texts(45, seed=1)
+    documents = [{"content": text} for text in texts]
+    index = NearDuplicateIndex.from_documents(enumerate(documents))
+    removed = {1, 5, 14, 30}
+
+    for doc_id in removed:
+        index.remove(doc_id)
+
+    fresh = NearDuplicateIndex.from_documents((i, document) for i, document in enumerate(documents) if i not in removed)
+    assert index.clusters() == fresh.clusters()
+    assert len(index) == len(texts) - len(removed)
+
+
+def test_distinct_documents_keeps_the_first_of_each_cluster():
+    texts = _texts(30, seed=2)
+    index = NearDuplicateIndex.from_documents(enumerate({"content": text} for text in texts))
+    duplicates = {doc_id for members in index.clusters() for doc_id in members[1:]}
+
+    kept = [key for key, _ in distinct_documents(((i, {"content": text}) for i, text in enumerate(texts)), batch_size=7)]
+
+    assert duplicates
+    assert kept == [i for i in range(len(texts)) if i not in duplicates]
+
+
+def test_search_can_collapse_revisions(sample_collection):
+    original = sample_collection[0]
+    revision = dict(original, title=original["title"] + " (revised)", content=original["content"] + " Revised.")
+    corpus.add_document(revision)
+    query = original["title"]
+
+    assert [original, revision] in corpus.near_duplicate_clusters()
+    collapsed = [document for document, _ in corpus.search_documents(query, 10, collapse_duplicates=True)]
+    assert (original in collapsed) != (revision in collapsed)
@@ -0,0 +1,98 @@
+"""
+Tests for the query result cache.
+"""
+
+import pytest
+
+from data import sample_documents as corpus
+from data.query_cache import QueryCache, normalize_query, normalize_tags
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used_entries():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", 1, version=0)
+    cache.put("b", 2, version=0)
+    cache.get("a", version=0)
+    cache.put("c", 3, version=0)
+
+    assert cache.get("b", version=0) is None
+    assert (cache.get("a", version=0), cache.get("c", version=0)) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_respects_the_byte_budget():
+    cache = QueryCache(max_bytes=2000)
+    cache.put("small", (1, 2, 3), version=0)
+    cache.put("huge", tuple(range(1000)), version=0)
+
+    assert cache.get("huge", version=0) is None
+    assert cache.get("small", version=0) == (1, 2, 3)
+    assert 0 < cache.nbytes <= 2000
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = QueryCache(ttl=10.0, clock=clock)
+    cache.put("a", 1, version=0)
+
+    clock.now = 9.0
+    assert cache.get("a", version=0) == 1
+    clock.now = 10.0
+    assert cache.get("a", version=0) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_a_new_version_drops_every_entry():
+    cache = QueryCache()
+    cache.put("a", 1, version=0)
+
+    assert cache.get("a", version=1) is None
+    assert len(cache) == 0 and cache.stats()["invalidations"] == 1
+    assert cache.get_or_compute("a", 1, lambda: 2) == 2
+    assert cache.get_or_compute("a", 1, lambda: 3) == 2
+
+
+def test_keys_ignore_case_spacing_and_tag_order():
+    assert normalize_query("  Cloud   MIGRATION ") == "cloud migration"
+    assert normalize_tags(["b", "a", "b"]) == ("a", "b")
+
+
+@pytest.fixture
+def fresh_cache():
+    corpus.configure_query_cache()
+    yield
+    corpus.configure_query_cache()
+
+
+@pytest.mark.usefixtures("fresh_cache")
+def test_collection_changes_invalidate_cached_results(sample_collection):
+    tag = sample_collection[0]["tags"][0]
+    before_search = corpus.search_documents("zebrafish aquaculture", 5)
+    before_tags = corpus.get_documents_by_tags([tag])
+    assert corpus.search_documents("Zebrafish  aquaculture", 5) == before_search
+    assert corpus.query_cache_stats()["hits"] == 1
+
+    document = {
+        "title": "Zebrafish aquaculture",
+        "content": "Zebrafish aquaculture trials in recirculating tanks.",
+        "category": "R&D",
+        "tags": [tag],
+    }
+    corpus.add_document(document)
+
+    assert corpus.search_documents("zebrafish aquaculture", 5)[0][0] is document
+    assert corpus.get_documents_by_tags([tag]) == before_tags + [document]
+    assert corpus.query_cache_stats()["invalidations"] >= 1
+
+    corpus.remove_document(document)
+
+    assert corpus.search_documents("zebrafish aquaculture", 5) == before_search
+    assert corpus.get_documents_by_tags([tag]) == before_tags
@@ -0,0 +1,65 @@
+"""
+Tests for scatter-gather search across worker processes.
+"""
+
+import pytest
+
+from data.document_index import DocumentIndex
+from data.keyword_search import BM25Index
+from data.mmap_corpus import write_corpus
+from data.sharded_search import ShardedSearch
+from data.synthetic_corpus import generate_documents
+
+QUERIES = ["revenue growth margin", "cloud migration", "clinical trial outcomes", "supply chain", "no such words"]
+
+
+@pytest.fixture(scope="module")
+def documents():
+    return list(generate_documents(300, seed=9, chunk_size=64))
+
+
+@pytest.fixture(scope="module")
+def single(documents):
+    index = DocumentIndex()
+    keyword_index = BM25Index()
+    for document in documents:
+        keyword_index.add(index.add(document), document)
+    return index, keyword_index
+
+
+def _assert_same(sharded, expected):
+    assert [doc_id for doc_id, _ in sharded] == [doc_id for doc_id, _ in expected]
+    assert [score for _, score in sharded] == pytest.approx([score for _, score in expected])
+
+
+def test_results_match_a_single_index(documents, single, tmp_path):
+    _, keyword_index = single
+    path = str(tmp_path / "sharded.zecorpus")
+    write_corpus(documents, path)
+
+    for source in (documents, path):
+        with ShardedSearch(source, shards=3) as sharded:
+            assert sharded.shards == 3
+            for query, results in zip(QUERIES, sharded.search_batch(QUERIES, 15)):
+                _assert_same(results, keyword_index.search(query, 15))
+            assert sharded.resolve(sharded.search(QUERIES[0], 1))[0][0]["title"] == documents[
+                keyword_index.search(QUERIES[0], 1)[0][0]
+            ]["title"]
+
+
+def test_filters_are_applied_inside_the_shards(documents, single):
+    index, keyword_index = single
+    category = documents[0]["category"]
+    tag = documents[0]["tags"][0]
+
+    with ShardedSearch(documents, shards=4) as sharded:
+        assert sharded.query_ids(category=category) == list(index.search(category))
+        assert sharded.query_ids(any_tags=[tag], none_tags=documents[2]["tags"]) == list(
+            index.search(any_tags=[tag], none_tags=documents[2]["tags"])
+        )
+        candidates = set(index.search(category, any_tags=[tag]))
+        for query in QUERIES:
+            _assert_same(
+                sharded.search(query, 10, category=category, any_tags=[tag]),
+                keyword_index.search(query, 10, candidates),
+            )
@@ -0,0 +1,44 @@
+"""
+Tests for the synthetic corpus generator.
+"""
+
+import json
+
+import pytest
+
+from data.mmap_corpus import MmapCorpus
+from data.synthetic_corpus import generate_corpus, generate_documents
+
+
+def test_generation_is_deterministic_by_seed():
+    first = list(generate_documents(50, seed=3, chunk_size=16))
+
+    assert first == list(generate_documents(50, seed=3, chunk_size=16))
+    assert first != list(generate_documents(50, seed=4, chunk_size=16))
+    assert {"title", "content", "category", "tags"} <= set(first[0])
+
+
+def test_output_does_not_depend_on_the_worker_count(tmp_path):
+    single = tmp_path / "single.jsonl"
+    parallel = tmp_path / "parallel.jsonl"
+
+    assert generate_corpus(str(single), 70, seed=1, workers=1, format="jsonl", chunk_size=16) == 70
+    assert generate_corpus(str(parallel), 70, seed=1, workers=3, format="jsonl", chunk_size=16) == 70
+
+    assert single.read_bytes() == parallel.read_bytes()
+    lines = single.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == list(generate_documents(70, seed=1, chunk_size=16))
+
+
+def test_corpus_format_holds_the_same_documents(tmp_path):
+    path = str(tmp_path / "synthetic.zecorpus")
+
+    assert generate_corpus(path, 40, seed=2, workers=2, chunk_size=16) == 40
+
+    with MmapCorpus(path) as documents:
+        assert [document.to_dict() for document in documents] == list(generate_documents(40, seed=2, chunk_size=16))
+
+
+def test_rejects_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        generate_corpus(str(tmp_path / "out"), 10, format="csv")